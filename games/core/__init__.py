@@ -0,0 +1,11 @@
+# 游戏逻辑核心包
+# 这里的模块只包含纯Python的游戏状态和step逻辑，不导入pygame，
+# 可在没有显示设备（SDL视频驱动）的服务器上批量模拟对局。
+from games.core.breakout import BreakoutCore
+from games.core.snake import SnakeCore
+from games.core.pacman import PacmanCore
+from games.core.pacman_maze import MazePacmanCore
+from games.core.tetris import TetrisCore
+from games.core.pong import PongCore
+from games.core.gomoku import GomokuCore
+from games.core.game2048 import Game2048Core
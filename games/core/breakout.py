@@ -0,0 +1,373 @@
+import math
+
+from games.core.pool import ObjectPool
+from games.core.rect import Rect
+from games.core.rng import session_rng
+from games.core.spatial_grid import SpatialGrid
+from games.core.sweep import sweep_box, sweep_bounds, reflect
+
+# 砖块颜色（RGB格式）
+WHITE = (255, 255, 255)
+GREEN = (0, 255, 0)
+YELLOW = (255, 255, 0)  # 黄色砖块
+ORANGE = (255, 165, 0)  # 橙色砖块
+
+# 场地设置
+WINDOW_WIDTH = 800  # 场地宽度
+WINDOW_HEIGHT = 600  # 场地高度
+
+# 砖块布局
+BRICK_WIDTH = 40  # 砖块宽度
+BRICK_HEIGHT = 15  # 砖块高度
+BRICK_GAP_X = 5  # 水平间距
+BRICK_GAP_Y = 3  # 垂直间距
+
+# 合法的动作（挡板移动方向），None表示不动
+ACTIONS = (None, 'left', 'right')
+
+# 每帧最多处理的碰撞次数（球卡在角落里时避免死循环）
+MAX_BOUNCES = 8
+
+
+class Paddle:
+    """挡板类
+
+    玩家控制的挡板，可以左右移动来反弹球。
+    属性:
+        width: 挡板宽度
+        height: 挡板高度
+        x, y: 左上角位置（浮点数，rect随之更新）
+        speed: 移动速度
+        rect: 碰撞检测用的矩形对象
+    """
+    __slots__ = ('width', 'height', 'x', 'y', 'speed', 'rect')
+
+    def __init__(self):
+        """初始化挡板
+
+        设置挡板的初始位置、大小和速度
+        """
+        self.rect = Rect(0, 0, 0, 0)
+        self.reset()
+
+    def reset(self):
+        """把挡板放回初始位置（复用原来的矩形对象）"""
+        self.width = 100
+        self.height = 20
+        self.x = WINDOW_WIDTH // 2 - self.width // 2  # 初始位置在窗口底部中间
+        self.y = WINDOW_HEIGHT - 40
+        self.speed = 8  # 移动速度
+        rect = self.rect
+        rect.x, rect.y, rect.width, rect.height = self.x, self.y, self.width, self.height
+
+    def move(self, direction, dt=1.0):
+        """移动挡板
+
+        根据输入的方向移动挡板，并确保不会超出屏幕边界
+        参数:
+            direction: 移动方向，'left'表示左移，'right'表示右移
+            dt: 经过的时间（以帧为单位）
+        """
+        # 位置按浮点数累加，dt较小时移动量不会被矩形的整数坐标舍掉
+        if direction == 'left' and self.x > 0:
+            self.x -= self.speed * dt
+        if direction == 'right' and self.x + self.width < WINDOW_WIDTH:
+            self.x += self.speed * dt
+        self.rect.x = self.x
+
+
+class Ball:
+    """球类
+
+    游戏中的球体，会在场地中移动并与其他物体发生碰撞。
+    属性:
+        radius: 球的半径
+        x, y: 球心位置（浮点数，rect随之更新）
+        dx, dy: 球的水平和垂直速度（每帧移动的像素）
+        rect: 用于碰撞检测的矩形对象
+    """
+    __slots__ = ('radius', 'x', 'y', 'dx', 'dy', 'rect')
+
+    def __init__(self):
+        """初始化球
+
+        设置球的初始位置、大小和速度
+        """
+        # 创建一个矩形用于碰撞检测
+        self.rect = Rect(0, 0, 0, 0)
+        self.reset()
+
+    def reset(self):
+        """把球放回挡板上方的初始位置，恢复初始速度（复用原来的矩形对象）"""
+        self.radius = 10
+        self.x = WINDOW_WIDTH // 2
+        self.y = WINDOW_HEIGHT - 60
+        self.dx = 5  # 水平速度
+        self.dy = -5  # 垂直速度，负值表示向上运动
+        rect = self.rect
+        rect.x, rect.y = self.x - self.radius, self.y - self.radius
+        rect.width = rect.height = self.radius * 2
+
+    def move_to(self, x, y):
+        """把球心移动到指定位置
+
+        参数:
+            x, y: 新的球心位置
+        """
+        self.x = x
+        self.y = y
+        self.rect.center = (x, y)
+
+
+class Brick:
+    """砖块类
+
+    游戏中的砖块，可以被球击碎。
+    属性:
+        rect: 砖块的矩形区域
+        color: 砖块的颜色
+        hits_required: 需要击中多少次才能消除
+        points: 击碎砖块获得的分数
+    """
+    __slots__ = ('rect', 'color', 'hits_required', 'points')
+
+    def __init__(self, x, y, width=60, height=20, color=WHITE, hits_required=1, points=0):
+        """初始化砖块
+
+        参数:
+            x, y: 砖块的位置
+            width, height: 砖块的宽度和高度
+            color: 砖块的颜色
+            hits_required: 需要击中多少次才能消除
+            points: 击碎砖块获得的分数
+        """
+        self.rect = Rect(x, y, width, height)
+        self.reset(x, y, width, height, color, hits_required, points)
+
+    def reset(self, x, y, width=60, height=20, color=WHITE, hits_required=1, points=0):
+        """重新初始化砖块（从对象池取出时调用，复用原来的矩形对象），参数同__init__"""
+        rect = self.rect
+        rect.x, rect.y, rect.width, rect.height = x, y, width, height
+        self.color = color
+        self.hits_required = hits_required
+        self.points = points
+
+
+class BreakoutCore:
+    """打砖块游戏逻辑核心
+
+    不依赖pygame和显示窗口，每次step推进一帧，可在无显示环境下批量模拟对局。
+    属性:
+        paddle: 挡板对象
+        ball: 球对象
+        bricks: 砖块的网格索引（SpatialGrid），按砖块的排列间距分格，可以直接迭代
+        brick_pool: 这一局自己的砖块对象池，换关和重新开始时把砖块还回池里，下一关直接复用
+        level: 当前关卡
+        score: 得分
+        lives: 生命值
+        game_over: 游戏是否结束
+        seed: 这一局的随机种子
+        rng: 随机数生成器（决定特殊砖块的位置）
+    """
+    def __init__(self, seed=None, rng=None):
+        """初始化游戏状态
+
+        参数:
+            seed: 随机种子，None表示新生成一个（记录在seed属性中）
+            rng: 随机数生成器（见games.core.rng），给出时不使用seed创建
+        """
+        self.seed, self.rng = session_rng(seed, rng)
+        # 每局使用自己的对象池，还回池里的砖块不会被同一进程中的其他对局取走重置；
+        # 重新开始（再次调用__init__）时沿用原来的池，并把上一局剩下的砖块还回去
+        if getattr(self, 'brick_pool', None) is None:
+            self.brick_pool = ObjectPool(Brick)
+        if getattr(self, 'bricks', None):
+            self.brick_pool.release_all(self.bricks)
+        self.paddle = Paddle()
+        self.ball = Ball()
+        # 格子大小等于砖块的排列间距，每块砖只落在一个格子里
+        self.bricks = SpatialGrid(BRICK_WIDTH + BRICK_GAP_X, BRICK_HEIGHT + BRICK_GAP_Y)
+        self.level = 1
+        self.score = 0
+        self.lives = 3  # 初始生命值
+        self.game_over = False
+        self.setup_level(self.level)
+
+    def setup_level(self, level):
+        """设置关卡
+
+        根据当前关卡创建砖块布局。随着关卡提升，砖块数量增加，
+        并且出现需要多次击中才能消除的特殊砖块。
+
+        参数:
+            level: 关卡编号，影响砖块的行数和特殊砖块的出现概率
+        """
+        self.brick_pool.release_all(self.bricks)  # 清除现有砖块，还回对象池
+        self.bricks.clear()
+
+        # 根据关卡增加砖块行数，每过一关增加一行
+        rows = 3 + level  # 基础3行，每关增加1行
+        cols = 15  # 列数固定为15列
+        brick_width = BRICK_WIDTH
+        brick_height = BRICK_HEIGHT
+        top_offset = 50  # 顶部留空距离
+
+        # 创建砖块阵列，不同位置的砖块具有不同的颜色和分值
+        for row in range(rows):
+            for col in range(cols):
+                # 计算砖块位置，包括间距
+                x = col * (brick_width + BRICK_GAP_X) + 45  # 水平间距5像素
+                y = row * (brick_height + BRICK_GAP_Y) + top_offset  # 垂直间距3像素
+
+                # 根据行数设置不同颜色和分数的砖块
+                if row < 2:
+                    color = ORANGE  # 顶部使用橙色
+                    points = 30     # 顶部砖块分值高
+                elif row < 4:
+                    color = YELLOW  # 中部使用黄色
+                    points = 20     # 中部砖块分值中等
+                else:
+                    color = WHITE   # 底部使用白色
+                    points = 10     # 底部砖块分值低
+
+                # 在高级关卡中随机添加需要多次击中的特殊砖块
+                hits_required = 1
+                if level >= 3 and self.rng.random() < 0.2:  # 20%的概率生成特殊砖块
+                    color = GREEN   # 特殊砖块使用绿色
+                    points = 50     # 特殊砖块分值更高
+                    hits_required = 2  # 需要击中两次才能消除
+                brick = self.brick_pool.acquire(x, y, brick_width, brick_height, color, hits_required, points)
+                self.bricks.add(brick, brick.rect)
+
+        # 随关卡提高球的速度，增加游戏难度
+        self.ball.dx = 5 + level  # 水平速度随关卡提升
+        self.ball.dy = -(5 + level)  # 垂直速度随关卡提升
+
+    def _bounce_off_paddle(self):
+        """根据击中挡板的位置计算反弹角度，使游戏更有趣味性"""
+        relative_intersect_x = (self.paddle.rect.centerx - self.ball.x)
+        normalized_intersect = relative_intersect_x / (self.paddle.width / 2)
+        bounce_angle = normalized_intersect * 60  # 最大反弹角度为60度
+        speed = (self.ball.dx ** 2 + self.ball.dy ** 2) ** 0.5
+        # 使用三角函数计算新的速度分量
+        self.ball.dx = -speed * math.sin(math.radians(bounce_angle))
+        self.ball.dy = -speed * math.cos(math.radians(bounce_angle))
+
+    def hit_brick(self, brick):
+        """砖块被击中一次，击碎时移除砖块并加分
+
+        击碎的砖块还回对象池，在下一关取出之前属性保持不变
+        """
+        brick.hits_required -= 1  # 砖块被击中次数减1
+        if brick.hits_required <= 0:
+            self.bricks.remove(brick)  # 移除被完全击碎的砖块
+            self.brick_pool.release(brick)
+            self.score += brick.points  # 增加得分
+
+    def _first_hit(self, dx, dy):
+        """求球沿位移(dx, dy)移动时最早碰到的物体
+
+        返回:
+            tuple: (接触时刻, 法线x, 法线y, 物体)，物体为'wall'、挡板或砖块；
+                   这一段内不会碰到任何物体时返回None
+        """
+        ball = self.ball
+        radius = ball.radius
+        best = None
+        # 左右墙壁和上边界：球已经越过墙壁时立即反弹
+        if dx < 0:
+            best = (max((radius - ball.x) / dx, 0.0), 1, 0, 'wall')
+        elif dx > 0:
+            best = (max((WINDOW_WIDTH - radius - ball.x) / dx, 0.0), -1, 0, 'wall')
+        if best is not None and best[0] > 1:
+            best = None
+        if dy < 0:
+            t = max((radius - ball.y) / dy, 0.0)
+            if t <= 1 and (best is None or t < best[0]):
+                best = (t, 0, 1, 'wall')
+
+        hit = sweep_box(ball.x, ball.y, dx, dy, radius, radius, self.paddle.rect)
+        if hit is not None and (best is None or hit[0] < best[0]):
+            best = hit + (self.paddle,)
+
+        # 只检查扫过区域所在网格格子里的砖块
+        left, top, right, bottom = sweep_bounds(ball.x, ball.y, dx, dy, radius, radius)
+        for brick in self.bricks.query(left, top, right, bottom):
+            hit = sweep_box(ball.x, ball.y, dx, dy, radius, radius, brick.rect)
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = hit + (brick,)
+        return best
+
+    def move_ball(self, dt=1.0):
+        """沿速度方向移动球，并处理这段时间内的所有碰撞
+
+        每次移动到最早的接触点，按接触面反弹后再用剩余的时间继续移动，
+        球速再快也不会穿过砖块和挡板，一次碰撞也只会反弹一次。
+
+        参数:
+            dt: 经过的时间（以帧为单位）
+        """
+        ball = self.ball
+        remaining = dt
+        for _ in range(MAX_BOUNCES):
+            dx = ball.dx * remaining
+            dy = ball.dy * remaining
+            if not dx and not dy:
+                break
+            hit = self._first_hit(dx, dy)
+            if hit is None:
+                ball.move_to(ball.x + dx, ball.y + dy)
+                break
+            t, normal_x, normal_y, target = hit
+            ball.move_to(ball.x + dx * t, ball.y + dy * t)
+            remaining *= 1 - t
+            if target is self.paddle and normal_y < 0:
+                self._bounce_off_paddle()  # 击中挡板上表面
+                continue
+            ball.dx, ball.dy = reflect(ball.dx, ball.dy, normal_x, normal_y)
+            if isinstance(target, Brick):
+                self.hit_brick(target)
+
+    def handle_collisions(self):
+        """处理碰撞
+
+        球的移动和碰撞反弹在move_ball中处理。这里处理挡板移动后压到球上的情况，
+        并检查是否完成关卡。
+        """
+        # 挡板横向移动时可能直接压到正在下落的球上，此时把球托到挡板上方再反弹
+        if self.ball.dy > 0 and self.ball.rect.colliderect(self.paddle.rect):
+            self.ball.move_to(self.ball.x, self.paddle.rect.top - self.ball.radius)
+            self._bounce_off_paddle()
+
+        # 检查是否完成关卡
+        if not self.bricks:
+            if self.level < 5:  # 最多5关
+                self.level += 1  # 进入下一关
+                self.setup_level(self.level)  # 设置新关卡
+                self.ball.reset()  # 重置球的位置
+                self.paddle.reset()  # 重置挡板位置
+            else:
+                self.game_over = True  # 通关结束
+
+    def step(self, action=None, dt=1.0):
+        """推进一帧
+
+        参数:
+            action: 挡板移动方向，取值见ACTIONS
+            dt: 经过的时间（以帧为单位），球速较快时可以用较小的dt多次推进
+        """
+        if self.game_over:
+            return
+        self.paddle.move(action, dt)
+
+        # 更新球的位置和处理碰撞
+        self.move_ball(dt)
+        self.handle_collisions()
+
+        # 检查球是否落到底部
+        if self.ball.rect.bottom >= WINDOW_HEIGHT:
+            self.lives -= 1  # 失去一条生命
+            if self.lives <= 0:
+                self.game_over = True
+            else:
+                self.ball.reset()  # 重置球的位置
@@ -0,0 +1,225 @@
+from games.core.game2048_tables import GRID_SIZE, encode_board, decode_board, move_board
+from games.core.rng import session_rng
+
+# 合法的动作（移动方向）
+ACTIONS = ('up', 'down', 'left', 'right')
+
+
+def plan_moves(grid, direction):
+    """计算一次移动中每个数字从哪里移动到哪里（用于绘制滑动和合并动画）
+
+    合并规则与Game2048Core.move相同：每一行（列）从下标小的一端开始两两合并，
+    再整体推向移动方向的一端。
+
+    参数:
+        grid: 移动前的网格
+        direction: 移动方向，'up', 'down', 'left', 'right'
+
+    返回:
+        list: 每个非零数字一项(起点, 终点, 数值, 是否合并)，起点和终点为(行, 列)；
+              合并的两个数字终点相同，数值为合并前的数值
+    """
+    moves = []
+    for line in range(GRID_SIZE):
+        if direction in ('up', 'down'):
+            cells = [(i, line) for i in range(GRID_SIZE)]
+        else:
+            cells = [(line, j) for j in range(GRID_SIZE)]
+        tiles = [(cell, grid[cell[0]][cell[1]]) for cell in cells if grid[cell[0]][cell[1]]]
+
+        # 两两合并，每组一个或两个数字
+        groups = []
+        k = 0
+        while k < len(tiles):
+            if k + 1 < len(tiles) and tiles[k][1] == tiles[k + 1][1]:
+                groups.append(tiles[k:k + 2])
+                k += 2
+            else:
+                groups.append(tiles[k:k + 1])
+                k += 1
+
+        first = 0 if direction in ('up', 'left') else GRID_SIZE - len(groups)
+        for index, group in enumerate(groups):
+            target = cells[first + index]
+            for cell, value in group:
+                moves.append((cell, target, value, len(group) == 2))
+    return moves
+
+
+class Game2048Core:
+    """2048游戏逻辑核心
+
+    不依赖pygame和显示窗口，保存棋盘状态并根据动作推进游戏，
+    可在无显示环境下批量模拟对局。
+
+    属性:
+        grid: 游戏网格，grid[i][j]为第i行第j列的数字，0表示空格
+        score: 当前得分
+        game_over: 游戏是否结束
+        use_tables: 是否使用查找表执行移动（见game2048_tables）
+        seed: 这一局的随机种子
+        rng: 随机数生成器（决定新数字的位置和大小）
+    """
+    def __init__(self, use_tables=False, seed=None, rng=None):
+        """初始化游戏状态
+
+        参数:
+            use_tables: True表示用预计算的行查找表执行移动
+            seed: 随机种子，None表示新生成一个（记录在seed属性中）
+            rng: 随机数生成器（见games.core.rng），给出时不使用seed创建
+        """
+        self.seed, self.rng = session_rng(seed, rng)
+        self.use_tables = use_tables
+        self.reset()
+
+    def reset(self):
+        """重置为新的一局，并添加两个初始数字"""
+        self.grid = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
+        self.score = 0
+        self.game_over = False
+        self.add_new_tile()
+        self.add_new_tile()
+
+    def add_new_tile(self):
+        """在空格子中随机添加一个新数字（2或4）"""
+        empty_cells = [(i, j) for i in range(GRID_SIZE) for j in range(GRID_SIZE) if self.grid[i][j] == 0]
+        if empty_cells:
+            i, j = self.rng.choice(empty_cells)
+            self.grid[i][j] = 2 if self.rng.random() < 0.9 else 4
+
+    def move(self, direction):
+        """移动并合并数字
+
+        参数:
+            direction: 移动方向，'up', 'down', 'left', 'right'
+
+        返回:
+            bool: True表示有移动或合并发生，False表示没有变化
+        """
+        if self.use_tables:
+            return self.move_with_tables(direction)
+
+        moved = False
+        if direction in ['up', 'down']:
+            for j in range(GRID_SIZE):
+                # 获取当前列的非零数字
+                column = [self.grid[i][j] for i in range(GRID_SIZE)]
+                column = [x for x in column if x != 0]
+
+                # 合并相同的数字
+                i = 0
+                while i < len(column) - 1:
+                    if column[i] == column[i + 1]:
+                        column[i] *= 2
+                        self.score += column[i]
+                        column.pop(i + 1)
+                        moved = True
+                    i += 1
+
+                # 填充零
+                while len(column) < GRID_SIZE:
+                    if direction == 'up':
+                        column.append(0)
+                    else:
+                        column.insert(0, 0)
+
+                # 更新网格
+                for i in range(GRID_SIZE):
+                    if self.grid[i][j] != column[i]:
+                        moved = True
+                    self.grid[i][j] = column[i]
+
+        else:  # left or right
+            for i in range(GRID_SIZE):
+                # 获取当前行的非零数字
+                row = [self.grid[i][j] for j in range(GRID_SIZE)]
+                row = [x for x in row if x != 0]
+
+                # 合并相同的数字
+                j = 0
+                while j < len(row) - 1:
+                    if row[j] == row[j + 1]:
+                        row[j] *= 2
+                        self.score += row[j]
+                        row.pop(j + 1)
+                        moved = True
+                    j += 1
+
+                # 填充零
+                while len(row) < GRID_SIZE:
+                    if direction == 'left':
+                        row.append(0)
+                    else:
+                        row.insert(0, 0)
+
+                # 更新网格
+                for j in range(GRID_SIZE):
+                    if self.grid[i][j] != row[j]:
+                        moved = True
+                    self.grid[i][j] = row[j]
+
+        return moved
+
+    def move_with_tables(self, direction):
+        """用预计算的行查找表移动并合并数字
+
+        结果与move相同，每次移动只需4次查表
+
+        参数:
+            direction: 移动方向，'up', 'down', 'left', 'right'
+
+        返回:
+            bool: True表示有移动或合并发生，False表示没有变化
+        """
+        board = encode_board(self.grid)
+        result, score = move_board(board, direction)
+        if result == board:
+            return False
+        self.grid = decode_board(result)
+        self.score += score
+        return True
+
+    def check_game_over(self):
+        """检查游戏是否结束
+
+        返回:
+            bool: True表示游戏结束，False表示可以继续
+        """
+        # 检查是否有空格子
+        for i in range(GRID_SIZE):
+            for j in range(GRID_SIZE):
+                if self.grid[i][j] == 0:
+                    return False
+
+        # 检查是否有相邻的相同数字
+        for i in range(GRID_SIZE):
+            for j in range(GRID_SIZE):
+                current = self.grid[i][j]
+                # 检查右边
+                if j < GRID_SIZE - 1 and current == self.grid[i][j + 1]:
+                    return False
+                # 检查下边
+                if i < GRID_SIZE - 1 and current == self.grid[i + 1][j]:
+                    return False
+
+        return True
+
+    def step(self, action):
+        """执行一步动作
+
+        移动棋盘，有变化时添加新数字并检查游戏是否结束
+
+        参数:
+            action: 移动方向，取值见ACTIONS
+
+        返回:
+            bool: True表示有移动或合并发生
+        """
+        if self.game_over:
+            return False
+        moved = self.move(action)
+        if moved:
+            self.add_new_tile()
+            if self.check_game_over():
+                self.game_over = True
+        return moved
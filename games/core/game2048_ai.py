@@ -0,0 +1,243 @@
+"""2048自动玩家
+
+基于game2048_tables的64位棋盘编码，用期望最大化（expectimax）搜索选择移动方向：
+玩家节点取四个方向中期望值最大的一个，机会节点对每个空格按概率生成2（90%）或4（10%）
+取加权平均。搜索使用迭代加深，在每步的时间预算内尽量搜得更深，
+并用按LRU淘汰的置换表缓存已经评估过的局面，内存占用有上限。
+
+搜索放到后台线程中运行（见search_worker.SearchWorker），游戏主循环不会因为搜索而卡顿。
+"""
+import time
+from collections import OrderedDict
+
+from games.core.game2048 import ACTIONS
+from games.core.game2048_tables import ROW_MASK, decode_row, encode_board, move_board, transpose
+
+# 估值函数参数
+SCORE_LOST_PENALTY = 200000.0
+SCORE_MONOTONICITY_POWER = 4.0
+SCORE_MONOTONICITY_WEIGHT = 47.0
+SCORE_SUM_POWER = 3.5
+SCORE_SUM_WEIGHT = 11.0
+SCORE_MERGES_WEIGHT = 700.0
+SCORE_EMPTY_WEIGHT = 270.0
+
+# 累计概率低于该值的分支不再展开，直接估值
+PROBABILITY_CUTOFF = 0.0001
+
+
+def _row_heuristic(row):
+    """计算一行的估值：空格越多、可合并越多、越单调越好"""
+    total = 0.0
+    empty = 0
+    merges = 0
+    previous = 0
+    counter = 0
+    for rank in row:
+        total += rank ** SCORE_SUM_POWER
+        if rank == 0:
+            empty += 1
+        else:
+            if previous == rank:
+                counter += 1
+            elif counter > 0:
+                merges += 1 + counter
+                counter = 0
+            previous = rank
+    if counter > 0:
+        merges += 1 + counter
+
+    monotonicity_left = 0.0
+    monotonicity_right = 0.0
+    for i in range(1, len(row)):
+        if row[i - 1] > row[i]:
+            monotonicity_left += row[i - 1] ** SCORE_MONOTONICITY_POWER - row[i] ** SCORE_MONOTONICITY_POWER
+        else:
+            monotonicity_right += row[i] ** SCORE_MONOTONICITY_POWER - row[i - 1] ** SCORE_MONOTONICITY_POWER
+
+    return (SCORE_LOST_PENALTY + SCORE_EMPTY_WEIGHT * empty + SCORE_MERGES_WEIGHT * merges -
+            SCORE_MONOTONICITY_WEIGHT * min(monotonicity_left, monotonicity_right) -
+            SCORE_SUM_WEIGHT * total)
+
+
+# 预计算每种行状态的估值
+ROW_HEURISTIC = [_row_heuristic(decode_row(code)) for code in range(1 << 16)]
+
+
+def evaluate(board):
+    """估值整个棋盘（所有行和所有列的估值之和）"""
+    columns = transpose(board)
+    return (ROW_HEURISTIC[board & ROW_MASK] +
+            ROW_HEURISTIC[(board >> 16) & ROW_MASK] +
+            ROW_HEURISTIC[(board >> 32) & ROW_MASK] +
+            ROW_HEURISTIC[(board >> 48) & ROW_MASK] +
+            ROW_HEURISTIC[columns & ROW_MASK] +
+            ROW_HEURISTIC[(columns >> 16) & ROW_MASK] +
+            ROW_HEURISTIC[(columns >> 32) & ROW_MASK] +
+            ROW_HEURISTIC[(columns >> 48) & ROW_MASK])
+
+
+def empty_shifts(board):
+    """返回所有空格在棋盘编码中的位移"""
+    return [shift for shift in range(0, 64, 4) if not (board >> shift) & 0xF]
+
+
+class TranspositionTable:
+    """置换表
+
+    以棋盘编码为键缓存机会节点的期望值，按最近最少使用（LRU）淘汰，
+    条目数不超过max_entries。
+
+    属性:
+        max_entries: 最多保存的条目数
+        hits: 命中次数
+        misses: 未命中次数
+    """
+    def __init__(self, max_entries=200000):
+        """初始化置换表
+
+        参数:
+            max_entries: 最多保存的条目数
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, board, depth):
+        """查找缓存的期望值
+
+        参数:
+            board: 棋盘编码
+            depth: 需要的剩余搜索深度
+
+        返回:
+            float: 缓存的值；没有足够深度的缓存时返回None
+        """
+        entry = self.entries.get(board)
+        if entry is None or entry[0] < depth:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(board)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, board, depth, value):
+        """保存期望值，超过容量时淘汰最久未使用的条目"""
+        self.entries[board] = (depth, value)
+        self.entries.move_to_end(board)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """清空置换表"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class _SearchTimeout(Exception):
+    """搜索超出时间预算"""
+
+
+class ExpectimaxPlayer:
+    """期望最大化搜索的自动玩家
+
+    属性:
+        time_budget: 每步搜索的时间预算（秒）
+        max_depth: 迭代加深的最大深度（玩家移动的层数）
+        cache: 置换表
+        last_depth: 上一次搜索完整完成的深度
+    """
+    def __init__(self, time_budget=0.05, max_depth=6, cache_size=200000):
+        """初始化自动玩家
+
+        参数:
+            time_budget: 每步搜索的时间预算（秒）
+            max_depth: 迭代加深的最大深度
+            cache_size: 置换表最多保存的条目数
+        """
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.cache = TranspositionTable(cache_size)
+        self.last_depth = 0
+        self._deadline = 0.0
+        self._nodes = 0
+
+    def best_move(self, board):
+        """为当前局面选择移动方向
+
+        参数:
+            board: 棋盘编码，或Game2048Core格式的4x4数字列表
+
+        返回:
+            str: 最佳移动方向；没有可移动的方向时返回None
+        """
+        if isinstance(board, list):
+            board = encode_board(board)
+        candidates = []
+        for direction in ACTIONS:
+            result, score = move_board(board, direction)
+            if result != board:
+                candidates.append((direction, result, score))
+        if not candidates:
+            return None
+
+        best = candidates[0][0]
+        self.last_depth = 0
+        self._deadline = time.perf_counter() + self.time_budget
+        self._nodes = 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                values = [(score + self._chance_node(result, depth, 1.0), direction)
+                          for direction, result, score in candidates]
+            except _SearchTimeout:
+                break
+            best = max(values)[1]
+            self.last_depth = depth
+        return best
+
+    def _check_time(self):
+        """每隔一段节点检查一次是否超时"""
+        self._nodes += 1
+        if not self._nodes & 0x3F and time.perf_counter() > self._deadline:
+            raise _SearchTimeout()
+
+    def _chance_node(self, board, depth, probability):
+        """机会节点：对所有可能生成的新数字取期望"""
+        self._check_time()
+        if depth <= 0 or probability < PROBABILITY_CUTOFF:
+            return evaluate(board)
+        cached = self.cache.get(board, depth)
+        if cached is not None:
+            return cached
+
+        shifts = empty_shifts(board)
+        if not shifts:
+            return self._max_node(board, depth, probability)
+        probability /= len(shifts)
+        total = 0.0
+        deadline = self._deadline
+        for shift in shifts:
+            # 每个空格展开两棵子树，代价可能远大于_check_time的检查间隔，这里逐个检查
+            if time.perf_counter() > deadline:
+                raise _SearchTimeout()
+            total += 0.9 * self._max_node(board | (1 << shift), depth, probability * 0.9)
+            total += 0.1 * self._max_node(board | (2 << shift), depth, probability * 0.1)
+        value = total / len(shifts)
+        self.cache.put(board, depth, value)
+        return value
+
+    def _max_node(self, board, depth, probability):
+        """玩家节点：取所有方向中最大的期望值"""
+        best = 0.0
+        for direction in ACTIONS:
+            result, score = move_board(board, direction)
+            if result != board:
+                value = score + self._chance_node(result, depth - 1, probability)
+                if value > best:
+                    best = value
+        return best
@@ -0,0 +1,194 @@
+"""2048批量模拟引擎
+
+用NumPy数组同时保存N个棋盘，一次调用即可对所有棋盘执行移动、计分、
+判断是否移动、随机生成新数字和检查游戏结束，用于求解器和模糊测试等大批量场景。
+
+棋盘以指数形式保存：0表示空格，k表示数字2**k。每一行的4个指数打包成
+16位整数后查game2048_tables中的行查找表得到移动结果，因此单个格子最大支持2**15（32768）。
+移动和计分规则与Game2048Core.move完全一致（包括向右、向下移动时同样从行首
+开始合并）；新数字的生成概率也相同，但使用NumPy的随机数生成器，
+随机序列与Game2048Core（random.Random）不同。
+"""
+import numpy as np
+
+from games.core.game2048 import GRID_SIZE, ACTIONS
+from games.core.game2048_tables import ROW_LEFT, ROW_RIGHT, ROW_SCORE
+from games.core.rng import session_rng
+
+
+def _build_row_tables():
+    """把game2048_tables中的行查找表转换为NumPy数组
+
+    返回:
+        tuple: (靠左结果表, 靠右结果表, 得分表)，结果表形状为(65536, 4)的uint8数组，
+               得分表形状为(65536,)的int64数组
+    """
+    shifts = np.arange(GRID_SIZE) * 4
+    left = ((np.array(ROW_LEFT)[:, None] >> shifts) & 0xF).astype(np.uint8)
+    right = ((np.array(ROW_RIGHT)[:, None] >> shifts) & 0xF).astype(np.uint8)
+    return left, right, np.array(ROW_SCORE, dtype=np.int64)
+
+
+_ROW_LEFT, _ROW_RIGHT, _ROW_SCORE = _build_row_tables()
+
+
+class BatchGame2048:
+    """批量2048游戏
+
+    属性:
+        boards: 形状为(N, 4, 4)的uint8数组，保存每个格子的指数
+        scores: 形状为(N,)的int64数组，每个棋盘的得分
+        game_over: 形状为(N,)的bool数组，每个棋盘是否结束
+        seed: 随机种子
+        rng: NumPy随机数生成器
+    """
+    def __init__(self, n, seed=None, rng=None):
+        """初始化N个棋盘
+
+        参数:
+            n: 棋盘数量
+            seed: 随机种子，None表示新生成一个（记录在seed属性中）
+            rng: NumPy随机数生成器（见games.core.rng），给出时不使用seed创建
+        """
+        self.seed, self.rng = session_rng(seed, rng, numpy=True)
+        self.boards = np.zeros((n, GRID_SIZE, GRID_SIZE), dtype=np.uint8)
+        self.scores = np.zeros(n, dtype=np.int64)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.reset()
+
+    def __len__(self):
+        return len(self.boards)
+
+    def reset(self):
+        """重置所有棋盘，并各添加两个初始数字"""
+        self.boards[:] = 0
+        self.scores[:] = 0
+        self.game_over[:] = False
+        everyone = np.ones(len(self), dtype=bool)
+        self.add_new_tiles(everyone)
+        self.add_new_tiles(everyone)
+
+    @classmethod
+    def from_grids(cls, grids, seed=None, rng=None):
+        """从Game2048Core格式的棋盘列表创建批量引擎
+
+        参数:
+            grids: 棋盘列表，每个棋盘是4x4的数字列表（0表示空格）
+            seed: 随机种子
+            rng: NumPy随机数生成器，给出时不使用seed创建
+
+        返回:
+            BatchGame2048: 新的批量引擎
+        """
+        batch = cls(0, seed, rng)
+        values = np.asarray(grids, dtype=np.int64).reshape(-1, GRID_SIZE, GRID_SIZE)
+        exponents = np.zeros(values.shape, dtype=np.uint8)
+        nonzero = values > 0
+        exponents[nonzero] = np.log2(values[nonzero]).round().astype(np.uint8)
+        batch.boards = exponents
+        batch.scores = np.zeros(len(exponents), dtype=np.int64)
+        batch.game_over = batch.check_game_over()
+        return batch
+
+    def to_grids(self):
+        """转换为Game2048Core格式的棋盘列表
+
+        返回:
+            list: 每个棋盘是4x4的数字列表（0表示空格）
+        """
+        values = np.where(self.boards > 0, np.left_shift(1, self.boards.astype(np.int64)), 0)
+        return values.tolist()
+
+    def move(self, direction, mask=None):
+        """对棋盘执行同一方向的移动并合并数字
+
+        参数:
+            direction: 移动方向，'up', 'down', 'left', 'right'
+            mask: 形状为(N,)的bool数组，只移动为True的棋盘；None表示全部
+
+        返回:
+            numpy.ndarray: 形状为(N,)的bool数组，True表示该棋盘有移动或合并发生
+        """
+        moved = np.zeros(len(self), dtype=bool)
+        index = np.arange(len(self)) if mask is None else np.flatnonzero(mask)
+        if len(index) == 0:
+            return moved
+
+        # 上下移动时转置棋盘，按列当作行处理
+        vertical = direction in ('up', 'down')
+        boards = self.boards[index]
+        if vertical:
+            boards = boards.transpose(0, 2, 1)
+        codes = (boards[:, :, 0].astype(np.int64) |
+                 (boards[:, :, 1].astype(np.int64) << 4) |
+                 (boards[:, :, 2].astype(np.int64) << 8) |
+                 (boards[:, :, 3].astype(np.int64) << 12))
+        table = _ROW_LEFT if direction in ('up', 'left') else _ROW_RIGHT
+        result = table[codes]
+        if vertical:
+            result = result.transpose(0, 2, 1)
+
+        changed = (result != self.boards[index]).any(axis=(1, 2))
+        self.boards[index] = result
+        self.scores[index] += _ROW_SCORE[codes].sum(axis=1)
+        moved[index] = changed
+        return moved
+
+    def add_new_tiles(self, mask):
+        """在指定棋盘的空格子中随机添加一个新数字（2或4）
+
+        参数:
+            mask: 形状为(N,)的bool数组，为True的棋盘添加新数字
+        """
+        flat = self.boards.reshape(len(self), GRID_SIZE * GRID_SIZE)
+        empty = flat == 0
+        counts = empty.sum(axis=1)
+        targets = np.flatnonzero(mask & (counts > 0))
+        if len(targets) == 0:
+            return
+
+        # 在每个棋盘的空格中均匀选择一个：第k个空格即累计计数等于k+1的位置
+        picks = (self.rng.random(len(targets)) * counts[targets]).astype(np.int64)
+        cumulative = np.cumsum(empty[targets], axis=1)
+        cells = np.argmax((cumulative == (picks + 1)[:, None]) & empty[targets], axis=1)
+        values = np.where(self.rng.random(len(targets)) < 0.9, 1, 2).astype(np.uint8)
+        flat[targets, cells] = values
+
+    def check_game_over(self):
+        """检查每个棋盘是否已经无法移动
+
+        返回:
+            numpy.ndarray: 形状为(N,)的bool数组，True表示该棋盘游戏结束
+        """
+        boards = self.boards
+        has_empty = (boards == 0).any(axis=(1, 2))
+        horizontal = (boards[:, :, :-1] == boards[:, :, 1:]).any(axis=(1, 2))
+        vertical = (boards[:, :-1, :] == boards[:, 1:, :]).any(axis=(1, 2))
+        return ~(has_empty | horizontal | vertical)
+
+    def step(self, directions):
+        """对所有未结束的棋盘执行一步
+
+        移动棋盘，有变化的棋盘添加新数字，并更新游戏结束状态
+
+        参数:
+            directions: 一个方向字符串（所有棋盘相同），或形状为(N,)的整数数组，
+                        每个元素是ACTIONS中的下标
+
+        返回:
+            numpy.ndarray: 形状为(N,)的bool数组，True表示该棋盘有移动或合并发生
+        """
+        active = ~self.game_over
+        if isinstance(directions, str):
+            moved = self.move(directions, active)
+        else:
+            directions = np.asarray(directions)
+            moved = np.zeros(len(self), dtype=bool)
+            for code, direction in enumerate(ACTIONS):
+                selected = active & (directions == code)
+                if selected.any():
+                    moved |= self.move(direction, selected)
+
+        self.add_new_tiles(moved)
+        self.game_over |= moved & self.check_game_over()
+        return moved
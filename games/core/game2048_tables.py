@@ -0,0 +1,152 @@
+"""2048行移动查找表
+
+GRID_SIZE为4时，每个格子用4位指数表示（0为空格，k为数字2**k），
+一行正好是16位整数，整个棋盘是64位整数：第i行第j列位于第16*i + 4*j位。
+模块导入时预计算全部65536种行状态合并后靠左、靠右的结果和得分，
+移动棋盘只需要4次查表，上下移动先转置棋盘再按行处理。
+这是搜索类AI（如期望最大化搜索）的基础。
+
+单个格子最大支持2**15（32768），两个32768合并时结果保持为32768，得分照常计算。
+"""
+# 棋盘边长（查找表只适用于4x4棋盘）
+GRID_SIZE = 4
+
+# 单个格子能表示的最大指数（4位）
+MAX_EXPONENT = 15
+
+ROW_MASK = 0xFFFF
+
+
+def merge_row(row):
+    """合并一行指数
+
+    规则与Game2048Core.move相同：先去掉空格，再从行首开始合并相邻的相同数字，
+    每个数字每次最多合并一次。
+
+    参数:
+        row: 4个指数组成的列表
+
+    返回:
+        tuple: (合并后的非空指数列表, 本行得分)
+    """
+    tiles = [e for e in row if e != 0]
+    result = []
+    score = 0
+    i = 0
+    while i < len(tiles):
+        if i + 1 < len(tiles) and tiles[i] == tiles[i + 1]:
+            result.append(min(tiles[i] + 1, MAX_EXPONENT))
+            score += 2 ** (tiles[i] + 1)
+            i += 2
+        else:
+            result.append(tiles[i])
+            i += 1
+    return result, score
+
+
+def encode_row(row):
+    """把4个指数编码为16位整数"""
+    return row[0] | (row[1] << 4) | (row[2] << 8) | (row[3] << 12)
+
+
+def decode_row(code):
+    """把16位整数解码为4个指数"""
+    return [(code >> (4 * k)) & 0xF for k in range(GRID_SIZE)]
+
+
+def _build_tables():
+    """预计算所有行状态的移动结果
+
+    返回:
+        tuple: (靠左结果表, 靠右结果表, 得分表)，均为长度65536的列表
+    """
+    left = [0] * (1 << 16)
+    right = [0] * (1 << 16)
+    scores = [0] * (1 << 16)
+    for code in range(1 << 16):
+        tiles, score = merge_row(decode_row(code))
+        padding = [0] * (GRID_SIZE - len(tiles))
+        left[code] = encode_row(tiles + padding)
+        right[code] = encode_row(padding + tiles)
+        scores[code] = score
+    return left, right, scores
+
+
+ROW_LEFT, ROW_RIGHT, ROW_SCORE = _build_tables()
+
+
+def encode_board(grid):
+    """把Game2048Core的棋盘编码为64位整数
+
+    参数:
+        grid: 4x4的数字列表（0表示空格）
+
+    返回:
+        int: 编码后的棋盘
+    """
+    board = 0
+    for i in range(GRID_SIZE):
+        for j in range(GRID_SIZE):
+            value = grid[i][j]
+            if value:
+                board |= (value.bit_length() - 1) << (16 * i + 4 * j)
+    return board
+
+
+def decode_board(board):
+    """把64位整数解码为Game2048Core的棋盘
+
+    参数:
+        board: 编码后的棋盘
+
+    返回:
+        list: 4x4的数字列表（0表示空格）
+    """
+    grid = []
+    for i in range(GRID_SIZE):
+        row = []
+        for j in range(GRID_SIZE):
+            exponent = (board >> (16 * i + 4 * j)) & 0xF
+            row.append(1 << exponent if exponent else 0)
+        grid.append(row)
+    return grid
+
+
+def transpose(board):
+    """转置棋盘（交换行和列）"""
+    a1 = board & 0xF0F00F0FF0F00F0F
+    a2 = board & 0x0000F0F00000F0F0
+    a3 = board & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def _apply_rows(board, table):
+    """对棋盘的每一行查表，返回(新棋盘, 得分)"""
+    r0 = board & ROW_MASK
+    r1 = (board >> 16) & ROW_MASK
+    r2 = (board >> 32) & ROW_MASK
+    r3 = (board >> 48) & ROW_MASK
+    result = table[r0] | (table[r1] << 16) | (table[r2] << 32) | (table[r3] << 48)
+    return result, ROW_SCORE[r0] + ROW_SCORE[r1] + ROW_SCORE[r2] + ROW_SCORE[r3]
+
+
+def move_board(board, direction):
+    """移动编码后的棋盘
+
+    参数:
+        board: 编码后的棋盘
+        direction: 移动方向，'up', 'down', 'left', 'right'
+
+    返回:
+        tuple: (移动后的棋盘, 本次得分)，棋盘不变表示无法向该方向移动
+    """
+    if direction == 'left':
+        return _apply_rows(board, ROW_LEFT)
+    if direction == 'right':
+        return _apply_rows(board, ROW_RIGHT)
+    result, score = _apply_rows(transpose(board), ROW_LEFT if direction == 'up' else ROW_RIGHT)
+    return transpose(result), score
@@ -0,0 +1,65 @@
+from games.core.gomoku_lines import BOARD_SIZE, EMPTY, BLACK_PIECE, LineIndex
+
+
+class GomokuCore:
+    """五子棋游戏逻辑核心
+
+    不依赖pygame和显示窗口，可在无显示环境下批量模拟对局。
+
+    属性:
+        board: 棋盘状态数组，0为空，1为黑棋，2为白棋
+        current_player: 当前玩家（1为黑棋，2为白棋）
+        game_over: 游戏是否结束
+        winner: 获胜者
+        win_pieces: 获胜的五子位置列表
+        lines: 连线索引，随落子增量更新（见gomoku_lines）
+    """
+    def __init__(self):
+        """初始化游戏状态"""
+        self.board = [[EMPTY] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+        self.current_player = BLACK_PIECE
+        self.game_over = False
+        self.winner = None
+        self.win_pieces = []
+        self.lines = LineIndex()
+
+    def check_win(self, row, col):
+        """检查是否有玩家获胜
+
+        用连线索引检查指定位置的棋子是否形成五子连珠，只需查看经过该点的4条线
+
+        参数:
+            row: 行坐标
+            col: 列坐标
+
+        返回:
+            bool: True表示有玩家获胜，False表示游戏继续
+        """
+        win_pieces = self.lines.winning_run(row, col)
+        if win_pieces:
+            self.win_pieces = win_pieces  # 保存获胜棋子的位置
+            return True
+        return False
+
+    def step(self, action):
+        """落子
+
+        在指定位置放置当前玩家的棋子，判断胜负并切换玩家
+
+        参数:
+            action: 落子位置(row, col)
+
+        返回:
+            bool: True表示落子成功，False表示位置无效或游戏已结束
+        """
+        row, col = action
+        if self.game_over or self.board[row][col] != EMPTY:
+            return False
+        self.board[row][col] = self.current_player
+        self.lines.place(row, col, self.current_player)
+        if self.check_win(row, col):
+            self.game_over = True
+            self.winner = self.current_player
+        else:
+            self.current_player = 3 - self.current_player  # 切换玩家
+        return True
@@ -0,0 +1,350 @@
+"""五子棋电脑对手
+
+负极大值（negamax）搜索加alpha-beta剪枝：
+- 候选着法只取已有棋子周围两格内的空位，并按棋型收益排序后只保留前若干个
+- 局面用Zobrist哈希标识，置换表缓存已经搜索过的局面的值、边界类型和最佳着法
+- 杀手着法（每层两个）和历史表决定同类着法的先后顺序，让剪枝尽早发生
+- 迭代加深：在时间预算内逐层加深，超时时返回最后一次完整搜索的结果
+
+估值和五连判断都直接读取gomoku_lines.LineIndex的增量棋型统计。
+搜索可以放到后台线程中运行（见search_worker.SearchWorker）。
+"""
+import random
+import time
+
+from games.core.gomoku_lines import (BOARD_SIZE, EMPTY, BLACK_PIECE, WHITE_PIECE, LINES, CELL_LINES,
+                                     FIVE, OPEN_FOUR, FOUR, OPEN_THREE, LineIndex, line_patterns)
+
+# 获胜局面的分值，减去步数后仍远大于任何普通估值
+WIN_SCORE = 10000000
+
+# 各棋型的估值权重，按棋型编号排列
+PATTERN_WEIGHTS = (WIN_SCORE, 100000, 10000, 8000, 1000, 300, 50)
+
+# 每个节点最多展开的候选着法数
+MAX_CANDIDATES = 12
+
+# 置换表的边界类型
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+def _build_zobrist(seed=2024):
+    """生成Zobrist随机数表
+
+    返回:
+        tuple: (keys[player][row][col], 轮到白棋时异或的随机数)
+    """
+    rng = random.Random(seed)
+    keys = {
+        player: [[rng.getrandbits(64) for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+        for player in (BLACK_PIECE, WHITE_PIECE)
+    }
+    return keys, rng.getrandbits(64)
+
+
+ZOBRIST, ZOBRIST_WHITE_TO_MOVE = _build_zobrist()
+
+
+def evaluate(index, player):
+    """从player的角度估值局面（轮到player落子）
+
+    参数:
+        index: 连线索引
+        player: 轮到落子的玩家
+
+    返回:
+        int: 估值，越大对player越有利
+    """
+    mine = index.counts[player]
+    theirs = index.counts[3 - player]
+    # 轮到自己时已有四（活四或冲四），下一步必胜
+    if mine[OPEN_FOUR] or mine[FOUR]:
+        return WIN_SCORE // 2
+    # 对方有活四或双四，挡不住
+    if theirs[OPEN_FOUR] or theirs[FOUR] >= 2:
+        return -WIN_SCORE // 2
+    # 自己有活三而对方没有四，下一步成活四
+    if mine[OPEN_THREE] and not theirs[FOUR]:
+        return WIN_SCORE // 4
+    score = 0
+    for kind in range(OPEN_FOUR, len(PATTERN_WEIGHTS)):
+        score += PATTERN_WEIGHTS[kind] * (mine[kind] - theirs[kind])
+    return score
+
+
+def _weighted(counts):
+    """棋型数量的加权和"""
+    total = 0
+    for kind, count in enumerate(counts):
+        if count:
+            total += PATTERN_WEIGHTS[kind] * count
+    return total
+
+
+def move_value(index, row, col, player):
+    """估计在指定空位落子的收益，用于候选着法排序
+
+    只查看经过该点的4条线，不修改索引
+
+    参数:
+        index: 连线索引
+        row: 行坐标
+        col: 列坐标
+        player: 落子的玩家
+
+    返回:
+        tuple: (进攻收益, 防守收益)，防守收益是对方在该点落子的收益
+    """
+    own_masks = index.masks[player]
+    opponent_masks = index.masks[3 - player]
+    attack = 0
+    threat = 0
+    for line, position in CELL_LINES[row][col]:
+        length = len(LINES[line])
+        own = own_masks[line]
+        opponent = opponent_masks[line]
+        bit = 1 << position
+        attack += (_weighted(line_patterns(own | bit, opponent, length)) -
+                   _weighted(line_patterns(own, opponent, length)))
+        threat += (_weighted(line_patterns(opponent | bit, own, length)) -
+                   _weighted(line_patterns(opponent, own, length)))
+    return attack, threat
+
+
+class _SearchTimeout(Exception):
+    """搜索超出时间预算"""
+
+
+class GomokuAI:
+    """五子棋电脑对手
+
+    属性:
+        time_budget: 每步搜索的时间预算（秒）
+        max_depth: 迭代加深的最大深度
+        max_entries: 置换表最多保存的条目数，超过时清空
+        table: 置换表，键为Zobrist哈希，值为(深度, 值, 边界类型, 最佳着法)
+        last_depth: 上一次搜索完整完成的深度
+    """
+    def __init__(self, time_budget=1.0, max_depth=10, max_entries=500000):
+        """初始化电脑对手
+
+        参数:
+            time_budget: 每步搜索的时间预算（秒）
+            max_depth: 迭代加深的最大深度
+            max_entries: 置换表最多保存的条目数
+        """
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.max_entries = max_entries
+        self.table = {}
+        self.last_depth = 0
+        self._deadline = 0.0
+        self._nodes = 0
+
+    def best_move(self, state):
+        """为当前局面选择落子位置
+
+        参数:
+            state: (棋盘, 轮到落子的玩家)，棋盘为GomokuCore格式的二维列表或元组
+
+        返回:
+            tuple: 落子位置(row, col)；棋盘已满时返回None
+        """
+        board, player = state
+        self.last_depth = 0
+        self._board = [list(row) for row in board]
+        self._index = LineIndex.from_board(self._board)
+        self._hash = 0
+        self._stones = []
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                if self._board[row][col] != EMPTY:
+                    self._hash ^= ZOBRIST[self._board[row][col]][row][col]
+                    self._stones.append((row, col))
+        if player == WHITE_PIECE:
+            self._hash ^= ZOBRIST_WHITE_TO_MOVE
+        if not self._stones:
+            return BOARD_SIZE // 2, BOARD_SIZE // 2
+
+        self._killers = [[None, None] for _ in range(self.max_depth + 1)]
+        self._history = [[0] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+        moves = self._ordered_moves(player, 0, None)
+        if not moves:
+            return None
+        best = moves[0]
+        if len(moves) == 1:
+            return best
+
+        self._deadline = time.perf_counter() + self.time_budget
+        self._nodes = 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                value, move = self._search_root(moves, depth, player)
+            except _SearchTimeout:
+                break
+            best = move
+            self.last_depth = depth
+            # 下一轮先搜索本轮的最佳着法
+            moves.remove(move)
+            moves.insert(0, move)
+            if abs(value) >= WIN_SCORE // 2:
+                break  # 已经找到必胜或必败的结果
+        if len(self.table) > self.max_entries:
+            self.table.clear()
+        return best
+
+    def _check_time(self):
+        """每隔一段节点检查一次是否超时"""
+        self._nodes += 1
+        if not self._nodes & 0x3F and time.perf_counter() > self._deadline:
+            raise _SearchTimeout()
+
+    def _place(self, row, col, player):
+        """在搜索棋盘上落子"""
+        self._board[row][col] = player
+        self._index.place(row, col, player)
+        self._hash ^= ZOBRIST[player][row][col] ^ ZOBRIST_WHITE_TO_MOVE
+        self._stones.append((row, col))
+
+    def _remove(self, row, col, player):
+        """撤销落子"""
+        self._board[row][col] = EMPTY
+        self._index.remove(row, col, player)
+        self._hash ^= ZOBRIST[player][row][col] ^ ZOBRIST_WHITE_TO_MOVE
+        self._stones.pop()
+
+    def _ordered_moves(self, player, ply, table_move):
+        """生成并排序候选着法
+
+        候选为已有棋子周围两格内的空位。置换表中的最佳着法排第一，
+        杀手着法其次，其余按进攻和防守收益加历史分数排序，只保留前MAX_CANDIDATES个。
+        """
+        board = self._board
+        seen = set()
+        for row, col in self._stones:
+            for r in range(max(row - 2, 0), min(row + 3, BOARD_SIZE)):
+                for c in range(max(col - 2, 0), min(col + 3, BOARD_SIZE)):
+                    if board[r][c] == EMPTY:
+                        seen.add((r, c))
+
+        index = self._index
+        history = self._history
+        scored = []
+        winning = None
+        blocking = None
+        for r, c in seen:
+            attack, threat = move_value(index, r, c, player)
+            # 收益是落子前后的差值，成五时还要减去被取代的棋型，所以和WIN_SCORE // 2比较；
+            # 其他棋型的收益加起来也远小于这个阈值
+            if attack >= WIN_SCORE // 2:
+                winning = (r, c)
+            elif threat >= WIN_SCORE // 2:
+                blocking = (r, c)
+            scored.append((attack + threat + history[r][c], (r, c)))
+        # 能直接成五时只考虑这一手；对方下一手能成五时只能去挡
+        if winning is not None:
+            return [winning]
+        if blocking is not None:
+            return [blocking]
+        scored.sort(reverse=True)
+        moves = [move for _, move in scored[:MAX_CANDIDATES]]
+
+        front = [table_move] + self._killers[ply] if ply < len(self._killers) else [table_move]
+        for move in reversed(front):
+            if move is not None and move in seen:
+                if move in moves:
+                    moves.remove(move)
+                moves.insert(0, move)
+        return moves
+
+    def _search_root(self, moves, depth, player):
+        """根节点搜索
+
+        返回:
+            tuple: (最佳值, 最佳着法)
+        """
+        alpha = -WIN_SCORE * 2
+        beta = WIN_SCORE * 2
+        best_move = moves[0]
+        for row, col in moves:
+            self._place(row, col, player)
+            if self._index.counts[player][FIVE]:
+                value = WIN_SCORE
+            else:
+                value = -self._negamax(depth - 1, -beta, -alpha, 3 - player, 1)
+            self._remove(row, col, player)
+            if value > alpha:
+                alpha = value
+                best_move = (row, col)
+        return alpha, best_move
+
+    def _negamax(self, depth, alpha, beta, player, ply):
+        """负极大值搜索
+
+        参数:
+            depth: 剩余深度
+            alpha: 下界
+            beta: 上界
+            player: 轮到落子的玩家
+            ply: 距根节点的层数
+
+        返回:
+            int: 从player角度的局面值
+        """
+        self._check_time()
+        if depth <= 0:
+            return evaluate(self._index, player)
+
+        original_alpha = alpha
+        key = self._hash
+        entry = self.table.get(key)
+        table_move = None
+        if entry is not None:
+            entry_depth, value, flag, table_move = entry
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER and value > alpha:
+                    alpha = value
+                elif flag == UPPER and value < beta:
+                    beta = value
+                if alpha >= beta:
+                    return value
+
+        moves = self._ordered_moves(player, ply, table_move)
+        if not moves:
+            return 0  # 棋盘已满，和棋
+
+        best = -WIN_SCORE * 2
+        best_move = moves[0]
+        for row, col in moves:
+            self._place(row, col, player)
+            if self._index.counts[player][FIVE]:
+                value = WIN_SCORE - ply
+            else:
+                value = -self._negamax(depth - 1, -beta, -alpha, 3 - player, ply + 1)
+            self._remove(row, col, player)
+            if value > best:
+                best = value
+                best_move = (row, col)
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                # 记录引起剪枝的着法
+                killers = self._killers[ply]
+                if killers[0] != best_move:
+                    killers[1] = killers[0]
+                    killers[0] = best_move
+                self._history[row][col] += depth * depth
+                break
+
+        if best <= original_alpha:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[key] = (depth, best, flag, best_move)
+        return best
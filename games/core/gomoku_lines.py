@@ -0,0 +1,246 @@
+"""五子棋增量连线索引
+
+把棋盘拆成所有的行、列、正斜线和反斜线，每条线用两个位掩码分别记录黑棋和白棋。
+落子或提子只更新经过该点的4条线：
+- 胜负判断：用位运算直接求出经过该点的连续棋子段，不需要逐格遍历
+- 棋型统计：每条线的棋型数量（五连、活四、冲四、活三等）按线缓存，
+  落子时先减去这4条线的旧统计再加上新统计，全盘统计随时可读
+
+棋型以“己方棋子、空格、对方棋子或边界”组成的片段识别，见PATTERNS。
+"""
+from functools import lru_cache
+
+# 棋盘设置
+BOARD_SIZE = 15  # 15x15的棋盘
+
+# 棋子
+EMPTY = 0
+BLACK_PIECE = 1  # 黑棋
+WHITE_PIECE = 2  # 白棋
+
+# 棋型编号（PATTERNS中的顺序，也是识别的优先级）
+FIVE = 0
+OPEN_FOUR = 1
+FOUR = 2
+OPEN_THREE = 3
+THREE = 4
+OPEN_TWO = 5
+TWO = 6
+
+# 每种棋型的片段：'x'为己方棋子，'.'为空格。片段中的棋子一旦计入高优先级的棋型，
+# 就不再计入其他棋型，避免同一组棋子被重复统计
+PATTERNS = (
+    ('xxxxx',),
+    ('.xxxx.',),
+    ('xxxx.', '.xxxx', 'x.xxx', 'xxx.x', 'xx.xx'),
+    ('.xxx..', '..xxx.', '.xx.x.', '.x.xx.'),
+    ('xxx..', '..xxx', '.xxx.', 'xx.x.', '.x.xx', 'x.xx.', '.xx.x', 'xx..x', 'x..xx', 'x.x.x'),
+    ('..xx..', '.x.x..', '..x.x.', '.x..x.'),
+    ('xx...', '...xx', '.xx..', '..xx.', 'x.x..', '..x.x', '.x.x.', 'x..x.', '.x..x', 'x...x'),
+)
+
+# 四个方向：横、竖、正斜、反斜
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+@lru_cache(maxsize=1 << 18)
+def line_patterns(own, opponent, length):
+    """统计一条线上己方的棋型数量
+
+    参数:
+        own: 己方棋子的位掩码，第k位表示线上第k个格子
+        opponent: 对方棋子的位掩码
+        length: 线的长度
+
+    返回:
+        tuple: 按棋型编号排列的数量
+    """
+    # 两端补上边界，边界和对方棋子一样会挡住棋型
+    cells = ['o']
+    for k in range(length):
+        bit = 1 << k
+        cells.append('x' if own & bit else 'o' if opponent & bit else '.')
+    cells.append('o')
+    line = ''.join(cells)
+
+    counts = [0] * len(PATTERNS)
+    used = [False] * len(line)
+    for kind, shapes in enumerate(PATTERNS):
+        for shape in shapes:
+            start = line.find(shape)
+            while start != -1:
+                stones = [start + k for k, c in enumerate(shape) if c == 'x']
+                if not any(used[k] for k in stones):
+                    counts[kind] += 1
+                    for k in stones:
+                        used[k] = True
+                start = line.find(shape, start + 1)
+    return tuple(counts)
+
+
+def _build_lines():
+    """列出棋盘上所有的线
+
+    返回:
+        tuple: (每条线的格子列表, 每个格子所在的(线编号, 线上位置)列表，按DIRECTIONS顺序)
+    """
+    lines = []
+    cell_lines = [[[] for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+    for dr, dc in DIRECTIONS:
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                # 只从每条线的第一个格子出发
+                prev_row, prev_col = row - dr, col - dc
+                if 0 <= prev_row < BOARD_SIZE and 0 <= prev_col < BOARD_SIZE:
+                    continue
+                cells = []
+                r, c = row, col
+                while 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE:
+                    cell_lines[r][c].append((len(lines), len(cells)))
+                    cells.append((r, c))
+                    r += dr
+                    c += dc
+                lines.append(cells)
+    return lines, cell_lines
+
+
+LINES, CELL_LINES = _build_lines()
+
+
+class LineIndex:
+    """增量连线索引
+
+    属性:
+        masks: masks[player][line]为该玩家在第line条线上的棋子位掩码（player为1或2）
+        counts: counts[player]为该玩家全盘的棋型数量列表，按棋型编号排列
+        stones: 棋盘上的棋子数
+    """
+    def __init__(self):
+        """创建空棋盘的索引"""
+        self.masks = {
+            BLACK_PIECE: [0] * len(LINES),
+            WHITE_PIECE: [0] * len(LINES),
+        }
+        self.counts = {
+            BLACK_PIECE: [0] * len(PATTERNS),
+            WHITE_PIECE: [0] * len(PATTERNS),
+        }
+        self.stones = 0
+
+    @classmethod
+    def from_board(cls, board):
+        """从GomokuCore格式的棋盘建立索引
+
+        参数:
+            board: 棋盘状态数组，0为空，1为黑棋，2为白棋
+
+        返回:
+            LineIndex: 新的索引
+        """
+        index = cls()
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                if board[row][col] != EMPTY:
+                    index.place(row, col, board[row][col])
+        return index
+
+    def copy(self):
+        """复制索引（供AI在副本上搜索）"""
+        index = LineIndex.__new__(LineIndex)
+        index.masks = {player: masks[:] for player, masks in self.masks.items()}
+        index.counts = {player: counts[:] for player, counts in self.counts.items()}
+        index.stones = self.stones
+        return index
+
+    def _update(self, row, col, player, placing):
+        """落子或提子，并更新经过该点的4条线的棋型统计"""
+        black = self.masks[BLACK_PIECE]
+        white = self.masks[WHITE_PIECE]
+        black_counts = self.counts[BLACK_PIECE]
+        white_counts = self.counts[WHITE_PIECE]
+        own = black if player == BLACK_PIECE else white
+        for line, position in CELL_LINES[row][col]:
+            length = len(LINES[line])
+            old_black = line_patterns(black[line], white[line], length)
+            old_white = line_patterns(white[line], black[line], length)
+            own[line] ^= 1 << position
+            new_black = line_patterns(black[line], white[line], length)
+            new_white = line_patterns(white[line], black[line], length)
+            for kind in range(len(PATTERNS)):
+                black_counts[kind] += new_black[kind] - old_black[kind]
+                white_counts[kind] += new_white[kind] - old_white[kind]
+        self.stones += 1 if placing else -1
+
+    def place(self, row, col, player):
+        """在空位落子
+
+        参数:
+            row: 行坐标
+            col: 列坐标
+            player: 落子的玩家（1为黑棋，2为白棋）
+        """
+        self._update(row, col, player, True)
+
+    def remove(self, row, col, player):
+        """提走之前落下的棋子（AI搜索回退时使用）
+
+        参数:
+            row: 行坐标
+            col: 列坐标
+            player: 该棋子所属的玩家
+        """
+        self._update(row, col, player, False)
+
+    def run_through(self, row, col, player, direction):
+        """求经过指定位置的连续棋子段
+
+        参数:
+            row: 行坐标
+            col: 列坐标
+            player: 玩家
+            direction: DIRECTIONS中的方向下标
+
+        返回:
+            tuple: (段的起始位置, 段的长度)，位置是线上的下标；该位置没有该玩家的棋子时长度为0
+        """
+        line, position = CELL_LINES[row][col][direction]
+        mask = self.masks[player][line]
+        if not (mask >> position) & 1:
+            return position, 0
+        # 从该位置向后的连续1的个数
+        above = mask >> position
+        forward = (~above & (above + 1)).bit_length() - 1
+        # 该位置之前最近的空位决定段的起点
+        start = (~mask & ((1 << position) - 1)).bit_length()
+        return start, position - start + forward
+
+    def winning_run(self, row, col):
+        """检查经过指定位置的棋子是否形成五子连珠
+
+        参数:
+            row: 行坐标
+            col: 列坐标
+
+        返回:
+            list: 连珠的棋子位置列表；没有形成五连时返回None
+        """
+        black = self.masks[BLACK_PIECE]
+        line, position = CELL_LINES[row][col][0]
+        player = BLACK_PIECE if (black[line] >> position) & 1 else WHITE_PIECE
+        for direction in range(len(DIRECTIONS)):
+            start, length = self.run_through(row, col, player, direction)
+            if length >= 5:
+                line = CELL_LINES[row][col][direction][0]
+                return LINES[line][start:start + length]
+        return None
+
+    def pattern_counts(self, player):
+        """返回玩家全盘的棋型数量
+
+        参数:
+            player: 玩家（1为黑棋，2为白棋）
+
+        返回:
+            tuple: 按棋型编号排列的数量
+        """
+        return tuple(self.counts[player])
@@ -0,0 +1,427 @@
+"""吃糖豆游戏逻辑
+
+敌人和糖豆按结构数组（structure of arrays）保存：位置、半径、速度各是一个NumPy数组，
+移动和碰撞检测对所有敌人、糖豆一次完成，比较的是距离的平方，不需要逐个开方。
+糖豆另外登记在均匀网格（SpatialGrid）中，玩家每步只检查周围几个格子里的糖豆。
+这样几百个敌人、几千个糖豆的“虫群”关卡也能稳定在60帧。
+"""
+import math
+
+import numpy as np
+
+from games.core.rect import Rect
+from games.core.rng import session_rng
+from games.core.spatial_grid import SpatialGrid
+
+# 游戏中使用的颜色（RGB格式）
+WHITE = (255, 255, 255)   # 白色，用于糖豆
+RED = (255, 0, 0)       # 红色，用于敌人1
+BLUE = (0, 0, 255)      # 蓝色，用于敌人2
+PINK = (255, 192, 203)   # 粉色，用于敌人3
+
+# 场地设置
+WINDOW_WIDTH = 800      # 场地宽度
+WINDOW_HEIGHT = 600     # 场地高度
+
+# 玩家设置
+PLAYER_RADIUS = 15
+RESPAWN_GRACE = 120  # 虫群关卡被抓后重生的无敌步数（60步每秒，约2秒）
+
+# 敌人设置
+ENEMY_COLORS = (RED, PINK, BLUE)  # 敌人颜色，依次循环使用
+ENEMY_RADIUS = 15
+ENEMY_SPEED = 3
+ENEMY_TURN_CHANCE = 0.02  # 每步随机偏转的概率
+ENEMY_TURN = 2  # 随机偏转时速度每个分量最多改变的量
+
+# 糖豆设置
+CANDY_RADIUS = 5
+CANDY_COUNT = 20  # 每批糖豆的数量
+CANDY_POINTS = 10
+
+# 虫群关卡的敌人和糖豆数量
+SWARM_ENEMY_COUNT = 300
+SWARM_CANDY_COUNT = 3000
+SPAWN_SAFE_RADIUS = 150  # 随机分布的敌人与玩家出生点的最小距离
+
+
+class Player:
+    """玩家类
+
+    控制玩家角色的移动和状态
+
+    属性:
+        x, y: 玩家位置坐标
+        radius: 玩家半径
+        speed: 移动速度
+        direction: 朝向角度（用于动画）
+        score: 得分
+        lives: 生命值
+        invulnerable: 剩余的无敌步数，大于0时不会被敌人抓住
+    """
+    __slots__ = ('x', 'y', 'radius', 'speed', 'direction', 'score', 'lives', 'invulnerable')
+
+    def __init__(self):
+        """初始化玩家
+
+        设置玩家的初始位置、大小、速度和状态
+        """
+        self.x = WINDOW_WIDTH // 2
+        self.y = WINDOW_HEIGHT // 2
+        self.radius = PLAYER_RADIUS
+        self.speed = 5
+        self.direction = 0  # 角度，用于动画
+        self.score = 0
+        self.lives = 3
+        self.invulnerable = 0
+
+    def move(self, dx, dy):
+        """移动玩家
+
+        根据输入方向移动玩家，并确保不会移出屏幕
+
+        参数:
+            dx: x方向的移动量（-1左移，1右移，0不动）
+            dy: y方向的移动量（-1上移，1下移，0不动）
+        """
+        new_x = self.x + dx * self.speed
+        new_y = self.y + dy * self.speed
+
+        # 确保玩家不会移出屏幕
+        if 0 + self.radius <= new_x <= WINDOW_WIDTH - self.radius:
+            self.x = new_x
+        if 0 + self.radius <= new_y <= WINDOW_HEIGHT - self.radius:
+            self.y = new_y
+
+        # 更新朝向角度（用于动画）
+        if dx != 0 or dy != 0:
+            self.direction = math.degrees(math.atan2(-dy, dx))
+
+
+class Enemies:
+    """敌人群
+
+    所有敌人按结构数组保存，每步一起向玩家移动，并以一定概率随机偏转，使移动更有趣。
+
+    属性:
+        x, y: 位置坐标，float64数组
+        radius: 半径数组
+        speed: 移动速度数组
+        colors: 每个敌人的颜色列表
+    """
+    __slots__ = ('x', 'y', 'radius', 'speed', 'colors')
+
+    def __init__(self, x, y, colors):
+        """创建敌人群
+
+        参数:
+            x, y: 初始位置序列
+            colors: 颜色序列，与位置一一对应
+        """
+        self.x = np.array(x, dtype=np.float64)
+        self.y = np.array(y, dtype=np.float64)
+        self.radius = np.full(len(self.x), ENEMY_RADIUS, dtype=np.float64)
+        self.speed = np.full(len(self.x), ENEMY_SPEED, dtype=np.float64)
+        self.colors = list(colors)
+
+    def __len__(self):
+        return len(self.x)
+
+    def move(self, player_x, player_y, rng):
+        """所有敌人向玩家移动一步，不会移出场地
+
+        参数:
+            player_x: 玩家x坐标
+            player_y: 玩家y坐标
+            rng: NumPy随机数生成器
+        """
+        # 计算到玩家的方向向量，标准化后乘以速度（已经和玩家重合的敌人不动）
+        dx = player_x - self.x
+        dy = player_y - self.y
+        dist = np.sqrt(dx * dx + dy * dy)
+        moving = dist != 0
+        scale = np.divide(self.speed, dist, out=np.zeros_like(dist), where=moving)
+        dx *= scale
+        dy *= scale
+
+        # 加入随机性，使移动更有趣
+        turning = moving & (rng.random(len(self)) < ENEMY_TURN_CHANCE)
+        count = int(turning.sum())
+        if count:
+            dx[turning] += rng.uniform(-ENEMY_TURN, ENEMY_TURN, count)
+            dy[turning] += rng.uniform(-ENEMY_TURN, ENEMY_TURN, count)
+
+        # 每个方向分别检查，超出场地的分量不移动
+        new_x = self.x + dx
+        new_y = self.y + dy
+        self.x = np.where(moving & (self.radius <= new_x) & (new_x <= WINDOW_WIDTH - self.radius),
+                          new_x, self.x)
+        self.y = np.where(moving & (self.radius <= new_y) & (new_y <= WINDOW_HEIGHT - self.radius),
+                          new_y, self.y)
+
+    def touching(self, x, y, radius):
+        """找出与一个圆重叠的敌人
+
+        参数:
+            x, y: 圆心
+            radius: 半径
+
+        返回:
+            numpy.ndarray: bool数组，True表示该敌人与圆重叠
+        """
+        dx = self.x - x
+        dy = self.y - y
+        reach = self.radius + radius
+        return dx * dx + dy * dy < reach * reach
+
+
+class Candies:
+    """糖豆
+
+    糖豆的位置和半径按结构数组保存，下标就是糖豆的编号，吃掉的糖豆只标记为不存在，
+    编号不会改变。存在的糖豆同时登记在均匀网格中，格子边长为玩家半径加糖豆半径，
+    检查玩家吃到哪些糖豆时只需查看玩家周围3x3个格子，删除糖豆也只需从所在格子中移除。
+
+    全部吃完后编号从0重新开始，数组和登记用的矩形都原地复用（数组长度是容量，
+    只在一批糖豆放不下时按倍数扩大），反复补充糖豆不会再分配新对象。
+
+    属性:
+        x, y: 位置坐标，int64数组
+        radius: 半径数组
+        alive: bool数组，False表示糖豆已经被吃掉（或编号还没有用到）
+        count: 已经用到的编号数量
+        color: 糖豆颜色
+        grid: 存在的糖豆编号的空间索引
+    """
+    __slots__ = ('x', 'y', 'radius', 'alive', 'count', 'color', 'grid', '_rects')
+
+    def __init__(self, cell_size=PLAYER_RADIUS + CANDY_RADIUS):
+        """创建空的糖豆集合
+
+        参数:
+            cell_size: 空间索引的格子边长
+        """
+        self.x = np.zeros(0, dtype=np.int64)
+        self.y = np.zeros(0, dtype=np.int64)
+        self.radius = np.zeros(0, dtype=np.int64)
+        self.alive = np.zeros(0, dtype=bool)
+        self.count = 0
+        self.color = WHITE
+        self.grid = SpatialGrid(cell_size, cell_size)
+        self._rects = []  # 每个编号登记到空间索引的矩形，重新编号后复用
+
+    def __len__(self):
+        return len(self.grid)
+
+    def __bool__(self):
+        return bool(self.grid)
+
+    def __iter__(self):
+        """按生成顺序返回存在的糖豆编号"""
+        return iter(self.grid)
+
+    def spawn(self, count, rng):
+        """在场地内随机位置添加糖豆，并登记到同一个空间索引中
+
+        参数:
+            count: 添加的数量
+            rng: NumPy随机数生成器
+
+        返回:
+            range: 新糖豆的编号
+        """
+        if not self:
+            # 全部吃完后从0重新编号，数组不会无限增长
+            self.count = 0
+            self.grid.clear()
+        first = self.count
+        end = first + count
+        if end > len(self.x):
+            self._grow(end)
+        x = rng.integers(CANDY_RADIUS, WINDOW_WIDTH - CANDY_RADIUS, count, endpoint=True)
+        y = rng.integers(CANDY_RADIUS, WINDOW_HEIGHT - CANDY_RADIUS, count, endpoint=True)
+        self.x[first:end] = x
+        self.y[first:end] = y
+        self.radius[first:end] = CANDY_RADIUS
+        self.alive[first:end] = True
+        rects = self._rects
+        for candy, cx, cy in zip(range(first, end), x.tolist(), y.tolist()):
+            if candy < len(rects):
+                rect = rects[candy]
+                rect.x = cx - CANDY_RADIUS
+                rect.y = cy - CANDY_RADIUS
+            else:
+                rect = Rect(cx - CANDY_RADIUS, cy - CANDY_RADIUS, CANDY_RADIUS * 2, CANDY_RADIUS * 2)
+                rects.append(rect)
+            self.grid.add(candy, rect)
+        self.count = end
+        return range(first, end)
+
+    def _grow(self, size):
+        """扩大数组容量，至少能放下size个糖豆（按倍数扩大，减少重新分配的次数）"""
+        extra = max(size, len(self.x) * 2) - len(self.x)
+        self.x = np.concatenate((self.x, np.zeros(extra, dtype=np.int64)))
+        self.y = np.concatenate((self.y, np.zeros(extra, dtype=np.int64)))
+        self.radius = np.concatenate((self.radius, np.zeros(extra, dtype=np.int64)))
+        self.alive = np.concatenate((self.alive, np.zeros(extra, dtype=bool)))
+
+    def remove(self, candies):
+        """删除糖豆
+
+        参数:
+            candies: 糖豆编号序列
+        """
+        for candy in candies:
+            self.alive[candy] = False
+            self.grid.remove(candy)
+
+    def touching(self, x, y, radius):
+        """找出与一个圆重叠的糖豆
+
+        先用空间索引取出圆的外接矩形附近的糖豆，再比较距离的平方
+
+        参数:
+            x, y: 圆心
+            radius: 半径
+
+        返回:
+            list: 与圆重叠的糖豆编号，按生成顺序排列
+        """
+        reach = radius + CANDY_RADIUS
+        nearby = self.grid.query(int(x - reach), int(y - reach),
+                                 int(x + reach) + 1, int(y + reach) + 1)
+        found = []
+        for candy in nearby:
+            dx = self.x[candy] - x
+            dy = self.y[candy] - y
+            limit = self.radius[candy] + radius
+            if dx * dx + dy * dy < limit * limit:
+                found.append(candy)
+        return found
+
+
+class PacmanCore:
+    """吃糖豆游戏逻辑核心
+
+    不依赖pygame和显示窗口，每次step推进一帧，可在无显示环境下批量模拟对局。
+
+    属性:
+        player: 玩家对象
+        enemies: 敌人群
+        candies: 糖豆
+        candy_count: 每批糖豆的数量，吃完后补充一批
+        game_over: 游戏是否结束
+        respawn_grace: 被抓后重生的无敌步数，只有虫群关卡（随机分布的敌人）才有
+        seed: 这一局的随机种子
+        rng: NumPy随机数生成器
+    """
+    def __init__(self, enemy_count=len(ENEMY_COLORS), candy_count=CANDY_COUNT, seed=None, rng=None):
+        """初始化游戏状态
+
+        参数:
+            enemy_count: 敌人数量，前三个敌人在三个角落，其余的随机分布
+            candy_count: 每批糖豆的数量
+            seed: 随机种子，None表示新生成一个（记录在seed属性中）
+            rng: NumPy随机数生成器（见games.core.rng），给出时不使用seed创建
+        """
+        self.seed, self.rng = session_rng(seed, rng, numpy=True)
+        self.player = Player()
+        # 前三个不同颜色的敌人分别在不同位置，虫群关卡的其余敌人随机分布
+        x = [100, WINDOW_WIDTH - 100, 100][:enemy_count]
+        y = [100, 100, WINDOW_HEIGHT - 100][:enemy_count]
+        extra = enemy_count - len(x)
+        if extra > 0:
+            extra_x, extra_y = self.random_enemy_positions(extra)
+            x.extend(extra_x)
+            y.extend(extra_y)
+        colors = [ENEMY_COLORS[i % len(ENEMY_COLORS)] for i in range(enemy_count)]
+        self.enemies = Enemies(x, y, colors)
+        self.respawn_grace = RESPAWN_GRACE if extra > 0 else 0
+        self.candies = Candies()
+        self.candy_count = candy_count
+        self.game_over = False
+        self.spawn_candies(candy_count)
+
+    def random_enemy_positions(self, count):
+        """在场地中随机取敌人位置，避开玩家出生点周围SPAWN_SAFE_RADIUS以内的区域
+
+        参数:
+            count: 位置数量
+
+        返回:
+            tuple: (x数组, y数组)
+        """
+        center_x, center_y = WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2
+        xs, ys = [], []
+        needed = count
+        # 落在安全区内的位置丢弃后重新抽取，直到凑够数量
+        while needed:
+            x = self.rng.uniform(ENEMY_RADIUS, WINDOW_WIDTH - ENEMY_RADIUS, needed)
+            y = self.rng.uniform(ENEMY_RADIUS, WINDOW_HEIGHT - ENEMY_RADIUS, needed)
+            safe = (x - center_x) ** 2 + (y - center_y) ** 2 >= SPAWN_SAFE_RADIUS ** 2
+            xs.append(x[safe])
+            ys.append(y[safe])
+            needed -= int(safe.sum())
+        return np.concatenate(xs), np.concatenate(ys)
+
+    def spawn_candies(self, count):
+        """随机添加一批糖豆
+
+        参数:
+            count: 添加的数量
+
+        返回:
+            range: 新糖豆的编号
+        """
+        return self.candies.spawn(count, self.rng)
+
+    def eat_candies(self, eaten):
+        """玩家吃掉糖豆：删除糖豆并加分
+
+        参数:
+            eaten: 被吃掉的糖豆编号列表
+        """
+        self.candies.remove(eaten)
+        self.player.score += CANDY_POINTS * len(eaten)
+
+    def check_collisions(self):
+        """检查碰撞
+
+        检查玩家与糖豆和敌人的碰撞，处理得分和生命值
+        """
+        player = self.player
+        # 检查与糖豆的碰撞
+        eaten = self.candies.touching(player.x, player.y, player.radius)
+        if eaten:
+            self.eat_candies(eaten)
+            if not self.candies:  # 如果所有糖豆都被吃完
+                self.spawn_candies(self.candy_count)
+
+        # 检查与敌人的碰撞，一步最多失去一条生命；虫群关卡重生后的无敌时间内不会被抓
+        if player.invulnerable:
+            player.invulnerable -= 1
+        elif self.enemies.touching(player.x, player.y, player.radius).any():
+            player.lives -= 1
+            if player.lives <= 0:
+                self.game_over = True
+            else:
+                # 重置玩家位置；虫群关卡再给一段无敌时间离开敌人
+                player.x = WINDOW_WIDTH // 2
+                player.y = WINDOW_HEIGHT // 2
+                player.invulnerable = self.respawn_grace
+
+    def step(self, action=(0, 0)):
+        """推进一帧
+
+        参数:
+            action: 玩家移动方向(dx, dy)，每个分量取-1、0或1
+        """
+        if self.game_over:
+            return
+        self.player.move(*action)
+
+        # 更新敌人位置
+        self.enemies.move(self.player.x, self.player.y, self.rng)
+
+        # 检查碰撞
+        self.check_collisions()
@@ -0,0 +1,561 @@
+"""迷宫吃豆游戏逻辑
+
+迷宫在加载时编译成导航图（NavGraph）：每个可走的格子是一个节点，
+neighbors[节点][方向]直接给出相邻节点，左右边缘相通的行形成隧道。
+
+鬼的目标格子确定后，用一次BFS求出所有节点到目标的距离（距离场）并缓存。
+玩家每走过几个逻辑步长才换一个格子，只有换格子时才需要新的距离场，
+其余时候鬼在每个路口只需比较几个相邻节点在距离场中的值，选出离目标最近的方向。
+这样追击、分散、受惊三种模式的鬼几乎不占用每帧的时间。
+
+位置以格子的1/SUBSTEPS为单位保存为整数，整数坐标是SUBSTEPS倍数的位置就是格子中心，
+角色只在格子中心转向。
+"""
+from collections import OrderedDict, deque
+
+from games.core.rng import session_rng
+
+# 颜色（RGB格式）
+RED = (255, 0, 0)
+PINK = (255, 184, 255)
+CYAN = (0, 255, 255)
+ORANGE = (255, 184, 82)
+
+# 迷宫：#为墙，.为豆子，o为能量豆，-为只有鬼能通过的门，空格为没有豆子的通道，P为玩家起点。
+# 每行只写左半边（最后一列是中轴），右半边按中轴镜像
+_MAZE_LEFT = (
+    "####################",
+    "#........#.........#",
+    "#o##.###.#.#######.#",
+    "#.##.###.#.#######.#",
+    "#...................",
+    "#.##.#.#########.###",
+    "#....#.....#.....###",
+    "####.#####.#.#######",
+    "####.#..............",
+    "####.#.#####.#.####-",
+    "    .#.#####.#.#    ",
+    "####.#.#####.#.#    ",
+    "####.#.#####.#.#####",
+    "####.#..............",
+    "####.#.#########.###",
+    "#........#.........#",
+    "#.##.###.#.#######.#",
+    "#o.#...............P",
+    "####.#.#######.#####",
+    "#.........#........#",
+    "#.#######.##.#######",
+    "#..................#",
+    "####################",
+)
+MAZE = tuple(row + row[-2::-1] for row in _MAZE_LEFT)
+
+# 方向：上、左、下、右（鬼选择方向时距离相同按这个顺序优先）
+DIRECTIONS = ((0, -1), (-1, 0), (0, 1), (1, 0))
+REVERSE = (2, 3, 0, 1)
+
+# 每个格子的细分数，速度以每个逻辑步长走过的细分数计
+SUBSTEPS = 8
+PLAYER_SPEED = 1.0
+GHOST_SPEED = 0.85
+GHOST_SPEED_PER_LEVEL = 0.05  # 每过一关鬼加快的速度
+FRIGHTENED_SPEED = 0.5
+EATEN_SPEED = 2.0
+
+# 鬼：(名字, 颜色, 起点, 分散模式的目标角落)，格子坐标为(列, 行)
+GHOSTS = (
+    ('blinky', RED, (19, 8), (37, 1)),
+    ('pinky', PINK, (19, 10), (1, 1)),
+    ('inky', CYAN, (17, 10), (37, 21)),
+    ('clyde', ORANGE, (21, 10), (1, 21)),
+)
+GHOST_HOME = (19, 10)  # 被吃掉的鬼回到这里复活
+PINKY_AHEAD = 4  # pinky瞄准玩家前方的格子数
+INKY_AHEAD = 2  # inky以玩家前方这个格子为中心，把blinky的位置翻转过去作为目标
+CLYDE_SHY = 8  # clyde离玩家小于这个距离时改为回到角落
+
+# 模式时间表（逻辑步数，60步为1秒），None表示一直持续
+MODE_SCHEDULE = (('scatter', 7 * 60), ('chase', 20 * 60), ('scatter', 7 * 60),
+                 ('chase', 20 * 60), ('scatter', 5 * 60), ('chase', None))
+FRIGHTENED_TICKS = 6 * 60
+
+# 得分
+PELLET_POINTS = 10
+POWER_POINTS = 50
+GHOST_POINTS = 200  # 同一次能量豆内每多吃一个鬼翻倍
+
+# 距离场中表示无法到达的距离
+UNREACHABLE = 1 << 30
+
+# 最多缓存的距离场数量
+FIELD_CACHE_SIZE = 128
+
+
+class NavGraph:
+    """迷宫导航图
+
+    属性:
+        columns, rows: 迷宫的列数和行数
+        cells: 每个节点的格子坐标(列, 行)
+        index: 格子坐标 -> 节点编号
+        neighbors: 每个节点在四个方向（见DIRECTIONS）上的相邻节点，-1表示墙
+        doors: 只有鬼能通过的节点集合
+        pellets: 有豆子的节点集合
+        power_pellets: 有能量豆的节点集合
+        start: 玩家起点节点
+    """
+    def __init__(self, layout):
+        """编译迷宫
+
+        参数:
+            layout: 迷宫的字符串行，字符含义见MAZE
+        """
+        self.rows = len(layout)
+        self.columns = len(layout[0])
+        self.cells = []
+        self.index = {}
+        self.doors = set()
+        self.pellets = set()
+        self.power_pellets = set()
+        self.start = None
+        for row, line in enumerate(layout):
+            for col, char in enumerate(line):
+                if char == '#':
+                    continue
+                node = len(self.cells)
+                self.cells.append((col, row))
+                self.index[(col, row)] = node
+                if char == '-':
+                    self.doors.add(node)
+                elif char == '.':
+                    self.pellets.add(node)
+                elif char == 'o':
+                    self.power_pellets.add(node)
+                elif char == 'P':
+                    self.start = node
+
+        # 相邻节点表，左右越界时绕到另一边（隧道）
+        self.neighbors = []
+        for col, row in self.cells:
+            self.neighbors.append(tuple(
+                self.index.get(((col + dx) % self.columns, row + dy), -1)
+                for dx, dy in DIRECTIONS))
+        self._fields = OrderedDict()
+
+    def node_at(self, col, row):
+        """格子对应的节点
+
+        返回:
+            int: 节点编号，墙或迷宫外返回-1
+        """
+        return self.index.get((col % self.columns, row), -1)
+
+    def distances(self, target):
+        """所有节点到目标节点的步数（距离场），结果会被缓存
+
+        参数:
+            target: 目标节点
+
+        返回:
+            list: 每个节点到目标的步数，无法到达为UNREACHABLE
+        """
+        field = self._fields.get(target)
+        if field is not None:
+            self._fields.move_to_end(target)
+            return field
+
+        field = [UNREACHABLE] * len(self.cells)
+        field[target] = 0
+        queue = deque([target])
+        neighbors = self.neighbors
+        while queue:
+            node = queue.popleft()
+            step = field[node] + 1
+            for neighbor in neighbors[node]:
+                if neighbor >= 0 and field[neighbor] == UNREACHABLE:
+                    field[neighbor] = step
+                    queue.append(neighbor)
+
+        self._fields[target] = field
+        if len(self._fields) > FIELD_CACHE_SIZE:
+            self._fields.popitem(last=False)
+        return field
+
+
+_graphs = {}
+
+
+def load_maze(layout=MAZE):
+    """取得迷宫的导航图，同一个迷宫只编译一次（距离场缓存也一起保留）
+
+    参数:
+        layout: 迷宫的字符串行
+
+    返回:
+        NavGraph: 导航图
+    """
+    layout = tuple(layout)
+    graph = _graphs.get(layout)
+    if graph is None:
+        graph = _graphs[layout] = NavGraph(layout)
+    return graph
+
+
+class Actor:
+    """迷宫中的角色（玩家或鬼）
+
+    属性:
+        x, y: 位置，以格子的1/SUBSTEPS为单位
+        direction: 移动方向（DIRECTIONS的下标），None表示停止
+        budget: 尚未走完的移动量，用于非整数速度
+    """
+    __slots__ = ('x', 'y', 'direction', 'budget')
+
+    def __init__(self, cell):
+        """把角色放到格子中心
+
+        参数:
+            cell: 格子坐标(列, 行)
+        """
+        self.place(cell)
+
+    def place(self, cell):
+        """把角色放回格子中心并停止移动"""
+        self.x = cell[0] * SUBSTEPS
+        self.y = cell[1] * SUBSTEPS
+        self.direction = None
+        self.budget = 0.0
+
+    def at_center(self):
+        """是否正好在格子中心"""
+        return self.x % SUBSTEPS == 0 and self.y % SUBSTEPS == 0
+
+    def cell(self, columns):
+        """角色所在（离得最近）的格子
+
+        参数:
+            columns: 迷宫列数，用于隧道绕回
+
+        返回:
+            tuple: (列, 行)
+        """
+        half = SUBSTEPS // 2
+        return ((self.x + half) // SUBSTEPS % columns, (self.y + half) // SUBSTEPS)
+
+
+class MazePlayer(Actor):
+    """迷宫中的玩家
+
+    属性:
+        wish: 玩家想走的方向(dx, dy)，到路口时能走就转过去
+        score: 得分
+        lives: 生命值
+    """
+    __slots__ = ('wish', 'score', 'lives')
+
+    def __init__(self, cell):
+        Actor.__init__(self, cell)
+        self.wish = (0, 0)
+        self.score = 0
+        self.lives = 3
+
+
+class Ghost(Actor):
+    """鬼
+
+    属性:
+        name: 名字，决定追击时的目标
+        color: 颜色
+        start: 起点格子
+        corner: 分散模式的目标格子
+        frightened: 是否受惊（受惊时随机游荡，可以被吃掉）
+        eaten: 是否已被吃掉（只剩眼睛，正在回家复活）
+    """
+    __slots__ = ('name', 'color', 'start', 'corner', 'frightened', 'eaten')
+
+    def __init__(self, name, color, start, corner):
+        self.name = name
+        self.color = color
+        self.start = start
+        self.corner = corner
+        Actor.__init__(self, start)
+
+    def place(self, cell):
+        Actor.place(self, cell)
+        self.frightened = False
+        self.eaten = False
+
+
+class MazePacmanCore:
+    """迷宫吃豆游戏逻辑核心
+
+    不依赖pygame和显示窗口，每次step推进一个逻辑步长。
+
+    属性:
+        graph: 迷宫导航图
+        player: 玩家
+        ghosts: 鬼列表
+        pellets: 剩余豆子所在的节点集合
+        power_pellets: 剩余能量豆所在的节点集合
+        level: 当前关卡（从1开始）
+        mode: 当前的鬼模式，'scatter'或'chase'
+        frightened_ticks: 受惊模式剩余的步数
+        game_over: 游戏是否结束
+        seed: 这一局的随机种子
+        rng: NumPy随机数生成器（受惊的鬼用它随机选择方向）
+    """
+    def __init__(self, layout=MAZE, seed=None, rng=None):
+        """初始化游戏状态
+
+        参数:
+            layout: 迷宫的字符串行
+            seed: 随机种子，None表示新生成一个（记录在seed属性中）
+            rng: NumPy随机数生成器（见games.core.rng），给出时不使用seed创建
+        """
+        self.seed, self.rng = session_rng(seed, rng, numpy=True)
+        self.graph = load_maze(layout)
+        self.player = MazePlayer(self.graph.cells[self.graph.start])
+        self.ghosts = [Ghost(*ghost) for ghost in GHOSTS]
+        self.level = 1
+        self.game_over = False
+        self.reset_level()
+
+    def reset_level(self):
+        """摆满豆子，开始新的一关"""
+        self.pellets = set(self.graph.pellets)
+        self.power_pellets = set(self.graph.power_pellets)
+        self.reset_positions()
+
+    def reset_positions(self):
+        """所有角色回到起点，模式时间表从头开始"""
+        self.player.place(self.graph.cells[self.graph.start])
+        for ghost in self.ghosts:
+            ghost.place(ghost.start)
+        self.mode_index = 0
+        self.mode = MODE_SCHEDULE[0][0]
+        self.mode_ticks = MODE_SCHEDULE[0][1]
+        self.frightened_ticks = 0
+        self.ghost_combo = 0
+        self.player_node = self.graph.start
+        self._player_cell = None
+
+    def node_of(self, actor):
+        """角色所在格子的节点"""
+        return self.graph.node_at(*actor.cell(self.graph.columns))
+
+    def eat_pellet(self, node):
+        """玩家吃掉节点上的豆子或能量豆并加分，能量豆使鬼受惊
+
+        参数:
+            node: 节点编号
+        """
+        if node in self.pellets:
+            self.pellets.discard(node)
+            self.player.score += PELLET_POINTS
+        elif node in self.power_pellets:
+            self.power_pellets.discard(node)
+            self.player.score += POWER_POINTS
+            self.frighten()
+
+    def frighten(self):
+        """进入受惊模式：没被吃掉的鬼掉头并开始随机游荡"""
+        self.frightened_ticks = FRIGHTENED_TICKS
+        self.ghost_combo = 0
+        for ghost in self.ghosts:
+            if not ghost.eaten:
+                ghost.frightened = True
+                self._reverse(ghost)
+
+    def _reverse(self, ghost):
+        """鬼立即掉头"""
+        if ghost.direction is not None:
+            ghost.direction = REVERSE[ghost.direction]
+
+    def _advance_mode(self):
+        """推进模式时间表（受惊期间暂停），分散和追击切换时鬼掉头"""
+        if self.frightened_ticks:
+            self.frightened_ticks -= 1
+            if not self.frightened_ticks:
+                for ghost in self.ghosts:
+                    ghost.frightened = False
+            return
+        if self.mode_ticks is None:
+            return
+        self.mode_ticks -= 1
+        if self.mode_ticks <= 0:
+            self.mode_index += 1
+            self.mode, self.mode_ticks = MODE_SCHEDULE[self.mode_index]
+            for ghost in self.ghosts:
+                if not ghost.eaten:
+                    self._reverse(ghost)
+
+    def _ahead(self, cells):
+        """玩家前方若干格的格子坐标"""
+        col, row = self.player.cell(self.graph.columns)
+        if self.player.direction is None:
+            return col, row
+        dx, dy = DIRECTIONS[self.player.direction]
+        return col + dx * cells, row + dy * cells
+
+    def _node_or_player(self, cell):
+        """格子是通道时返回它的节点，否则退回玩家所在的节点"""
+        node = self.graph.node_at(*cell)
+        return node if node >= 0 else self.player_node
+
+    def ghost_target(self, ghost):
+        """鬼当前要去的目标节点
+
+        参数:
+            ghost: 鬼
+
+        返回:
+            int: 目标节点
+        """
+        graph = self.graph
+        if ghost.eaten:
+            return graph.node_at(*GHOST_HOME)
+        if self.mode == 'scatter':
+            return graph.node_at(*ghost.corner)
+        if ghost.name == 'pinky':
+            return self._node_or_player(self._ahead(PINKY_AHEAD))
+        if ghost.name == 'inky':
+            col, row = self._ahead(INKY_AHEAD)
+            blinky_col, blinky_row = self.ghosts[0].cell(graph.columns)
+            return self._node_or_player((2 * col - blinky_col, 2 * row - blinky_row))
+        if ghost.name == 'clyde':
+            node = self.node_of(ghost)
+            if node >= 0 and graph.distances(self.player_node)[node] < CLYDE_SHY:
+                return graph.node_at(*ghost.corner)
+        return self.player_node
+
+    def _choose_ghost_direction(self, ghost, node):
+        """鬼在格子中心选择下一步的方向
+
+        不能掉头（死路除外），也不能从门外穿过门回家（被吃掉时除外）；
+        受惊时随机选择，否则查距离场选出离目标最近的方向
+        """
+        graph = self.graph
+        neighbors = graph.neighbors[node]
+        back = None if ghost.direction is None else REVERSE[ghost.direction]
+        options = [d for d in range(4)
+                   if neighbors[d] >= 0 and d != back and
+                   not (neighbors[d] in graph.doors and d == 2 and not ghost.eaten)]
+        if not options:
+            return back
+        if ghost.frightened:
+            return options[int(self.rng.integers(len(options)))]
+        field = graph.distances(self.ghost_target(ghost))
+        return min(options, key=lambda d: field[neighbors[d]])
+
+    def _choose_player_direction(self, node):
+        """玩家在格子中心选择下一步的方向：能转向想走的方向就转，否则继续直走，撞墙就停下"""
+        player = self.player
+        neighbors = self.graph.neighbors[node]
+        doors = self.graph.doors
+        for direction in self._wished_directions():
+            neighbor = neighbors[direction]
+            if neighbor >= 0 and neighbor not in doors:
+                return direction
+        if player.direction is not None:
+            neighbor = neighbors[player.direction]
+            if neighbor >= 0 and neighbor not in doors:
+                return player.direction
+        return None
+
+    def _wished_directions(self):
+        """玩家想走的方向（斜向输入时优先转弯）"""
+        dx, dy = self.player.wish
+        wished = []
+        if dx:
+            wished.append(DIRECTIONS.index((dx, 0)))
+        if dy:
+            wished.append(DIRECTIONS.index((0, dy)))
+        if len(wished) == 2 and self.player.direction is not None and wished[1] % 2 != self.player.direction % 2:
+            wished.reverse()
+        return wished
+
+    def _move(self, actor, speed, choose):
+        """按速度移动角色，每到一个格子中心调用choose(节点)选择方向"""
+        actor.budget += speed
+        limit = self.graph.columns * SUBSTEPS
+        while actor.budget >= 1:
+            actor.budget -= 1
+            if actor.at_center():
+                actor.direction = choose(self.graph.node_at(actor.x // SUBSTEPS, actor.y // SUBSTEPS))
+            if actor.direction is None:
+                actor.budget = 0.0
+                return
+            dx, dy = DIRECTIONS[actor.direction]
+            actor.x = (actor.x + dx) % limit
+            actor.y += dy
+
+    def _ghost_speed(self, ghost):
+        if ghost.eaten:
+            return EATEN_SPEED
+        if ghost.frightened:
+            return FRIGHTENED_SPEED
+        return min(GHOST_SPEED + GHOST_SPEED_PER_LEVEL * (self.level - 1), PLAYER_SPEED)
+
+    def _check_ghosts(self, player_cell, previous_player_cell, previous_cells):
+        """检查玩家与鬼的碰撞（同一格，或者在这一步中互相穿过）"""
+        columns = self.graph.columns
+        for ghost, previous in zip(self.ghosts, previous_cells):
+            cell = ghost.cell(columns)
+            if cell != player_cell and not (cell == previous_player_cell and previous == player_cell):
+                continue
+            if ghost.eaten:
+                continue
+            if ghost.frightened:
+                ghost.frightened = False
+                ghost.eaten = True
+                self.player.score += GHOST_POINTS << self.ghost_combo
+                self.ghost_combo += 1
+                continue
+            self.player.lives -= 1
+            if self.player.lives <= 0:
+                self.game_over = True
+            else:
+                self.reset_positions()
+            return
+
+    def step(self, action=(0, 0)):
+        """推进一个逻辑步长
+
+        参数:
+            action: 玩家想走的方向(dx, dy)，每个分量取-1、0或1；(0, 0)表示保持原来的方向
+        """
+        if self.game_over:
+            return
+        player = self.player
+        graph = self.graph
+        columns = graph.columns
+        if action != (0, 0):
+            player.wish = action
+            # 在两个格子之间也可以立即掉头
+            if player.direction is not None and REVERSE[player.direction] in self._wished_directions():
+                player.direction = REVERSE[player.direction]
+
+        previous_player_cell = player.cell(columns)
+        previous_cells = [ghost.cell(columns) for ghost in self.ghosts]
+
+        self._move(player, PLAYER_SPEED, self._choose_player_direction)
+        player_cell = player.cell(columns)
+        if player_cell != self._player_cell:
+            # 玩家换了格子：更新目标节点，并预先算好追它的距离场（之后的路口只查表）
+            self._player_cell = player_cell
+            self.player_node = graph.node_at(*player_cell)
+            graph.distances(self.player_node)
+            self.eat_pellet(self.player_node)
+
+        self._advance_mode()
+        for ghost in self.ghosts:
+            self._move(ghost, self._ghost_speed(ghost),
+                       lambda node, ghost=ghost: self._choose_ghost_direction(ghost, node))
+            if ghost.eaten and ghost.at_center() and ghost.cell(columns) == GHOST_HOME:
+                ghost.eaten = False  # 回到家，复活
+
+        self._check_ghosts(player_cell, previous_player_cell, previous_cells)
+
+        if not self.pellets and not self.power_pellets and not self.game_over:
+            self.level += 1
+            self.reset_level()
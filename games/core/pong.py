@@ -0,0 +1,239 @@
+import math
+
+from games.core.rect import Rect
+from games.core.rng import session_rng
+from games.core.sweep import sweep_box, reflect
+
+# 颜色定义
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+
+# 场地配置
+WINDOW_WIDTH = 800
+WINDOW_HEIGHT = 600
+PADDLE_WIDTH = 15
+PADDLE_HEIGHT = 90
+BALL_SIZE = 15
+PADDLE_SPEED = 5
+BALL_SPEED = 7
+
+# 每帧最多处理的碰撞次数（球卡在挡板和墙壁之间时避免死循环）
+MAX_BOUNCES = 8
+
+
+class Paddle:
+    """挡板类
+
+    玩家控制的挡板，可以上下移动来击球
+
+    属性:
+        rect: 挡板的矩形区域
+        y: 挡板上边的位置（浮点数，rect随之更新）
+        speed: 移动速度
+        score: 得分
+        color: 颜色
+    """
+    __slots__ = ('rect', 'y', 'speed', 'score', 'color')
+
+    def __init__(self, x, color):
+        """初始化挡板
+
+        参数:
+            x: 挡板的水平位置
+            color: 挡板的颜色
+        """
+        self.y = WINDOW_HEIGHT//2 - PADDLE_HEIGHT//2
+        self.rect = Rect(x, self.y, PADDLE_WIDTH, PADDLE_HEIGHT)
+        self.speed = PADDLE_SPEED
+        self.score = 0
+        self.color = color
+
+    def move(self, up=True, dt=1.0):
+        """移动挡板
+
+        参数:
+            up: True表示向上移动，False表示向下移动
+            dt: 经过的时间（以帧为单位）
+        """
+        # 位置按浮点数累加，dt较小时移动量不会被矩形的整数坐标舍掉
+        if up and self.y > 0:
+            self.y -= self.speed * dt
+        if not up and self.y + PADDLE_HEIGHT < WINDOW_HEIGHT:
+            self.y += self.speed * dt
+        self.rect.y = self.y
+
+
+class Ball:
+    """球类
+
+    游戏中的球，在场地中移动并与挡板碰撞
+
+    属性:
+        rect: 球的矩形区域
+        x, y: 球心位置（浮点数，rect随之更新）
+        dx: 水平速度
+        dy: 垂直速度
+        speed: 移动速度
+    """
+    __slots__ = ('rect', 'x', 'y', 'dx', 'dy', 'speed')
+
+    def __init__(self, rng):
+        """初始化球
+
+        参数:
+            rng: 随机数生成器，决定发球方向
+        """
+        self.rect = Rect(WINDOW_WIDTH//2 - BALL_SIZE//2,
+                         WINDOW_HEIGHT//2 - BALL_SIZE//2,
+                         BALL_SIZE, BALL_SIZE)
+        self.speed = BALL_SPEED
+        self.reset(rng)
+
+    def reset(self, rng):
+        """重置球的位置，并向随机方向发球
+
+        参数:
+            rng: 随机数生成器
+        """
+        self.move_to(WINDOW_WIDTH//2, WINDOW_HEIGHT//2)
+        angle = rng.uniform(-math.pi/4, math.pi/4)
+        if rng.choice([True, False]):
+            angle += math.pi
+        self.dx = self.speed * math.cos(angle)
+        self.dy = self.speed * math.sin(angle)
+
+    def move_to(self, x, y):
+        """把球心移动到指定位置
+
+        参数:
+            x, y: 新的球心位置
+        """
+        self.x = x
+        self.y = y
+        self.rect.center = (x, y)
+
+
+class PongCore:
+    """弹球游戏逻辑核心
+
+    不依赖pygame和显示窗口，每次step推进一帧，可在无显示环境下批量模拟对局。
+
+    属性:
+        player1: 左侧玩家
+        player2: 右侧玩家
+        ball: 球
+        game_over: 游戏是否结束
+        win_score: 获胜所需分数
+        seed: 这一局的随机种子
+        rng: 随机数生成器（决定发球方向）
+    """
+    def __init__(self, seed=None, rng=None):
+        """初始化游戏状态
+
+        参数:
+            seed: 随机种子，None表示新生成一个（记录在seed属性中）
+            rng: 随机数生成器（见games.core.rng），给出时不使用seed创建
+        """
+        self.seed, self.rng = session_rng(seed, rng)
+        self.player1 = Paddle(50, BLUE)
+        self.player2 = Paddle(WINDOW_WIDTH - 50 - PADDLE_WIDTH, RED)
+        self.ball = Ball(self.rng)
+        self.game_over = False
+        self.win_score = 5  # 获胜所需分数
+
+    def _bounce_off_paddle(self, paddle):
+        """球击中挡板正面，根据击球位置改变反弹角度"""
+        if paddle is self.player1:
+            self.ball.dx = abs(self.ball.dx)  # 确保球向右移动
+        else:
+            self.ball.dx = -abs(self.ball.dx)  # 确保球向左移动
+        relative_intersect_y = (paddle.rect.centery - self.ball.y)
+        normalized_intersect = relative_intersect_y / (PADDLE_HEIGHT/2)
+        bounce_angle = normalized_intersect * math.pi/3  # 最大反弹角度为60度
+        self.ball.dy = -self.ball.speed * math.sin(bounce_angle)
+
+    def _first_hit(self, dx, dy):
+        """求球沿位移(dx, dy)移动时最早碰到的物体
+
+        返回:
+            tuple: (接触时刻, 法线x, 法线y, 物体)，物体为'wall'或挡板；
+                   这一段内不会碰到任何物体时返回None
+        """
+        ball = self.ball
+        half = ball.rect.width / 2
+        best = None
+        # 上下边界：球已经越过边界时立即反弹
+        if dy < 0:
+            best = (max((half - ball.y) / dy, 0.0), 0, 1, 'wall')
+        elif dy > 0:
+            best = (max((WINDOW_HEIGHT - half - ball.y) / dy, 0.0), 0, -1, 'wall')
+        if best is not None and best[0] > 1:
+            best = None
+        for paddle in (self.player1, self.player2):
+            hit = sweep_box(ball.x, ball.y, dx, dy, half, half, paddle.rect)
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = hit + (paddle,)
+        return best
+
+    def move_ball(self, dt=1.0):
+        """沿速度方向移动球，并处理这段时间内与边界和挡板的碰撞
+
+        每次移动到最早的接触点，按接触面反弹后再用剩余的时间继续移动，
+        球速再快也不会穿过挡板。
+
+        参数:
+            dt: 经过的时间（以帧为单位）
+        """
+        ball = self.ball
+        remaining = dt
+        for _ in range(MAX_BOUNCES):
+            dx = ball.dx * remaining
+            dy = ball.dy * remaining
+            if not dx and not dy:
+                break
+            hit = self._first_hit(dx, dy)
+            if hit is None:
+                ball.move_to(ball.x + dx, ball.y + dy)
+                break
+            t, normal_x, normal_y, target = hit
+            ball.move_to(ball.x + dx * t, ball.y + dy * t)
+            remaining *= 1 - t
+            if target != 'wall' and normal_x:
+                self._bounce_off_paddle(target)  # 击中挡板正面
+            else:
+                ball.dx, ball.dy = reflect(ball.dx, ball.dy, normal_x, normal_y)
+
+    def step(self, action=(0, 0), dt=1.0):
+        """推进一帧
+
+        参数:
+            action: (左侧挡板方向, 右侧挡板方向)，-1向上，1向下，0不动
+            dt: 经过的时间（以帧为单位），球速较快时可以用较小的dt多次推进
+        """
+        if self.game_over:
+            return
+        for paddle, direction in ((self.player1, action[0]), (self.player2, action[1])):
+            if direction:
+                paddle.move(direction < 0, dt)
+
+        self.move_ball(dt)
+
+        # 挡板上下移动时可能直接压到球上，此时按击中挡板正面处理
+        for paddle in (self.player1, self.player2):
+            if self.ball.rect.colliderect(paddle.rect):
+                moving_toward = self.ball.dx < 0 if paddle is self.player1 else self.ball.dx > 0
+                if moving_toward:
+                    self._bounce_off_paddle(paddle)
+                break
+
+        # 检查得分
+        if self.ball.rect.left <= 0:
+            self.player2.score += 1
+            self.ball.reset(self.rng)
+        elif self.ball.rect.right >= WINDOW_WIDTH:
+            self.player1.score += 1
+            self.ball.reset(self.rng)
+
+        # 检查游戏是否结束
+        if self.player1.score >= self.win_score or self.player2.score >= self.win_score:
+            self.game_over = True
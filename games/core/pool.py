@@ -0,0 +1,63 @@
+"""对象池
+
+关卡重置、补充砖块这类操作会一次性丢掉一批对象再创建一批新的，
+频繁分配和回收大量小对象会触发垃圾回收，在内存小的机器上表现为画面卡顿。
+对象池把不再使用的对象留下来，下次需要时调用它的reset重新初始化，而不是创建新对象。
+
+放进池里的类需要满足：构造参数与reset的参数相同，__init__只创建成员对象（例如矩形）
+然后调用reset，reset复用这些成员对象，不分配新的。
+"""
+
+
+class ObjectPool:
+    """对象池
+
+    还回池里的对象在下一次acquire之前保持原样，调用者还可以继续读取它的属性
+    （例如擦掉刚被击碎的砖块）。
+
+    属性:
+        factory: 池里没有空闲对象时用来创建新对象的类
+    """
+    def __init__(self, factory):
+        """创建空的对象池
+
+        参数:
+            factory: 对象的类，需要有与构造参数相同的reset方法
+        """
+        self.factory = factory
+        self._free = []
+
+    def __len__(self):
+        """空闲对象的数量"""
+        return len(self._free)
+
+    def acquire(self, *args):
+        """取得一个对象：有空闲对象时重新初始化后返回，否则创建新对象
+
+        参数:
+            args: 构造参数（传给reset或factory）
+
+        返回:
+            初始化好的对象
+        """
+        if self._free:
+            item = self._free.pop()
+            item.reset(*args)
+            return item
+        return self.factory(*args)
+
+    def release(self, item):
+        """把不再使用的对象还回池里
+
+        参数:
+            item: 之前由acquire取得的对象
+        """
+        self._free.append(item)
+
+    def release_all(self, items):
+        """把一批不再使用的对象还回池里
+
+        参数:
+            items: 对象的可迭代集合
+        """
+        self._free.extend(items)
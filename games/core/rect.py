@@ -0,0 +1,129 @@
+def _round(value):
+    """按pygame.Rect的规则取整（四舍五入，远离零）"""
+    if value >= 0:
+        return int(value + 0.5)
+    return -int(-value + 0.5)
+
+
+class Rect:
+    """纯Python矩形类
+
+    无显示环境下代替pygame.Rect使用，只实现游戏逻辑用到的属性和方法。
+    坐标赋值时按pygame的方式取整，保证与原先的移动结果一致。
+
+    属性:
+        x, y: 左上角坐标
+        width, height: 宽度和高度
+    """
+    __slots__ = ('x', 'y', 'width', 'height')
+
+    def __init__(self, x, y, width, height):
+        """初始化矩形
+
+        参数:
+            x, y: 左上角坐标
+            width, height: 宽度和高度
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    def __setattr__(self, name, value):
+        # 与pygame.Rect一致，所有坐标都保存为整数；其他属性交给各自的setter处理
+        if name in Rect.__slots__:
+            value = _round(value)
+        object.__setattr__(self, name, value)
+
+    # 支持序列协议，pygame.draw可以直接接收该对象
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.width, self.height)[index]
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.width, self.height))
+
+    def __repr__(self):
+        return f'Rect({self.x}, {self.y}, {self.width}, {self.height})'
+
+    @property
+    def left(self):
+        return self.x
+
+    @left.setter
+    def left(self, value):
+        self.x = value
+
+    @property
+    def right(self):
+        return self.x + self.width
+
+    @right.setter
+    def right(self, value):
+        self.x = _round(value) - self.width
+
+    @property
+    def top(self):
+        return self.y
+
+    @top.setter
+    def top(self, value):
+        self.y = value
+
+    @property
+    def bottom(self):
+        return self.y + self.height
+
+    @bottom.setter
+    def bottom(self, value):
+        self.y = _round(value) - self.height
+
+    @property
+    def centerx(self):
+        return self.x + self.width // 2
+
+    @centerx.setter
+    def centerx(self, value):
+        self.x = _round(value) - self.width // 2
+
+    @property
+    def centery(self):
+        return self.y + self.height // 2
+
+    @centery.setter
+    def centery(self, value):
+        self.y = _round(value) - self.height // 2
+
+    @property
+    def center(self):
+        return (self.centerx, self.centery)
+
+    @center.setter
+    def center(self, value):
+        self.centerx, self.centery = value
+
+    def colliderect(self, other):
+        """检查两个矩形是否重叠
+
+        参数:
+            other: 另一个矩形
+
+        返回:
+            bool: True表示重叠（边缘相接不算重叠）
+        """
+        return (self.x < other.x + other.width and other.x < self.x + self.width and
+                self.y < other.y + other.height and other.y < self.y + self.height)
+
+    def collidepoint(self, point):
+        """检查点是否在矩形内
+
+        参数:
+            point: (x, y)坐标
+
+        返回:
+            bool: True表示点在矩形内
+        """
+        x, y = point
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
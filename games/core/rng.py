@@ -0,0 +1,152 @@
+"""每局游戏独立的随机数生成器
+
+各游戏核心不再调用random模块的全局函数，而是使用自己的rng属性：
+- 每局游戏都有一个种子（未指定时新生成一个并记录在seed属性中），
+  同样的种子和同样的输入序列总是得到同样的对局，可以用来回放和做回归测试
+- 调用者也可以直接传入rng，例如批量模拟时给每局一个互不相关的计数器型生成器
+- 多局游戏并行运行时互不影响，没有共享的全局随机状态
+
+标量逻辑（打砖块、贪吃蛇等）使用与random.Random接口相同的生成器；
+按数组处理的逻辑（吃豆人、2048批量模拟）使用NumPy的Generator。
+
+计数器型生成器（Philox）的第n个输出只取决于(种子, 流编号, n)，
+不同的流编号在同一个种子下给出互不相关的序列，适合把一批模拟分给多个进程。
+"""
+import random
+import secrets
+
+import numpy as np
+
+# 计数器型生成器每次生成的64位随机数个数
+COUNTER_BLOCK = 1024
+
+# 64位整数的掩码，53位浮点数的比例
+_MASK64 = (1 << 64) - 1
+_RECIP53 = 2.0 ** -53
+
+
+def new_seed():
+    """生成一个新的随机种子（未指定种子时使用，记录下来即可重现这一局）
+
+    返回:
+        int: 63位非负整数
+    """
+    return secrets.randbits(63)
+
+
+class CounterRandom(random.Random):
+    """计数器型随机数生成器
+
+    用NumPy的Philox按块生成64位随机数，再逐个提供给random.Random的接口
+    （random、getrandbits以及基于它们的choice、randrange、uniform等）。
+    每次调用比random.Random（C实现）慢几倍，只在需要互不相关的多个流时使用；
+    按数组处理的批量模拟用make_numpy_rng(counter=True)，速度与默认生成器相当。
+
+    属性:
+        stream: 流编号，与种子一起组成Philox的密钥
+    """
+    def __init__(self, seed=None, stream=0):
+        """创建生成器
+
+        参数:
+            seed: 整数种子，None表示新生成一个
+            stream: 流编号，同一个种子下不同的流互不相关
+        """
+        self.stream = stream
+        random.Random.__init__(self, seed)
+
+    def seed(self, a=None, version=2):
+        """重新设置种子，从第0个输出开始
+
+        参数:
+            a: 整数种子，None表示新生成一个
+            version: 为了与random.Random兼容，忽略
+        """
+        if a is None:
+            a = new_seed()
+        self._generator = np.random.Philox(key=(a & _MASK64) | (self.stream << 64))
+        self._block = []
+        self._next = 0
+        self.gauss_next = None
+
+    def _word(self):
+        """下一个64位随机数"""
+        if self._next >= len(self._block):
+            self._block = self._generator.random_raw(COUNTER_BLOCK).tolist()
+            self._next = 0
+        word = self._block[self._next]
+        self._next += 1
+        return word
+
+    def random(self):
+        """[0, 1)之间的随机浮点数"""
+        return (self._word() >> 11) * _RECIP53
+
+    def getrandbits(self, k):
+        """k位的随机非负整数"""
+        value = 0
+        bits = 0
+        while bits < k:
+            value = value << 64 | self._word()
+            bits += 64
+        return value >> (bits - k)
+
+    def getstate(self):
+        return self._generator.state, tuple(self._block), self._next, self.gauss_next
+
+    def setstate(self, state):
+        generator_state, block, self._next, self.gauss_next = state
+        self._generator.state = generator_state
+        self._block = list(block)
+
+
+def make_rng(seed=None, counter=False, stream=0):
+    """创建标量逻辑用的随机数生成器
+
+    参数:
+        seed: 整数种子，None表示随机
+        counter: True时使用计数器型生成器（CounterRandom），否则使用random.Random
+        stream: 计数器型生成器的流编号
+
+    返回:
+        random.Random: 生成器
+    """
+    if counter:
+        return CounterRandom(seed, stream)
+    return random.Random(seed)
+
+
+def make_numpy_rng(seed=None, counter=False, stream=0):
+    """创建按数组处理的逻辑用的NumPy随机数生成器
+
+    参数:
+        seed: 整数种子，None表示随机
+        counter: True时使用Philox（计数器型），否则使用NumPy默认的PCG64
+        stream: Philox的流编号
+
+    返回:
+        numpy.random.Generator: 生成器
+    """
+    if counter:
+        if seed is None:
+            seed = new_seed()
+        return np.random.Generator(np.random.Philox(key=(seed & _MASK64) | (stream << 64)))
+    return np.random.default_rng(seed)
+
+
+def session_rng(seed=None, rng=None, numpy=False):
+    """确定一局游戏的种子和随机数生成器
+
+    参数:
+        seed: 种子，None表示新生成一个
+        rng: 调用者传入的生成器，给出时直接使用
+        numpy: True表示创建NumPy的Generator，否则创建random.Random
+
+    返回:
+        tuple: (种子, 生成器)；传入rng时种子为传入的seed（可能为None）
+    """
+    if rng is not None:
+        return seed, rng
+    if seed is None:
+        seed = new_seed()
+    return seed, (make_numpy_rng(seed) if numpy else make_rng(seed))
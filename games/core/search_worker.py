@@ -0,0 +1,60 @@
+"""后台搜索线程
+
+游戏AI（2048自动玩家、五子棋电脑对手等）的搜索可能需要几十毫秒到一秒，
+放在渲染线程中会让画面卡顿。SearchWorker在守护线程中调用player.best_move(state)，
+完成后调用callback(state, move)把结果交还给调用方。
+"""
+import threading
+import queue
+
+
+class SearchWorker:
+    """后台搜索线程
+
+    同一时间只处理一个请求，新请求会替换尚未开始的旧请求。
+
+    属性:
+        player: 提供best_move(state)方法的AI玩家
+        callback: 搜索完成后的回调函数，在后台线程中调用
+    """
+    def __init__(self, player, callback):
+        """创建并启动搜索线程
+
+        参数:
+            player: 提供best_move(state)方法的AI玩家
+            callback: 搜索完成后的回调函数，参数为(局面, 搜索结果)
+        """
+        self.player = player
+        self.callback = callback
+        self._requests = queue.Queue(maxsize=1)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def request(self, state):
+        """请求为指定局面搜索
+
+        参数:
+            state: 传给player.best_move的局面，应当不可变，回调时原样返回
+        """
+        try:
+            self._requests.get_nowait()  # 丢弃尚未处理的旧请求
+        except queue.Empty:
+            pass
+        self._requests.put(state)
+
+    def stop(self):
+        """停止搜索线程"""
+        self._running = False
+        try:
+            self._requests.put_nowait(None)
+        except queue.Full:
+            pass
+
+    def _run(self):
+        """线程主循环"""
+        while self._running:
+            state = self._requests.get()
+            if state is None or not self._running:
+                break
+            self.callback(state, self.player.best_move(state))
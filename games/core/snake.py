@@ -0,0 +1,288 @@
+from collections import deque
+
+from games.core.rng import session_rng
+
+# 游戏中使用的颜色（RGB格式）
+RED = (255, 0, 0)      # 红色，用于食物
+GREEN = (0, 255, 0)    # 绿色，用于蛇身
+
+# 网格设置（以格子为单位）
+GRID_WIDTH = 40   # 网格宽度数量
+GRID_HEIGHT = 30  # 网格高度数量
+
+# 移动方向
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+DIRECTIONS = (DOWN, UP, RIGHT, LEFT)
+
+
+def cell_index(position):
+    """把(x,y)格子坐标转换为占用表中的下标"""
+    return position[1] * GRID_WIDTH + position[0]
+
+
+class FreeCells:
+    """空闲格子索引
+
+    cells的前count项是所有空闲格子的下标（顺序任意），slots记录每个格子在cells中的位置。
+    占用或释放一个格子时只和分界处的元素交换，随机取一个空闲格子也只需一次下标访问，
+    都是O(1)，与蛇的长度无关。
+
+    属性:
+        cells: 格子下标数组，前count项为空闲格子
+        slots: slots[cell]为格子cell在cells中的位置
+        count: 空闲格子的数量
+    """
+    def __init__(self, size=GRID_WIDTH * GRID_HEIGHT):
+        """创建全部空闲的索引
+
+        参数:
+            size: 格子总数
+        """
+        self.cells = list(range(size))
+        self.slots = list(range(size))
+        self.count = size
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, cell):
+        return self.slots[cell] < self.count
+
+    def _swap(self, cell, slot):
+        """把格子cell移动到cells[slot]，原来在该位置的格子换到cell原来的位置"""
+        cells = self.cells
+        slots = self.slots
+        other = cells[slot]
+        old = slots[cell]
+        cells[old] = other
+        slots[other] = old
+        cells[slot] = cell
+        slots[cell] = slot
+
+    def occupy(self, cell):
+        """把空闲格子标记为占用"""
+        self.count -= 1
+        self._swap(cell, self.count)
+
+    def release(self, cell):
+        """把占用的格子标记为空闲"""
+        self._swap(cell, self.count)
+        self.count += 1
+
+    def choice(self, rng):
+        """随机返回一个空闲格子的(x,y)坐标，没有空闲格子时返回None
+
+        参数:
+            rng: 随机数生成器
+        """
+        if not self.count:
+            return None
+        cell = self.cells[rng.randrange(self.count)]
+        return cell % GRID_WIDTH, cell // GRID_WIDTH
+
+
+class Snake:
+    """蛇类
+
+    控制蛇的移动和生长
+
+    属性:
+        length: 蛇的长度
+        positions: 蛇身体各部分的位置（deque，蛇头在最左边），每个位置是一个(x,y)元组
+        occupied: 占用表，occupied[cell_index(p)]为蛇身占据格子p的节数
+        free: 没有被蛇身占据的格子的索引（FreeCells）
+        direction: 移动方向，可以是(0,1)向下,(0,-1)向上,(1,0)向右,(-1,0)向左
+        heading: 上一次实际移动的方向
+        color: 蛇的颜色
+        score: 当前得分
+    """
+    __slots__ = ('length', 'positions', 'occupied', 'free', 'direction', 'heading', 'color', 'score')
+
+    def __init__(self, rng):
+        """初始化蛇的属性
+
+        设置蛇的初始长度、位置、方向、颜色和分数
+
+        参数:
+            rng: 随机数生成器，决定初始方向
+        """
+        self.color = GREEN
+        self.reset(rng)
+
+    def get_head_position(self):
+        """获取蛇头位置
+
+        返回:
+            tuple: 蛇头的(x,y)坐标
+        """
+        return self.positions[0]
+
+    def turn(self, direction):
+        """改变移动方向
+
+        不允许直接掉头（与上一次实际移动的方向相反）。输入按显示帧率处理时，
+        两次移动之间可能连续转向多次，只和direction比较会经过两次转向掉头撞到自己
+
+        参数:
+            direction: 新的移动方向
+        """
+        if (direction[0] * -1, direction[1] * -1) != self.heading:
+            self.direction = direction
+
+    def update(self):
+        """更新蛇的位置
+
+        根据当前方向移动蛇，检查是否撞到自己
+
+        返回:
+            bool: True表示移动成功，False表示游戏结束
+        """
+        positions = self.positions
+        cur = positions[0]
+        x, y = self.heading = self.direction
+        # 计算新的头部位置，使用取模运算实现穿墙
+        new = ((cur[0] + x) % GRID_WIDTH, (cur[1] + y) % GRID_HEIGHT)
+        # 检查是否撞到自己（不算第一节和第二节，因为蛇不可能撞到自己的第一节和第二节）
+        hits = self.occupied[cell_index(new)]
+        if hits:
+            hits -= (new == cur) + (len(positions) > 1 and new == positions[1])
+            if hits:
+                return False
+        # 在开头插入新的头部位置
+        positions.appendleft(new)
+        cell = cell_index(new)
+        if not self.occupied[cell]:
+            self.free.occupy(cell)
+        self.occupied[cell] += 1
+        # 如果超过当前长度，删除尾部
+        if len(positions) > self.length:
+            cell = cell_index(positions.pop())
+            self.occupied[cell] -= 1
+            if not self.occupied[cell]:
+                self.free.release(cell)
+        return True
+
+    def reset(self, rng):
+        """重置蛇的状态
+
+        在游戏重新开始时调用，重置蛇的长度、位置、方向和分数
+
+        参数:
+            rng: 随机数生成器，决定初始方向
+        """
+        self.length = 1
+        start = (GRID_WIDTH // 2, GRID_HEIGHT // 2)
+        self.positions = deque([start])
+        self.occupied = bytearray(GRID_WIDTH * GRID_HEIGHT)
+        self.occupied[cell_index(start)] = 1
+        self.free = FreeCells()
+        self.free.occupy(cell_index(start))
+        self.direction = rng.choice([(0, 1), (0, -1), (1, 0), (-1, 0)])
+        self.heading = self.direction
+        self.score = 0
+
+
+class Food:
+    """食物类
+
+    控制食物的生成
+
+    属性:
+        position: 食物的位置，(x,y)元组
+        color: 食物的颜色
+    """
+    __slots__ = ('position', 'color')
+
+    def __init__(self, rng):
+        """初始化食物
+
+        设置初始位置和颜色，并随机放置食物
+
+        参数:
+            rng: 随机数生成器
+        """
+        self.position = (0, 0)
+        self.color = RED
+        self.randomize_position(FreeCells(), rng)
+
+    def randomize_position(self, free, rng):
+        """随机生成食物位置
+
+        从空闲格子中直接选取，确保食物不会出现在蛇身上
+
+        参数:
+            free: 蛇的空闲格子索引（Snake.free）
+
+        返回:
+            bool: False表示已经没有空闲格子（蛇占满了整个场地）
+        """
+        position = free.choice(rng)
+        if position is None:
+            return False
+        self.position = position
+        return True
+
+
+class SnakeCore:
+    """贪吃蛇游戏逻辑核心
+
+    不依赖pygame和显示窗口，按格子推进游戏，可在无显示环境下批量模拟对局。
+
+    属性:
+        snake: 蛇对象
+        food: 食物对象
+        game_over: 游戏是否结束
+        won: 蛇是否占满了整个场地（获胜）
+        seed: 这一局的随机种子
+        rng: 随机数生成器（决定初始方向和食物位置）
+    """
+    def __init__(self, seed=None, rng=None):
+        """初始化游戏状态
+
+        参数:
+            seed: 随机种子，None表示新生成一个（记录在seed属性中）
+            rng: 随机数生成器（见games.core.rng），给出时不使用seed创建
+        """
+        self.seed, self.rng = session_rng(seed, rng)
+        self.snake = Snake(self.rng)
+        self.food = Food(self.rng)
+        self.game_over = False
+        self.won = False
+
+    def reset(self):
+        """重新开始一局"""
+        self.snake.reset(self.rng)
+        self.game_over = False
+        self.won = False
+
+    def step(self, action=None):
+        """推进一格
+
+        参数:
+            action: 新的移动方向，None表示保持当前方向
+
+        返回:
+            bool: True表示本步吃到了食物
+        """
+        if self.game_over:
+            return False
+        if action is not None:
+            self.snake.turn(action)
+
+        # 更新蛇的位置，检查是否撞到自己
+        if not self.snake.update():
+            self.game_over = True
+
+        # 检查是否吃到食物
+        if self.snake.get_head_position() == self.food.position:
+            self.snake.length += 1  # 蛇长度加1
+            self.snake.score += 10  # 得分加10
+            # 重新放置食物，没有空格可放说明蛇占满了场地，获胜
+            if not self.food.randomize_position(self.snake.free, self.rng):
+                self.game_over = True
+                self.won = True
+            return True
+        return False
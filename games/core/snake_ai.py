@@ -0,0 +1,397 @@
+"""贪吃蛇自动驾驶
+
+在穿墙（四边相连）的GRID_WIDTH x GRID_HEIGHT网格上为蛇选择方向：
+- 蛇较短时，用A*搜索到食物的最短路径；沿路径吃到食物后，如果蛇头还能走到蛇尾
+  （说明不会把自己困死）才走这条路径，否则跟着蛇尾走，再不行就选活动空间最大的方向
+- 蛇较长时，沿预先计算的哈密顿回路前进，在不会追上蛇尾的前提下抄近路；
+  切换时蛇身可能还没按回路顺序排列，此时先跟着蛇尾走，直到沿回路前进不会撞上蛇身为止
+搜索考虑蛇身随时间让出的格子：蛇身第i节（蛇头为0）在若干步之后才会空出来。
+
+搜索用到的数组全部预先分配，用“版本号”标记代替每次清空，可以在实际游戏和无显示的批量测试中反复调用。
+"""
+import heapq
+from collections import deque
+
+from games.core.snake import GRID_WIDTH, GRID_HEIGHT, DIRECTIONS, cell_index
+
+CELL_COUNT = GRID_WIDTH * GRID_HEIGHT
+
+# 蛇长达到该值后改为沿哈密顿回路前进
+HAMILTON_THRESHOLD = CELL_COUNT // 4
+
+# 哈密顿回路上抄近路时与蛇尾之间至少保留的格子数
+SHORTCUT_MARGIN = 3
+
+# 每个格子的坐标和四个方向上的相邻格子（穿墙）
+XS = [cell % GRID_WIDTH for cell in range(CELL_COUNT)]
+YS = [cell // GRID_WIDTH for cell in range(CELL_COUNT)]
+NEIGHBORS = [tuple((direction, cell_index(((XS[cell] + direction[0]) % GRID_WIDTH,
+                                           (YS[cell] + direction[1]) % GRID_HEIGHT)))
+                   for direction in DIRECTIONS)
+             for cell in range(CELL_COUNT)]
+
+
+def _build_cycle():
+    """构造一条经过所有格子的哈密顿回路
+
+    第0行从左走到右，之后在第1列到最后一列之间逐行来回折返，最后沿第0列回到起点。
+    需要GRID_HEIGHT为偶数。
+
+    返回:
+        list: 按回路顺序排列的格子下标；网格不满足条件时返回None
+    """
+    if GRID_HEIGHT % 2 or GRID_WIDTH < 2:
+        return None
+    order = [(x, 0) for x in range(GRID_WIDTH)]
+    for y in range(1, GRID_HEIGHT):
+        columns = range(GRID_WIDTH - 1, 0, -1) if y % 2 else range(1, GRID_WIDTH)
+        order.extend((x, y) for x in columns)
+    order.extend((0, y) for y in range(GRID_HEIGHT - 1, 0, -1))
+    return [cell_index(position) for position in order]
+
+
+CYCLE = _build_cycle()
+CYCLE_INDEX = None
+if CYCLE is not None:
+    CYCLE_INDEX = [0] * CELL_COUNT
+    for order, cell in enumerate(CYCLE):
+        CYCLE_INDEX[cell] = order
+
+
+def torus_distance(a, b):
+    """两个格子在穿墙网格上的曼哈顿距离"""
+    dx = abs(XS[a] - XS[b])
+    dy = abs(YS[a] - YS[b])
+    return min(dx, GRID_WIDTH - dx) + min(dy, GRID_HEIGHT - dy)
+
+
+class SnakeAI:
+    """贪吃蛇自动驾驶
+
+    属性:
+        use_cycle: 蛇较长时是否改为沿哈密顿回路前进
+        last_mode: 上一次决策使用的策略：'food'、'tail'、'space'或'cycle'
+    """
+    def __init__(self, use_cycle=True):
+        """初始化并预先分配搜索用的数组
+
+        参数:
+            use_cycle: 蛇较长时是否改为沿哈密顿回路前进
+        """
+        self.use_cycle = use_cycle and CYCLE is not None
+        self.last_mode = None
+        # 蛇较长时连续跟着蛇尾走的步数，以及开始计数时的蛇长
+        self._tail_steps = 0
+        self._tail_length = 0
+        # 蛇身格子在第几步之后才能进入，free_stamp不等于当前版本号的格子视为空格
+        self._free_at = [0] * CELL_COUNT
+        self._free_stamp = [0] * CELL_COUNT
+        # A*的代价、父节点和访问标记
+        self._cost = [0] * CELL_COUNT
+        self._parent = [0] * CELL_COUNT
+        self._seen = [0] * CELL_COUNT
+        self._stamp = 0
+        self._heap = []
+        self._queue = deque()
+
+    def _next_stamp(self):
+        """换一个新的版本号，相当于清空所有标记数组"""
+        self._stamp += 1
+        return self._stamp
+
+    def _mark_body(self, body, pending):
+        """记录蛇身每一节在第几步之后让出格子
+
+        与Snake.update的碰撞规则一致：第t步移动时，长度为n的蛇身中下标大于n - t的节已经不算障碍，
+        还没长出来的pending节会让所有节晚pending步让出
+
+        参数:
+            body: 蛇身格子下标序列，蛇头在前
+            pending: 还要增长的节数
+
+        返回:
+            int: 本次标记的版本号
+        """
+        stamp = self._next_stamp()
+        free_at = self._free_at
+        free_stamp = self._free_stamp
+        n = len(body)
+        for i, cell in enumerate(body):
+            # 同一格子被多节占据时以最晚让出的为准
+            when = n - i + 1 + pending
+            if free_stamp[cell] != stamp or when > free_at[cell]:
+                free_at[cell] = when
+                free_stamp[cell] = stamp
+        return stamp
+
+    def _search(self, body, pending, target, first_direction):
+        """A*搜索从蛇头到目标格子的最短路径
+
+        参数:
+            body: 蛇身格子下标序列，蛇头在前
+            pending: 还要增长的节数
+            target: 目标格子
+            first_direction: 当前移动方向，第一步不能掉头
+
+        返回:
+            list: 路径上的格子下标（不含蛇头，含目标）；无法到达时返回None
+        """
+        body_stamp = self._mark_body(body, pending)
+        free_at = self._free_at
+        free_stamp = self._free_stamp
+        cost = self._cost
+        parent = self._parent
+        seen = self._seen
+        stamp = self._next_stamp()
+        heap = self._heap
+        heap.clear()
+
+        start = body[0]
+        reverse = (-first_direction[0], -first_direction[1]) if len(body) > 1 else None
+        cost[start] = 0
+        seen[start] = stamp
+        heapq.heappush(heap, (torus_distance(start, target), 0, start))
+        while heap:
+            _, g, cell = heapq.heappop(heap)
+            if cell == target:
+                path = []
+                while cell != start:
+                    path.append(cell)
+                    cell = parent[cell]
+                path.reverse()
+                return path
+            if g > cost[cell]:
+                continue
+            step = g + 1
+            for direction, neighbor in NEIGHBORS[cell]:
+                if cell == start and direction == reverse:
+                    continue
+                if free_stamp[neighbor] == body_stamp and step < free_at[neighbor]:
+                    continue  # 走到这里时蛇身还没让开
+                if seen[neighbor] == stamp and cost[neighbor] <= step:
+                    continue
+                seen[neighbor] = stamp
+                cost[neighbor] = step
+                parent[neighbor] = cell
+                heapq.heappush(heap, (step + torus_distance(neighbor, target), step, neighbor))
+        return None
+
+    def _space(self, start, occupied):
+        """从start出发能到达的空格数量（洪水填充）"""
+        stamp = self._next_stamp()
+        seen = self._seen
+        queue = self._queue
+        queue.clear()
+        queue.append(start)
+        seen[start] = stamp
+        count = 0
+        while queue:
+            cell = queue.popleft()
+            count += 1
+            for _, neighbor in NEIGHBORS[cell]:
+                if seen[neighbor] != stamp and not occupied[neighbor]:
+                    seen[neighbor] = stamp
+                    queue.append(neighbor)
+        return count
+
+    def _safe_moves(self, snake):
+        """当前不会撞到自己的方向列表，每项为(方向, 相邻格子)"""
+        head = cell_index(snake.positions[0])
+        reverse = (-snake.direction[0], -snake.direction[1]) if len(snake.positions) > 1 else None
+        moves = []
+        for direction, neighbor in NEIGHBORS[head]:
+            if direction == reverse:
+                continue
+            # 蛇尾在下一步才让出，和Snake.update的规则一致，仍然算作障碍
+            if snake.occupied[neighbor] and not (neighbor == head or
+                                                 (len(snake.positions) > 1 and
+                                                  neighbor == cell_index(snake.positions[1]))):
+                continue
+            moves.append((direction, neighbor))
+        return moves
+
+    def _cycle_move(self, snake, food):
+        """沿哈密顿回路前进，安全时抄近路"""
+        head = cell_index(snake.positions[0])
+        tail = cell_index(snake.positions[-1])
+        head_order = CYCLE_INDEX[head]
+
+        def ahead(cell):
+            return (CYCLE_INDEX[cell] - head_order) % CELL_COUNT
+
+        to_tail = ahead(tail)
+        to_food = ahead(food)
+        pending = snake.length - len(snake.positions)
+        best = None
+        best_distance = 0
+        for direction, neighbor in self._safe_moves(snake):
+            distance = ahead(neighbor)
+            # 不能越过食物，也不能追到蛇尾附近
+            if distance > to_food or to_tail - distance < SHORTCUT_MARGIN + pending + 1:
+                continue
+            # 蛇身占满一半以后不再抄近路
+            if distance > 1 and len(snake.positions) * 2 >= CELL_COUNT:
+                continue
+            if distance > best_distance:
+                best_distance = distance
+                best = direction
+        if best is not None:
+            return best
+        next_cell = CYCLE[(head_order + 1) % CELL_COUNT]
+        for direction, neighbor in NEIGHBORS[head]:
+            if neighbor == next_cell:
+                return direction
+        return None
+
+    def _on_cycle(self, snake):
+        """蛇身是否按哈密顿回路的顺序排列（从蛇尾到蛇头在回路上单调前进）"""
+        tail_order = CYCLE_INDEX[cell_index(snake.positions[-1])]
+        previous = -1
+        for position in reversed(snake.positions):
+            order = (CYCLE_INDEX[cell_index(position)] - tail_order) % CELL_COUNT
+            if order <= previous:
+                return False
+            previous = order
+        return True
+
+    def _cycle_slack(self, snake, neighbor):
+        """走到neighbor后一直沿回路前进时，离撞上还没让开的蛇身还有多少余量
+
+        回路上距离为s的蛇身格子必须在s步内让出，余量是所有蛇身格子中s减去让出步数的最小值，
+        不小于0表示安全（蛇身不按回路顺序排列时使用）
+        """
+        positions = snake.positions
+        pending = snake.length - len(positions)
+        # 移动后的蛇身（不含新蛇头）及其长度
+        kept = len(positions) if pending else len(positions) - 1
+        pending = max(pending - 1, 0)
+        count = kept + 1
+        start = CYCLE_INDEX[neighbor]
+        slack = CELL_COUNT
+        for i in range(kept):
+            distance = (CYCLE_INDEX[cell_index(positions[i])] - start) % CELL_COUNT
+            margin = distance - (count - i + pending + SHORTCUT_MARGIN)
+            if margin < slack:
+                slack = margin
+        return slack
+
+    def _long_snake_move(self, snake, food):
+        """蛇较长时的走法
+
+        蛇身已经按回路顺序排列时沿回路前进（可以安全地抄近路）；
+        否则在确认安全时先沿回路走（或跳到回路上安全的位置），走完一圈后蛇身自然就排好了
+
+        返回:
+            tuple: 移动方向；没有安全的回路走法时返回None
+        """
+        if self._on_cycle(snake):
+            return self._cycle_move(snake, food)
+        head = cell_index(snake.positions[0])
+        next_cell = CYCLE[(CYCLE_INDEX[head] + 1) % CELL_COUNT]
+        fallback = None
+        for direction, neighbor in self._safe_moves(snake):
+            if self._cycle_slack(snake, neighbor) >= 0:
+                if neighbor == next_cell:
+                    return direction
+                fallback = direction  # 跳到回路上另一个安全的位置
+        return fallback
+
+    def _tail_move(self, snake, body, pending):
+        """跟着蛇尾走
+
+        蛇较短时沿到蛇尾的最短路径走。蛇较长时（准备改走哈密顿回路）在所有走完后仍能到达蛇尾的
+        方向中选择回路余量最大的一个，让蛇身逐渐按回路顺序展开，而不是在原地绕圈
+
+        返回:
+            tuple: 移动方向；到不了蛇尾时返回None
+        """
+        if not (self.use_cycle and snake.length >= HAMILTON_THRESHOLD):
+            path = self._search(body, pending, body[-1], snake.direction)
+            return self._step_direction(body[0], path[0]) if path else None
+
+        best = None
+        best_slack = None
+        for direction, neighbor in self._safe_moves(snake):
+            if pending:
+                virtual = [neighbor] + body
+            else:
+                virtual = [neighbor] + body[:-1]
+            if self._search(virtual, max(pending - 1, 0), virtual[-1], direction) is None:
+                continue
+            slack = self._cycle_slack(snake, neighbor)
+            if best_slack is None or slack > best_slack:
+                best_slack = slack
+                best = direction
+        return best
+
+    def next_direction(self, core):
+        """为SnakeCore选择下一步的方向
+
+        参数:
+            core: SnakeCore对象
+
+        返回:
+            tuple: 移动方向；无路可走时返回当前方向
+        """
+        snake = core.snake
+        head = cell_index(snake.positions[0])
+        food = cell_index(core.food.position)
+        pending = snake.length - len(snake.positions)
+
+        body = [cell_index(position) for position in snake.positions]
+        if self.use_cycle and snake.length >= HAMILTON_THRESHOLD:
+            direction = self._long_snake_move(snake, food)
+            if direction is not None:
+                self.last_mode = 'cycle'
+                return direction
+            # 蛇身还没排好时不再冒险追食物，先跟着蛇尾把蛇身展开；
+            # 跟了很久仍没排好（在原地兜圈）时才去吃一次食物，改变蛇身的形状
+            if self._tail_length != snake.length:
+                self._tail_length = snake.length
+                self._tail_steps = 0
+            self._tail_steps += 1
+            if self._tail_steps <= 2 * snake.length:
+                direction = self._tail_move(snake, body, pending)
+                if direction is not None:
+                    self.last_mode = 'tail'
+                    return direction
+
+        path = self._search(body, pending, food, snake.direction)
+        if path:
+            # 模拟沿路径吃到食物后的蛇身，确认蛇头还能走到蛇尾
+            virtual = (path[::-1] + body)[:snake.length]
+            growth = snake.length + 1 - len(virtual)
+            if (len(virtual) < 2 or
+                    self._search(virtual, growth, virtual[-1], self._direction(head, path)) is not None):
+                self.last_mode = 'food'
+                return self._step_direction(head, path[0])
+
+        if len(body) > 1:
+            direction = self._tail_move(snake, body, pending)
+            if direction is not None:
+                self.last_mode = 'tail'
+                return direction
+
+        # 都不行时选择活动空间最大的方向
+        self.last_mode = 'space'
+        best = None
+        best_space = -1
+        for direction, neighbor in self._safe_moves(snake):
+            space = self._space(neighbor, snake.occupied)
+            if space > best_space:
+                best_space = space
+                best = direction
+        return best if best is not None else snake.direction
+
+    @staticmethod
+    def _step_direction(cell, neighbor):
+        """从cell走到相邻格子neighbor的方向"""
+        for direction, other in NEIGHBORS[cell]:
+            if other == neighbor:
+                return direction
+        return None
+
+    def _direction(self, head, path):
+        """沿路径走到终点时最后一步的移动方向"""
+        previous = path[-2] if len(path) > 1 else head
+        return self._step_direction(previous, path[-1])
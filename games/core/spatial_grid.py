@@ -0,0 +1,134 @@
+"""均匀网格空间索引
+
+把场地按固定大小划分成格子，每个物体登记到它的矩形覆盖的所有格子中。
+查询时只检查查询矩形覆盖的几个格子里的物体，与物体总数无关；
+删除物体只需从它所在的几个格子的集合中移除，不需要在列表中线性查找。
+
+格子大小取物体的排列间距（例如砖块的宽度加间隔）时，每个物体只落在一到两个格子里。
+"""
+
+
+class SpatialGrid:
+    """均匀网格空间索引
+
+    物体的矩形在登记后不应再改变；需要移动时先remove再add。
+    迭代时按物体加入的顺序返回。
+
+    属性:
+        cell_width: 格子宽度
+        cell_height: 格子高度
+    """
+    def __init__(self, cell_width, cell_height):
+        """创建空索引
+
+        参数:
+            cell_width: 格子宽度
+            cell_height: 格子高度
+        """
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        # 格子坐标 -> 该格子中的物体集合
+        self._cells = {}
+        # 物体 -> (加入顺序, 矩形, 所在格子列表)；dict保持插入顺序
+        self._items = {}
+        self._serial = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def _keys(self, left, top, right, bottom):
+        """矩形[left, right) x [top, bottom)覆盖的所有格子坐标"""
+        first_col = left // self.cell_width
+        last_col = (right - 1) // self.cell_width
+        first_row = top // self.cell_height
+        last_row = (bottom - 1) // self.cell_height
+        return [(col, row)
+                for row in range(first_row, last_row + 1)
+                for col in range(first_col, last_col + 1)]
+
+    def add(self, item, rect):
+        """登记物体
+
+        参数:
+            item: 物体（需要可哈希）
+            rect: 物体的矩形，需要有x、y、width、height属性
+        """
+        if item in self._items:
+            self.remove(item)
+        keys = self._keys(rect.x, rect.y, rect.x + rect.width, rect.y + rect.height)
+        for key in keys:
+            bucket = self._cells.get(key)
+            if bucket is None:
+                bucket = self._cells[key] = set()
+            bucket.add(item)
+        self._items[item] = (self._serial, rect, keys)
+        self._serial += 1
+
+    def remove(self, item):
+        """删除物体
+
+        参数:
+            item: 之前登记过的物体
+        """
+        _, _, keys = self._items.pop(item)
+        for key in keys:
+            bucket = self._cells[key]
+            bucket.discard(item)
+            if not bucket:
+                del self._cells[key]
+
+    def clear(self):
+        """删除所有物体"""
+        self._cells.clear()
+        self._items.clear()
+        self._serial = 0
+
+    def query(self, left, top, right, bottom):
+        """查找与区域[left, right) x [top, bottom)重叠的物体
+
+        参数:
+            left, top: 区域左上角
+            right, bottom: 区域右下角（不含）
+
+        返回:
+            list: 重叠的物体，按加入的顺序排列
+        """
+        if right <= left or bottom <= top:
+            return []
+        items = self._items
+        found = []
+        seen = set()
+        for key in self._keys(left, top, right, bottom):
+            bucket = self._cells.get(key)
+            if not bucket:
+                continue
+            for item in bucket:
+                if item in seen:
+                    continue
+                seen.add(item)
+                serial, rect, _ = items[item]
+                if (rect.x < right and left < rect.x + rect.width and
+                        rect.y < bottom and top < rect.y + rect.height):
+                    found.append((serial, item))
+        found.sort(key=lambda entry: entry[0])
+        return [item for _, item in found]
+
+    def colliding(self, rect):
+        """查找与矩形重叠的物体（规则同Rect.colliderect）
+
+        参数:
+            rect: 矩形
+
+        返回:
+            list: 重叠的物体，按加入的顺序排列
+        """
+        return self.query(rect.x, rect.y, rect.x + rect.width, rect.y + rect.height)
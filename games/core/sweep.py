@@ -0,0 +1,91 @@
+"""扫掠碰撞检测
+
+球在一帧内沿线段移动，先求出与各个物体第一次接触的时刻（0到1之间的比例），
+移动到最早的接触点、按接触面反弹，再用剩余的时间继续移动。
+这样球速再快也不会穿过薄的砖块和挡板，一帧内也只会先处理最早的那一次碰撞。
+
+球按轴对齐的正方形处理：把目标矩形向四周扩大球的半宽，
+问题就变成球心这条射线与扩大后矩形的相交测试（slab法）。
+"""
+
+INFINITY = float('inf')
+
+
+def sweep_box(x, y, dx, dy, half_width, half_height, rect):
+    """求移动的方块与静止矩形第一次接触的时刻
+
+    参数:
+        x, y: 方块中心的起点
+        dx, dy: 这一段的位移
+        half_width, half_height: 方块的半宽和半高
+        rect: 目标矩形，需要有x、y、width、height属性
+
+    返回:
+        tuple: (接触时刻, 法线x, 法线y)，时刻在[0, 1]之间，法线指向方块一侧；
+               这一段内不会接触（或起点已经重叠、正在远离）时返回None
+    """
+    left = rect.x - half_width
+    right = rect.x + rect.width + half_width
+    top = rect.y - half_height
+    bottom = rect.y + rect.height + half_height
+
+    if dx > 0:
+        x_entry = (left - x) / dx
+        x_exit = (right - x) / dx
+    elif dx < 0:
+        x_entry = (right - x) / dx
+        x_exit = (left - x) / dx
+    elif left < x < right:
+        x_entry = -INFINITY
+        x_exit = INFINITY
+    else:
+        return None
+
+    if dy > 0:
+        y_entry = (top - y) / dy
+        y_exit = (bottom - y) / dy
+    elif dy < 0:
+        y_entry = (bottom - y) / dy
+        y_exit = (top - y) / dy
+    elif top < y < bottom:
+        y_entry = -INFINITY
+        y_exit = INFINITY
+    else:
+        return None
+
+    entry = max(x_entry, y_entry)
+    if entry < 0 or entry > 1 or entry >= min(x_exit, y_exit):
+        return None
+    if x_entry > y_entry:
+        return entry, (-1 if dx > 0 else 1), 0
+    return entry, 0, (-1 if dy > 0 else 1)
+
+
+def sweep_bounds(x, y, dx, dy, half_width, half_height):
+    """这一段移动扫过的区域
+
+    返回:
+        tuple: (left, top, right, bottom)，可直接传给SpatialGrid.query
+    """
+    left = min(x, x + dx) - half_width
+    top = min(y, y + dy) - half_height
+    right = max(x, x + dx) + half_width
+    bottom = max(y, y + dy) + half_height
+    return int(left) - 1, int(top) - 1, int(right) + 2, int(bottom) + 2
+
+
+def reflect(dx, dy, normal_x, normal_y):
+    """按接触面的法线反弹速度
+
+    参数:
+        dx, dy: 速度
+        normal_x, normal_y: 接触面的法线（轴对齐）
+
+    返回:
+        tuple: 反弹后的(dx, dy)
+    """
+    if normal_x:
+        dx = -dx
+    if normal_y:
+        dy = -dy
+    return dx, dy
@@ -0,0 +1,339 @@
+from games.core.rng import session_rng
+from games.core.tetris_board import GRID_WIDTH, Playfield, row_masks
+
+# 颜色定义
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+BLUE = (0, 0, 255)
+CYAN = (0, 255, 255)
+MAGENTA = (255, 0, 255)
+YELLOW = (255, 255, 0)
+ORANGE = (255, 165, 0)
+
+# 合法的动作，None表示不操作
+ACTIONS = (None, 'left', 'right', 'rotate', 'down', 'drop')
+
+# 方块形状定义
+TETROMINOS = {
+    'I': [
+        [[0, 0, 0, 0],
+         [1, 1, 1, 1],
+         [0, 0, 0, 0],
+         [0, 0, 0, 0]],
+        CYAN
+    ],
+    'O': [
+        [[1, 1],
+         [1, 1]],
+        YELLOW
+    ],
+    'T': [
+        [[0, 1, 0],
+         [1, 1, 1],
+         [0, 0, 0]],
+        MAGENTA
+    ],
+    'S': [
+        [[0, 1, 1],
+         [1, 1, 0],
+         [0, 0, 0]],
+        GREEN
+    ],
+    'Z': [
+        [[1, 1, 0],
+         [0, 1, 1],
+         [0, 0, 0]],
+        RED
+    ],
+    'J': [
+        [[1, 0, 0],
+         [1, 1, 1],
+         [0, 0, 0]],
+        BLUE
+    ],
+    'L': [
+        [[0, 0, 1],
+         [1, 1, 1],
+         [0, 0, 0]],
+        ORANGE
+    ]
+}
+
+
+def _rotate_clockwise(blocks):
+    """把方块矩阵顺时针旋转90度"""
+    size = len(blocks)
+    return tuple(tuple(blocks[size - 1 - i][j] for i in range(size)) for j in range(len(blocks[0])))
+
+
+def _build_rotations():
+    """预计算每种方块的4个旋转状态
+
+    返回:
+        tuple: (矩阵表, 位掩码表, 格子偏移表, 列底部表)，均为{形状: 4个旋转状态的元组}。
+               格子偏移是矩阵中有方块的(x, y)坐标，列底部是每个有方块的列中
+               最下面一格的(x, y)坐标
+    """
+    shapes, masks, cells, bottoms = {}, {}, {}, {}
+    for name, (blocks, _) in TETROMINOS.items():
+        states = [tuple(tuple(row) for row in blocks)]
+        for _ in range(3):
+            states.append(_rotate_clockwise(states[-1]))
+        shapes[name] = tuple(states)
+        masks[name] = tuple(row_masks(state) for state in states)
+        cells[name] = tuple(tuple((x, y) for y, row in enumerate(state) for x, cell in enumerate(row) if cell)
+                            for state in states)
+        bottoms[name] = tuple(tuple((x, max(y for cx, y in state_cells if cx == x))
+                                    for x in sorted({cx for cx, _ in state_cells}))
+                              for state_cells in cells[name])
+    return shapes, masks, cells, bottoms
+
+
+SHAPES, SHAPE_MASKS, SHAPE_CELLS, SHAPE_BOTTOMS = _build_rotations()
+
+# 随机选择方块时的候选形状
+SHAPE_NAMES = tuple(TETROMINOS)
+
+# 超级旋转系统（SRS）的顺时针踢墙表：从旋转状态r转到r+1时依次尝试的(dx, dy)偏移，
+# 第一个不碰撞的偏移生效。y轴向下为正（SRS原表y轴向上，这里已取反）
+SRS_KICKS = (
+    ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),   # 0 -> R
+    ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),     # R -> 2
+    ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),      # 2 -> L
+    ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),  # L -> 0
+)
+SRS_KICKS_I = (
+    ((0, 0), (-2, 0), (1, 0), (-2, 1), (1, -2)),    # 0 -> R
+    ((0, 0), (-1, 0), (2, 0), (-1, -2), (2, 1)),    # R -> 2
+    ((0, 0), (2, 0), (-1, 0), (2, -1), (-1, 2)),    # 2 -> L
+    ((0, 0), (1, 0), (-2, 0), (1, 2), (-2, -1)),    # L -> 0
+)
+NO_KICKS = (((0, 0),),) * 4  # O方块旋转后形状不变，不需要踢墙
+
+
+def kick_table(shape):
+    """返回方块形状对应的踢墙表"""
+    if shape == 'I':
+        return SRS_KICKS_I
+    if shape == 'O':
+        return NO_KICKS
+    return SRS_KICKS
+
+
+class Tetromino:
+    """俄罗斯方块类
+
+    表示一个正在下落的方块。包含方块的形状、位置和旋转状态。
+
+    属性:
+        shape: 方块形状
+        color: 方块颜色
+        x: 方块在网格中的x坐标
+        y: 方块在网格中的y坐标
+        rotation: 当前旋转状态（0-3，顺时针递增）
+    """
+    __slots__ = ('shape', 'color', 'x', 'y', 'rotation')
+
+    def __init__(self, rng):
+        """初始化方块
+
+        随机选择一个方块形状并设置初始位置
+
+        参数:
+            rng: 随机数生成器
+        """
+        self.shape = rng.choice(SHAPE_NAMES)
+        self.color = TETROMINOS[self.shape][1]
+        self.rotation = 0
+        self.x = GRID_WIDTH // 2 - len(self.blocks[0]) // 2
+        self.y = 0
+
+    @property
+    def blocks(self):
+        """当前旋转状态的方块矩阵（预计算的元组，不要修改）"""
+        return SHAPES[self.shape][self.rotation]
+
+    @property
+    def masks(self):
+        """当前旋转状态每行的位掩码"""
+        return SHAPE_MASKS[self.shape][self.rotation]
+
+    @property
+    def cells(self):
+        """当前旋转状态中有方块的(x, y)坐标"""
+        return SHAPE_CELLS[self.shape][self.rotation]
+
+    @property
+    def bottoms(self):
+        """当前旋转状态每个有方块的列中最下面一格的(x, y)坐标"""
+        return SHAPE_BOTTOMS[self.shape][self.rotation]
+
+    def rotate(self):
+        """旋转方块
+
+        返回:
+            tuple: 顺时针旋转90度后的方块矩阵（查表得到，不分配新列表）
+        """
+        return SHAPES[self.shape][(self.rotation + 1) % 4]
+
+
+class TetrisCore:
+    """俄罗斯方块游戏逻辑核心
+
+    不依赖pygame和显示窗口，可在无显示环境下批量模拟对局。
+
+    属性:
+        field: 位棋盘场地（见tetris_board），碰撞检测和消行都在位掩码上进行
+        grid: 游戏网格，None表示空格，否则为方块颜色（即field.colors）
+        current_piece: 当前下落的方块
+        next_piece: 下一个方块
+        score: 得分
+        level: 当前等级
+        game_over: 游戏是否结束
+        fall_time: 距离上次自动下落经过的时间（毫秒）
+        fall_speed: 自动下落间隔（毫秒）
+        seed: 这一局的随机种子
+        rng: 随机数生成器（决定方块序列）
+    """
+    def __init__(self, seed=None, rng=None):
+        """初始化游戏状态
+
+        参数:
+            seed: 随机种子，None表示新生成一个（记录在seed属性中）
+            rng: 随机数生成器（见games.core.rng），给出时不使用seed创建
+        """
+        self.seed, self.rng = session_rng(seed, rng)
+        self.field = Playfield()
+        self.grid = self.field.colors
+        self.current_piece = Tetromino(self.rng)
+        self.next_piece = Tetromino(self.rng)
+        self.score = 0
+        self.level = 1
+        self.game_over = False
+        self.fall_time = 0
+        self.fall_speed = 1000  # 初始下落速度（毫秒）
+
+    def move_piece(self, dx):
+        """移动方块
+
+        水平移动当前方块
+
+        参数:
+            dx: 移动的方向（-1为左，1为右）
+        """
+        self.current_piece.x += dx
+        if not self.is_valid_move():
+            self.current_piece.x -= dx
+
+    def rotate_piece(self):
+        """旋转方块
+
+        按超级旋转系统（SRS）顺时针旋转当前方块：依次尝试踢墙表中的偏移，
+        第一个有效的位置生效；全部无效时取消旋转
+
+        返回:
+            bool: True表示旋转成功
+        """
+        piece = self.current_piece
+        rotation = (piece.rotation + 1) % 4
+        masks = SHAPE_MASKS[piece.shape][rotation]
+        for dx, dy in kick_table(piece.shape)[piece.rotation]:
+            if not self.field.collides(masks, piece.x + dx, piece.y + dy):
+                piece.rotation = rotation
+                piece.x += dx
+                piece.y += dy
+                return True
+        return False
+
+    def move_piece_down(self):
+        """向下移动方块
+
+        将当前方块向下移动一格
+        """
+        self.current_piece.y += 1
+        if not self.is_valid_move():
+            self.current_piece.y -= 1
+            self.place_piece()
+
+    def drop_piece(self):
+        """快速下落
+
+        将当前方块直接下落到底部
+        """
+        self.current_piece.y = self.ghost_y()
+        self.place_piece()
+
+    def ghost_y(self):
+        """计算当前方块直接下落后所在的行（用于快速下落和落点预览）
+
+        返回:
+            int: 方块矩阵左上角落地后的行坐标
+        """
+        piece = self.current_piece
+        return self.field.drop_row(piece.masks, piece.bottoms, piece.x, piece.y)
+
+    def is_valid_move(self):
+        """检查移动是否有效
+
+        检查当前方块的位置是否合法
+
+        返回:
+            bool: 如果移动有效返回True，否则返回False
+        """
+        piece = self.current_piece
+        return not self.field.collides(piece.masks, piece.x, piece.y)
+
+    def place_piece(self):
+        """放置方块
+
+        将当前方块固定到网格中，检查是否有可以消除的行
+        """
+        piece = self.current_piece
+        if not self.field.lock(piece.masks, piece.x, piece.y, piece.color):
+            self.game_over = True
+            return
+
+        # 消除完整的行
+        lines_cleared = self.field.clear_lines()
+
+        # 更新分数
+        if lines_cleared > 0:
+            self.score += [100, 300, 500, 800][lines_cleared - 1] * self.level
+            self.level = self.score // 5000 + 1
+            self.fall_speed = max(100, 1000 - (self.level - 1) * 100)
+
+        # 生成新方块
+        self.current_piece = self.next_piece
+        self.next_piece = Tetromino(self.rng)
+
+        # 新方块一出现就无处可放，游戏结束
+        if not self.is_valid_move():
+            self.game_over = True
+
+    def step(self, action=None, dt=0):
+        """执行一步
+
+        先执行玩家动作，再按经过的时间处理自动下落
+
+        参数:
+            action: 玩家动作，取值见ACTIONS
+            dt: 距离上一步经过的时间（毫秒）
+        """
+        if self.game_over:
+            return
+        if action == 'left':
+            self.move_piece(-1)
+        elif action == 'right':
+            self.move_piece(1)
+        elif action == 'rotate':
+            self.rotate_piece()
+        elif action == 'down':
+            self.move_piece_down()
+        elif action == 'drop':
+            self.drop_piece()
+
+        # 自动下落
+        self.fall_time += dt
+        while self.fall_time >= self.fall_speed and not self.game_over:
+            self.fall_time -= self.fall_speed
+            self.move_piece_down()
@@ -0,0 +1,213 @@
+"""俄罗斯方块自动玩家
+
+枚举当前方块所有的(旋转状态, 列)落点，对每个落点再枚举下一个方块的所有落点，
+用启发式函数给最终的场地打分，选出两步总分最高的当前落点。
+
+落点按“从场地上方直接落下”计算：由每列的高度直接得到落地的行，
+场地用tetris_board的行位掩码表示，复制和消行都很便宜，
+一次完整的两步搜索（约一千个落点）只需要几十毫秒。
+"""
+from games.core.tetris_board import GRID_WIDTH, GRID_HEIGHT, PADDING, EMPTY_ROW, FULL_ROW, column_heights
+from games.core.tetris import SHAPE_MASKS, SHAPE_CELLS, SHAPE_BOTTOMS
+
+# 启发式权重：总高度、消行数、空洞数、相邻列高度差之和
+HEIGHT_WEIGHT = -0.510066
+LINES_WEIGHT = 0.760666
+HOLES_WEIGHT = -0.35663
+BUMPINESS_WEIGHT = -0.184483
+
+
+def _build_placements():
+    """预计算每种方块每个旋转状态可以放下的列范围
+
+    返回:
+        dict: {形状: [(旋转状态, 最小列, 最大列), ...]}，O方块只有一个旋转状态，
+              I、S、Z方块的4个旋转状态两两重复，只保留形状不同的状态
+    """
+    placements = {}
+    for shape, states in SHAPE_CELLS.items():
+        seen = set()
+        placements[shape] = []
+        for rotation, cells in enumerate(states):
+            min_x = min(x for x, _ in cells)
+            max_x = max(x for x, _ in cells)
+            min_y = min(y for _, y in cells)
+            # 平移后相同的形状只需要搜索一次
+            key = frozenset((x - min_x, y - min_y) for x, y in cells)
+            if key in seen:
+                continue
+            seen.add(key)
+            placements[shape].append((rotation, -min_x, GRID_WIDTH - 1 - max_x))
+    return placements
+
+
+PLACEMENTS = _build_placements()
+
+
+def evaluate(rows, lines):
+    """给场地打分
+
+    参数:
+        rows: 每一行的位掩码
+        lines: 到达该场地一共消除的行数
+
+    返回:
+        float: 分数，越大越好
+    """
+    heights = [0] * GRID_WIDTH
+    holes = 0
+    covered = 0
+    for y, row in enumerate(rows):
+        filled = row ^ EMPTY_ROW
+        # 上方已经有方块、本行却是空格的位置就是空洞
+        holes += bin(covered & ~filled).count('1')
+        new = filled & ~covered
+        if new:
+            covered |= new
+            bits = new >> PADDING
+            column = 0
+            while bits:
+                if bits & 1:
+                    heights[column] = GRID_HEIGHT - y
+                bits >>= 1
+                column += 1
+    bumpiness = 0
+    for column in range(GRID_WIDTH - 1):
+        bumpiness += abs(heights[column] - heights[column + 1])
+    return (HEIGHT_WEIGHT * sum(heights) + LINES_WEIGHT * lines +
+            HOLES_WEIGHT * holes + BUMPINESS_WEIGHT * bumpiness)
+
+
+def drop(rows, heights, shape, rotation, x):
+    """把方块从场地上方落到指定列，返回新的场地
+
+    参数:
+        rows: 每一行的位掩码
+        heights: 每列最上面一个方块所在的行（见column_heights）
+        shape: 方块形状
+        rotation: 旋转状态
+        x: 方块矩阵左上角的列
+
+    返回:
+        tuple: (新的行位掩码列表, 消除的行数)；方块露出场地顶部时返回None
+    """
+    y = GRID_HEIGHT
+    for column, bottom in SHAPE_BOTTOMS[shape][rotation]:
+        row = heights[x + column] - bottom - 1
+        if row < y:
+            y = row
+    masks = SHAPE_MASKS[shape][rotation]
+    result = rows[:]
+    shift = x + PADDING
+    for i, mask in enumerate(masks):
+        if mask:
+            if y + i < 0:
+                return None
+            result[y + i] |= mask << shift
+    keep = [row for row in result if row != FULL_ROW]
+    cleared = GRID_HEIGHT - len(keep)
+    if cleared:
+        result = [EMPTY_ROW] * cleared + keep
+    return result, cleared
+
+
+class TetrisAI:
+    """俄罗斯方块自动玩家
+
+    属性:
+        lookahead: 是否同时考虑下一个方块
+        evaluated: 上一次搜索评估的场地数量
+    """
+    def __init__(self, lookahead=True):
+        """初始化自动玩家
+
+        参数:
+            lookahead: 是否同时考虑下一个方块
+        """
+        self.lookahead = lookahead
+        self.evaluated = 0
+        self._piece = None
+        self._target = None
+        self._last_state = None
+
+    def best_placement(self, rows, shape, next_shape=None):
+        """为当前方块选择落点
+
+        参数:
+            rows: 场地的行位掩码（Playfield.rows）
+            shape: 当前方块形状
+            next_shape: 下一个方块形状，None表示不向前看
+
+        返回:
+            tuple: (旋转状态, 方块矩阵左上角的列)；没有可以放下的位置时返回None
+        """
+        self.evaluated = 0
+        heights = column_heights(rows)
+        best = None
+        best_score = None
+        for rotation, min_x, max_x in PLACEMENTS[shape]:
+            for x in range(min_x, max_x + 1):
+                result = drop(rows, heights, shape, rotation, x)
+                if result is None:
+                    continue
+                board, lines = result
+                if self.lookahead and next_shape is not None:
+                    score = self._best_score(board, next_shape, lines)
+                    if score is None:
+                        continue
+                else:
+                    score = evaluate(board, lines)
+                    self.evaluated += 1
+                if best_score is None or score > best_score:
+                    best_score = score
+                    best = (rotation, x)
+        return best
+
+    def _best_score(self, rows, shape, lines):
+        """下一个方块所有落点中的最高分"""
+        heights = column_heights(rows)
+        best_score = None
+        for rotation, min_x, max_x in PLACEMENTS[shape]:
+            for x in range(min_x, max_x + 1):
+                result = drop(rows, heights, shape, rotation, x)
+                if result is None:
+                    continue
+                board, more = result
+                score = evaluate(board, lines + more)
+                self.evaluated += 1
+                if best_score is None or score > best_score:
+                    best_score = score
+        return best_score
+
+    def next_action(self, core):
+        """为TetrisCore选择下一步动作，逐步把当前方块移到选定的落点
+
+        每出现一个新方块时搜索一次落点，之后依次旋转、左右移动，最后快速下落。
+        上一步动作没有改变方块位置（被挡住）时直接快速下落。
+
+        参数:
+            core: TetrisCore对象
+
+        返回:
+            str: 动作，取值见tetris.ACTIONS
+        """
+        piece = core.current_piece
+        if piece is not self._piece:
+            self._piece = piece
+            self._last_state = None
+            self._target = self.best_placement(core.field.rows, piece.shape, core.next_piece.shape)
+        if self._target is None:
+            return 'drop'
+
+        state = (piece.rotation, piece.x, piece.y)
+        if state == self._last_state:
+            return 'drop'
+        self._last_state = state
+        rotation, x = self._target
+        if piece.rotation != rotation:
+            return 'rotate'
+        if piece.x < x:
+            return 'right'
+        if piece.x > x:
+            return 'left'
+        return 'drop'
@@ -0,0 +1,172 @@
+"""俄罗斯方块位棋盘场地
+
+每一行用一个整数位掩码表示：第PADDING + x位为1表示第x列有方块。
+内部的GRID_WIDTH位两侧各留PADDING位墙壁，墙壁位始终为1，
+这样方块左右出界和与已有方块重叠都可以用一次与运算检查。
+另外保存一份与位掩码并行的颜色数组，供渲染使用。
+
+- 碰撞检测：方块每一行的掩码左移后与场地的行掩码做与运算
+- 满行检测：行掩码等于FULL_ROW
+- 消行：删除满行后在顶部补空行，只需列表切片
+- 落点：按每列的高度直接算出方块下落后所在的行，不需要逐行试探
+"""
+GRID_WIDTH = 10
+GRID_HEIGHT = 20
+
+# 两侧墙壁的宽度（方块矩阵最宽4格，向左最多伸出3格）
+PADDING = 4
+
+# 空行：只有墙壁位为1
+EMPTY_ROW = ((1 << (GRID_WIDTH + 2 * PADDING)) - 1) ^ (((1 << GRID_WIDTH) - 1) << PADDING)
+
+# 满行：墙壁和内部全部为1
+FULL_ROW = (1 << (GRID_WIDTH + 2 * PADDING)) - 1
+
+
+def column_heights(rows):
+    """根据行掩码计算每列最上面一个方块所在的行
+
+    参数:
+        rows: 每一行的位掩码，rows[0]为最上面一行
+
+    返回:
+        list: 每列最上面一个方块所在的行，空列为GRID_HEIGHT
+    """
+    heights = [GRID_HEIGHT] * GRID_WIDTH
+    covered = 0
+    for y, row in enumerate(rows):
+        new = (row ^ EMPTY_ROW) & ~covered
+        if new:
+            covered |= new
+            bits = new >> PADDING
+            column = 0
+            while bits:
+                if bits & 1:
+                    heights[column] = y
+                bits >>= 1
+                column += 1
+    return heights
+
+
+def row_masks(blocks):
+    """把方块矩阵转换为每行的位掩码
+
+    参数:
+        blocks: 方块矩阵（二维列表，1表示有方块）
+
+    返回:
+        tuple: 每一行的位掩码，第x位表示矩阵第x列
+    """
+    return tuple(sum(1 << x for x, cell in enumerate(row) if cell) for row in blocks)
+
+
+class Playfield:
+    """位棋盘场地
+
+    属性:
+        rows: 每一行的位掩码，rows[0]为最上面一行
+        colors: 与rows并行的颜色数组，None表示空格，否则为方块颜色
+        heights: 每列最上面一个方块所在的行，空列为GRID_HEIGHT
+    """
+    def __init__(self):
+        """创建空场地"""
+        self.rows = [EMPTY_ROW] * GRID_HEIGHT
+        self.colors = [[None] * GRID_WIDTH for _ in range(GRID_HEIGHT)]
+        self.heights = [GRID_HEIGHT] * GRID_WIDTH
+
+    def collides(self, masks, x, y):
+        """检查方块放在指定位置时是否出界或与已有方块重叠
+
+        参数:
+            masks: 方块每行的位掩码（见row_masks）
+            x: 方块矩阵左上角的列
+            y: 方块矩阵左上角的行
+
+        返回:
+            bool: True表示位置无效
+        """
+        shift = x + PADDING
+        rows = self.rows
+        for i, mask in enumerate(masks):
+            if not mask:
+                continue
+            row = y + i
+            if row >= GRID_HEIGHT:
+                return True
+            # 场地上方没有已有方块，只检查墙壁
+            if (rows[row] if row >= 0 else EMPTY_ROW) & (mask << shift):
+                return True
+        return False
+
+    def lock(self, masks, x, y, color):
+        """把方块固定到场地中
+
+        参数:
+            masks: 方块每行的位掩码
+            x: 方块矩阵左上角的列
+            y: 方块矩阵左上角的行
+            color: 方块颜色
+
+        返回:
+            bool: False表示方块有一部分在场地上方（游戏结束），此时只固定了上方之前的行
+        """
+        shift = x + PADDING
+        for i, mask in enumerate(masks):
+            if not mask:
+                continue
+            row = y + i
+            if row < 0:
+                return False
+            self.rows[row] |= mask << shift
+            colors = self.colors[row]
+            column = x
+            while mask:
+                if mask & 1:
+                    colors[column] = color
+                    if row < self.heights[column]:
+                        self.heights[column] = row
+                mask >>= 1
+                column += 1
+        return True
+
+    def clear_lines(self):
+        """消除所有满行，上面的行整体下移
+
+        返回:
+            int: 消除的行数
+        """
+        keep = [y for y in range(GRID_HEIGHT) if self.rows[y] != FULL_ROW]
+        cleared = GRID_HEIGHT - len(keep)
+        if cleared:
+            # 原地修改，保持外部对colors的引用有效
+            self.rows[:] = [EMPTY_ROW] * cleared + [self.rows[y] for y in keep]
+            self.colors[:] = [[None] * GRID_WIDTH for _ in range(cleared)] + [self.colors[y] for y in keep]
+            self.heights[:] = column_heights(self.rows)
+        return cleared
+
+    def drop_row(self, masks, bottoms, x, y):
+        """计算方块从指定位置直接下落后所在的行
+
+        方块在每一列的最下一格都在该列最高方块之上时，落点由列高度直接算出；
+        方块已经钻到某列的悬空方块下面时，改为逐行检查
+
+        参数:
+            masks: 方块每行的位掩码
+            bottoms: 方块每个有方块的列中最下面一格的(x, y)坐标
+            x: 方块矩阵左上角的列
+            y: 方块矩阵左上角当前的行
+
+        返回:
+            int: 落地后方块矩阵左上角的行
+        """
+        heights = self.heights
+        landing = GRID_HEIGHT
+        for column, bottom in bottoms:
+            row = heights[x + column] - bottom - 1
+            if row < landing:
+                landing = row
+        if landing >= y:
+            return landing
+        while not self.collides(masks, x, y + 1):
+            y += 1
+        return y
@@ -1,6 +1,12 @@
 import pygame
 import sys
-import random
+from games.core.game2048 import Game2048Core, GRID_SIZE, plan_moves
+from games.core.game2048_ai import ExpectimaxPlayer
+from games.core.search_worker import SearchWorker
+from games.core.game2048_tables import encode_board
+from games.loop import GameLoop
+from games.render import DirtyRenderer, overlay_surface
+from games.text import get_font, render_text
 
 # 初始化 Pygame
 pygame.init()
@@ -14,10 +20,17 @@
 # 游戏窗口设置
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
-GRID_SIZE = 4  # 4x4的网格
 CELL_SIZE = 100  # 每个格子的大小
 CELL_MARGIN = 10  # 格子之间的间距
 
+# 自动玩家
+AI_MOVE_EVENT = pygame.USEREVENT + 1  # 后台搜索完成时投递的事件
+AI_TIME_BUDGET = 0.05  # 每步搜索的时间预算（秒）
+DIRECTION_ARROWS = {'up': '↑', 'down': '↓', 'left': '←', 'right': '→'}
+
+# 棋盘底色
+BOARD_COLOR = (187, 173, 160)
+
 # 定义数字对应的颜色
 TILE_COLORS = {
     0: (205, 193, 180),    # 空格子颜色
@@ -33,11 +46,54 @@
     1024: (237, 197, 63),
     2048: (237, 194, 46),
 }
+DEFAULT_TILE_COLOR = (237, 194, 46)  # 更大数字的颜色
+NUMBER_FONT = ('Arial', 48, True)  # 数字字体(字体名, 字号, 粗体)
+
+# 动画设置（以逻辑步数计，逻辑频率见games.loop）
+SLIDE_TICKS = 6  # 数字滑到终点的步数
+POP_TICKS = 6  # 合并后放大再恢复、新数字从小变大的步数
+ANIMATION_TICKS = SLIDE_TICKS + POP_TICKS
+POP_SCALE = 0.2  # 合并时最多放大的比例
+
+# 画好的格子，键为(数值, 边长)
+_tile_cache = {}
+
+
+def tile_surface(value, size=CELL_SIZE):
+    """取得一个格子的图像（圆角底色加居中的数字），每种数值和边长只画一次
+
+    非标准边长（动画中的缩放）由标准边长的图像平滑缩放得到。
+
+    参数:
+        value: 格子的数值，0表示空格子
+        size: 格子边长
+
+    返回:
+        pygame.Surface: 格子图像（圆角外透明），由所有调用者共用
+    """
+    key = (value, size)
+    surface = _tile_cache.get(key)
+    if surface is not None:
+        return surface
+    if size == CELL_SIZE:
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        rect = surface.get_rect()
+        pygame.draw.rect(surface, TILE_COLORS.get(value, DEFAULT_TILE_COLOR), rect, border_radius=5)
+        if value != 0:
+            text_color = WHITE if value > 4 else BLACK
+            text = render_text(get_font(*NUMBER_FONT), str(value), text_color)
+            # 数字太宽时超出格子的部分被裁掉
+            surface.blit(text, text.get_rect(center=rect.center))
+    else:
+        surface = pygame.transform.smoothscale(tile_surface(value), (size, size))
+    _tile_cache[key] = surface
+    return surface
+
 
-class Game:
+class Game(Game2048Core):
     """2048游戏类
     
-    控制游戏的主要逻辑，包括初始化、更新和渲染
+    在Game2048Core的游戏逻辑之上负责窗口、输入和渲染
     
     属性:
         window: pygame显示窗口
@@ -46,27 +102,45 @@ class Game:
         game_over: 游戏是否结束
         paused: 游戏是否暂停
         show_pause_menu: 是否显示暂停菜单
+        autoplay: 是否由自动玩家下棋
+        hint: 自动玩家建议的移动方向，None表示没有提示
+        ai_pending: 是否有尚未返回的后台搜索请求
+        loop: 固定步长游戏循环
+        renderer: 脏矩形渲染器，棋盘和格子画在背景层上
+        painted: 背景层上每个格子当前画的数值
+        moves: 正在播放的动画中要移动或合并的数字，见plan_moves
+        spawned: 动画结束时出现的新数字所在的(行, 列)
+        animation_tick: 动画已经播放的逻辑步数，不小于ANIMATION_TICKS表示没有动画
     """
-    def __init__(self):
+    def __init__(self, seed=None):
         """初始化游戏
         
         创建游戏窗口，初始化游戏状态
+
+        参数:
+            seed: 随机种子，None表示新生成一个；同样的种子和输入得到同样的对局
         """
         self.window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption('2048')
-        self.grid = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
-        self.score = 0
-        self.game_over = False
         self.paused = False
         self.show_pause_menu = False
-        self.font = pygame.font.SysFont('SimHei', 36)
-        self.number_font = pygame.font.SysFont('Arial', 48, bold=True)
+        self.font = get_font()
         
         # 计算游戏区域的起始位置（居中显示）
         self.board_width = GRID_SIZE * CELL_SIZE + (GRID_SIZE + 1) * CELL_MARGIN
         self.board_height = self.board_width
         self.board_start_x = (WINDOW_WIDTH - self.board_width) // 2
         self.board_start_y = (WINDOW_HEIGHT - self.board_height) // 2
+
+        # 棋盘底色只画一次，格子在数值改变时才重画
+        self.renderer = DirtyRenderer(self.window, GRAY)
+        board_rect = pygame.Rect(self.board_start_x, self.board_start_y,
+                                 self.board_width, self.board_height)
+        pygame.draw.rect(self.renderer.background, BOARD_COLOR, board_rect)
+        self.painted = [[None] * GRID_SIZE for _ in range(GRID_SIZE)]
+        self.moves = []
+        self.spawned = None
+        self.animation_tick = ANIMATION_TICKS
         
         # 初始化暂停菜单按钮
         button_width = 200
@@ -75,168 +149,212 @@ def __init__(self):
         self.continue_button = pygame.Rect(button_x, WINDOW_HEIGHT // 2 - 60, button_width, button_height)
         self.menu_button = pygame.Rect(button_x, WINDOW_HEIGHT // 2 + 10, button_width, button_height)
         
-        # 添加两个初始数字
-        self.add_new_tile()
-        self.add_new_tile()
+        # 初始化棋盘并添加两个初始数字
+        Game2048Core.__init__(self, use_tables=True, seed=seed)
+        
+        # 自动玩家在后台线程中搜索，结果以AI_MOVE_EVENT事件返回
+        self.autoplay = False
+        self.hint = None
+        self.hint_requested = False
+        self.ai_pending = False
+        self.ai_worker = SearchWorker(ExpectimaxPlayer(time_budget=AI_TIME_BUDGET), self.post_ai_move)
+        self.loop = GameLoop()
     
-    def add_new_tile(self):
-        """在空格子中随机添加一个新数字（2或4）"""
-        empty_cells = [(i, j) for i in range(GRID_SIZE) for j in range(GRID_SIZE) if self.grid[i][j] == 0]
-        if empty_cells:
-            i, j = random.choice(empty_cells)
-            self.grid[i][j] = 2 if random.random() < 0.9 else 4
+    def post_ai_move(self, board, direction):
+        """后台搜索完成的回调（在搜索线程中调用），把结果投递到事件队列"""
+        pygame.event.post(pygame.event.Event(AI_MOVE_EVENT, board=board, direction=direction))
     
-    def move(self, direction):
-        """移动并合并数字
+    def handle_ai_move(self, event):
+        """处理后台搜索返回的移动方向
         
         参数:
-            direction: 移动方向，'up', 'down', 'left', 'right'
-        
-        返回:
-            bool: True表示有移动或合并发生，False表示没有变化
+            event: AI_MOVE_EVENT事件
         """
-        moved = False
-        if direction in ['up', 'down']:
-            for j in range(GRID_SIZE):
-                # 获取当前列的非零数字
-                column = [self.grid[i][j] for i in range(GRID_SIZE)]
-                column = [x for x in column if x != 0]
-                
-                # 合并相同的数字
-                i = 0
-                while i < len(column) - 1:
-                    if column[i] == column[i + 1]:
-                        column[i] *= 2
-                        self.score += column[i]
-                        column.pop(i + 1)
-                        moved = True
-                    i += 1
-                
-                # 填充零
-                while len(column) < GRID_SIZE:
-                    if direction == 'up':
-                        column.append(0)
-                    else:
-                        column.insert(0, 0)
-                
-                # 更新网格
-                for i in range(GRID_SIZE):
-                    if self.grid[i][j] != column[i]:
-                        moved = True
-                    self.grid[i][j] = column[i]
-        
-        else:  # left or right
-            for i in range(GRID_SIZE):
-                # 获取当前行的非零数字
-                row = [self.grid[i][j] for j in range(GRID_SIZE)]
-                row = [x for x in row if x != 0]
-                
-                # 合并相同的数字
-                j = 0
-                while j < len(row) - 1:
-                    if row[j] == row[j + 1]:
-                        row[j] *= 2
-                        self.score += row[j]
-                        row.pop(j + 1)
-                        moved = True
-                    j += 1
-                
-                # 填充零
-                while len(row) < GRID_SIZE:
-                    if direction == 'left':
-                        row.append(0)
-                    else:
-                        row.insert(0, 0)
-                
-                # 更新网格
-                for j in range(GRID_SIZE):
-                    if self.grid[i][j] != row[j]:
-                        moved = True
-                    self.grid[i][j] = row[j]
-        
+        self.ai_pending = False
+        if event.board != encode_board(self.grid) or self.paused or self.game_over:
+            return  # 局面已经变化，结果作废
+        if self.autoplay:
+            self.step(event.direction)
+        elif self.hint_requested:
+            self.hint = event.direction
+            self.hint_requested = False
+    
+    def request_ai_move(self):
+        """需要时向后台线程请求搜索当前局面"""
+        if self.ai_pending or self.paused or self.game_over:
+            return
+        if self.autoplay or self.hint_requested:
+            self.ai_worker.request(encode_board(self.grid))
+            self.ai_pending = True
+    
+    def step(self, action):
+        """执行一步动作，棋盘变化后清除旧的提示并开始播放动画"""
+        old_grid = [row[:] for row in self.grid]
+        moved = Game2048Core.step(self, action)
+        if moved:
+            self.hint = None
+            self.start_animation(old_grid, action)
         return moved
 
-    def check_game_over(self):
-        """检查游戏是否结束
-        
-        返回:
-            bool: True表示游戏结束，False表示可以继续
+    def start_animation(self, old_grid, direction):
+        """开始播放一次移动的滑动、合并和新数字出现的动画（上一次的动画直接结束）
+
+        参数:
+            old_grid: 移动前的网格
+            direction: 移动方向
         """
-        # 检查是否有空格子
+        moves = plan_moves(old_grid, direction)
+        targets = {target for _, target, _, _ in moves}
+        # 没有移动也没有合并的数字留在背景层上，不参与动画
+        self.moves = [move for move in moves if move[0] != move[1] or move[3]]
+        self.spawned = None
         for i in range(GRID_SIZE):
             for j in range(GRID_SIZE):
-                if self.grid[i][j] == 0:
-                    return False
-        
-        # 检查是否有相邻的相同数字
+                if self.grid[i][j] and (i, j) not in targets:
+                    self.spawned = (i, j)
+        self.animation_tick = 0
+
+    def update(self):
+        """推进一个逻辑步长的动画"""
+        if self.animation_tick < ANIMATION_TICKS:
+            self.animation_tick += 1
+
+    def cell_position(self, row, col):
+        """格子左上角在窗口中的坐标"""
+        return (self.board_start_x + CELL_MARGIN * (col + 1) + CELL_SIZE * col,
+                self.board_start_y + CELL_MARGIN * (row + 1) + CELL_SIZE * row)
+
+    def background_grid(self):
+        """背景层上应该显示的网格：动画中参与移动的数字和新数字的位置先显示为空格子
+
+        返回:
+            list: 网格
+        """
+        if self.animation_tick >= ANIMATION_TICKS:
+            return self.grid
+        grid = [row[:] for row in self.grid]
+        for _, (i, j), _, _ in self.moves:
+            grid[i][j] = 0
+        if self.spawned:
+            grid[self.spawned[0]][self.spawned[1]] = 0
+        return grid
+    
+    def restart(self):
+        """重新开始游戏，停止旧的搜索线程"""
+        self.ai_worker.stop()
+        self.__init__()
+    
+    def draw_tiles(self):
+        """把数值改变了的格子画到背景层上"""
+        background = self.renderer.background
+        grid = self.background_grid()
         for i in range(GRID_SIZE):
             for j in range(GRID_SIZE):
-                current = self.grid[i][j]
-                # 检查右边
-                if j < GRID_SIZE - 1 and current == self.grid[i][j + 1]:
-                    return False
-                # 检查下边
-                if i < GRID_SIZE - 1 and current == self.grid[i + 1][j]:
-                    return False
-        
-        return True
-    
-    def draw(self):
+                value = grid[i][j]
+                if self.painted[i][j] == value:
+                    continue
+                self.painted[i][j] = value
+                # 先用棋盘颜色盖住圆角外的旧颜色
+                cell_rect = pygame.Rect(self.cell_position(i, j), (CELL_SIZE, CELL_SIZE))
+                pygame.draw.rect(background, BOARD_COLOR, cell_rect)
+                background.blit(tile_surface(value), cell_rect)
+                self.renderer.repaint(cell_rect)
+
+    def draw_tile(self, value, position, size=CELL_SIZE):
+        """在窗口上画一个动画中的格子
+
+        参数:
+            value: 数值
+            position: 标准大小的格子左上角坐标
+            size: 格子边长，缩放时保持中心不变
+        """
+        if size <= 0:
+            return
+        offset = (CELL_SIZE - size) / 2
+        self.renderer.add(self.window.blit(tile_surface(value, size),
+                                           (round(position[0] + offset), round(position[1] + offset))))
+
+    def draw_animation(self, alpha):
+        """绘制滑动、合并和新数字出现的动画
+
+        参数:
+            alpha: 插值系数，在两次逻辑更新之间平滑动画
+        """
+        progress = min(self.animation_tick + alpha, ANIMATION_TICKS)
+        if progress < SLIDE_TICKS:
+            # 滑动：所有数字以移动前的数值从起点滑向终点
+            t = progress / SLIDE_TICKS
+            for source, target, value, _ in self.moves:
+                (x0, y0), (x1, y1) = self.cell_position(*source), self.cell_position(*target)
+                self.draw_tile(value, (x0 + (x1 - x0) * t, y0 + (y1 - y0) * t))
+            return
+
+        # 合并后的数字先放大再恢复，新数字从小变大
+        t = (progress - SLIDE_TICKS) / POP_TICKS
+        merged = set()
+        for _, target, value, is_merged in self.moves:
+            if not is_merged:
+                self.draw_tile(value, self.cell_position(*target))
+            elif target not in merged:
+                merged.add(target)
+        pop_size = round(CELL_SIZE * (1 + POP_SCALE * (1 - abs(2 * t - 1))))
+        for i, j in merged:
+            self.draw_tile(self.grid[i][j], self.cell_position(i, j), pop_size)
+        if self.spawned:
+            i, j = self.spawned
+            self.draw_tile(self.grid[i][j], self.cell_position(i, j), round(CELL_SIZE * t))
+
+    def draw(self, alpha=1.0):
         """绘制游戏画面
         
-        绘制游戏网格、数字和得分信息
+        绘制游戏网格、数字、动画和得分信息
+
+        参数:
+            alpha: 插值系数，用于平滑动画
         """
-        self.window.fill(GRAY)
-        
-        # 绘制游戏区域背景
-        board_rect = pygame.Rect(self.board_start_x, self.board_start_y,
-                               self.board_width, self.board_height)
-        pygame.draw.rect(self.window, (187, 173, 160), board_rect)
-        
-        # 绘制每个格子
-        for i in range(GRID_SIZE):
-            for j in range(GRID_SIZE):
-                value = self.grid[i][j]
-                x = self.board_start_x + CELL_MARGIN * (j + 1) + CELL_SIZE * j
-                y = self.board_start_y + CELL_MARGIN * (i + 1) + CELL_SIZE * i
-                
-                # 绘制格子背景
-                cell_rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
-                color = TILE_COLORS.get(value, (237, 194, 46))  # 使用默认颜色
-                pygame.draw.rect(self.window, color, cell_rect, border_radius=5)
-                
-                # 绘制数字
-                if value != 0:
-                    text_color = WHITE if value > 4 else BLACK
-                    text = self.number_font.render(str(value), True, text_color)
-                    text_rect = text.get_rect(center=(x + CELL_SIZE // 2, y + CELL_SIZE // 2))
-                    self.window.blit(text, text_rect)
+        renderer = self.renderer
+        # 2048只在输入和动画时改变，没有变化时画面不变
+        animating = self.animation_tick < ANIMATION_TICKS
+        if renderer.skip(None if animating else
+                         (tuple(map(tuple, self.grid)), self.score, self.autoplay, self.hint,
+                          self.game_over, self.show_pause_menu)):
+            return
+        self.draw_tiles()
+        renderer.begin()  # 擦掉上一帧画的文字和动画，并提交背景层上改变的格子
+        if animating:
+            self.draw_animation(alpha)
         
         # 显示得分
-        score_text = self.font.render(f'得分: {self.score}', True, WHITE)
-        self.window.blit(score_text, (10, 10))
+        score_text = render_text(self.font, f'得分: {self.score}', WHITE)
+        renderer.add(self.window.blit(score_text, (10, 10)))
+        
+        # 显示自动模式和提示
+        if self.autoplay:
+            ai_text = render_text(self.font, '自动', WHITE)
+            renderer.add(self.window.blit(ai_text, (10, 50)))
+        elif self.hint:
+            hint_text = render_text(self.font, f'提示: {DIRECTION_ARROWS[self.hint]}', WHITE)
+            renderer.add(self.window.blit(hint_text, (10, 50)))
         
         # 显示游戏结束信息
         if self.game_over:
-            game_over_text = self.font.render('游戏结束! 按R重新开始', True, WHITE)
+            game_over_text = render_text(self.font, '游戏结束! 按R重新开始', WHITE)
             text_rect = game_over_text.get_rect(center=(WINDOW_WIDTH // 2, 30))
-            self.window.blit(game_over_text, text_rect)
+            renderer.add(self.window.blit(game_over_text, text_rect))
         
         # 绘制暂停菜单
         if self.show_pause_menu:
-            # 创建半透明遮罩层
-            overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-            overlay.fill(GRAY)
-            overlay.set_alpha(128)
-            self.window.blit(overlay, (0, 0))
+            # 半透明遮罩层（共用同一张Surface）
+            overlay = overlay_surface((WINDOW_WIDTH, WINDOW_HEIGHT), GRAY, 128)
+            renderer.add(self.window.blit(overlay, (0, 0)))
             
             # 绘制暂停菜单按钮
             pygame.draw.rect(self.window, BLUE, self.continue_button)
             pygame.draw.rect(self.window, BLUE, self.menu_button)
             
             # 绘制按钮文本
-            continue_text = self.font.render('继续游戏', True, WHITE)
-            menu_text = self.font.render('返回主菜单', True, WHITE)
+            continue_text = render_text(self.font, '继续游戏', WHITE)
+            menu_text = render_text(self.font, '返回主菜单', WHITE)
             
             # 居中显示文本
             continue_text_rect = continue_text.get_rect(center=self.continue_button.center)
@@ -245,7 +363,7 @@ def draw(self):
             self.window.blit(continue_text, continue_text_rect)
             self.window.blit(menu_text, menu_text_rect)
         
-        pygame.display.flip()
+        renderer.end()
     
     def handle_input(self):
         """处理用户输入
@@ -268,28 +386,27 @@ def handle_input(self):
                         self.show_pause_menu = True
                         self.paused = True
                 elif event.key == pygame.K_r and self.game_over:
-                    self.__init__()
+                    self.restart()
                 elif not self.paused and not self.game_over:
-                    moved = False
-                    if event.key == pygame.K_UP:
-                        moved = self.move('up')
+                    if event.key == pygame.K_a:  # A键切换自动模式
+                        self.autoplay = not self.autoplay
+                    elif event.key == pygame.K_h:  # H键请求提示
+                        self.hint_requested = True
+                    elif event.key == pygame.K_UP:
+                        self.step('up')
                     elif event.key == pygame.K_DOWN:
-                        moved = self.move('down')
+                        self.step('down')
                     elif event.key == pygame.K_LEFT:
-                        moved = self.move('left')
+                        self.step('left')
                     elif event.key == pygame.K_RIGHT:
-                        moved = self.move('right')
-                    
-                    if moved:
-                        self.add_new_tile()
-                        if self.check_game_over():
-                            self.game_over = True
+                        self.step('right')
             elif event.type == pygame.MOUSEBUTTONDOWN and self.show_pause_menu:
                 mouse_pos = pygame.mouse.get_pos()
                 if self.continue_button.collidepoint(mouse_pos):
                     self.show_pause_menu = False
                     self.paused = False
                 elif self.menu_button.collidepoint(mouse_pos):
+                    self.ai_worker.stop()
                     return True
             # 处理手柄按钮事件
             elif event.type == pygame.JOYBUTTONDOWN:
@@ -298,47 +415,66 @@ def handle_input(self):
                         self.show_pause_menu = False
                         self.paused = False
                     elif event.button == 1:  # B键
+                        self.ai_worker.stop()
                         return True  # 返回主菜单
                 else:
                     if event.button == 7:  # Start键
                         self.show_pause_menu = True
                         self.paused = True
                     elif event.button == 0 and self.game_over:  # A键重新开始
-                        self.__init__()
+                        self.restart()
+                    elif event.button == 3:  # Y键切换自动模式
+                        self.autoplay = not self.autoplay
+                    elif event.button == 2:  # X键请求提示
+                        self.hint_requested = True
+            elif event.type == AI_MOVE_EVENT:
+                self.handle_ai_move(event)
         
         # 处理手柄摇杆和方向键输入
         if not self.game_over and not self.paused:
-            for joystick in pygame.joystick.get_count() and [pygame.joystick.Joystick(0)]:
-                moved = False
+            for joystick in [pygame.joystick.Joystick(0)] if pygame.joystick.get_count() else []:
+                direction = None
                 # 处理左摇杆
                 axis_x = joystick.get_axis(0)  # 水平轴
                 axis_y = joystick.get_axis(1)  # 垂直轴
                 if abs(axis_x) > 0.5 or abs(axis_y) > 0.5:
                     if abs(axis_x) > abs(axis_y):
                         if axis_x < -0.5:
-                            moved = self.move('left')
+                            direction = 'left'
                         elif axis_x > 0.5:
-                            moved = self.move('right')
+                            direction = 'right'
                     else:
                         if axis_y < -0.5:
-                            moved = self.move('up')
+                            direction = 'up'
                         elif axis_y > 0.5:
-                            moved = self.move('down')
+                            direction = 'down'
                 
                 # 处理方向键
                 hat = joystick.get_hat(0)
                 if hat[0] != 0 or hat[1] != 0:
                     if hat[0] < 0:
-                        moved = self.move('left')
+                        direction = 'left'
                     elif hat[0] > 0:
-                        moved = self.move('right')
+                        direction = 'right'
                     elif hat[1] > 0:
-                        moved = self.move('up')
+                        direction = 'up'
                     elif hat[1] < 0:
-                        moved = self.move('down')
+                        direction = 'down'
                 
-                if moved:
-                    self.add_new_tile()
-                    if self.check_game_over():
-                        self.game_over = True
-        return False
\ No newline at end of file
+                if direction:
+                    self.step(direction)
+        
+        self.request_ai_move()
+        return False
+
+    def run(self):
+        """运行游戏主循环
+        
+        控制游戏的主要流程，包括处理输入和更新显示（见games.loop.GameLoop）。
+        2048只在输入时改变状态，逻辑步长内只推进动画
+        """
+        return self.loop.run(self.handle_input, self.update, self.draw)
+
+if __name__ == '__main__':
+    game = Game()
+    game.run()
@@ -1,5 +1,12 @@
 import pygame
 import sys
+from games.core.gomoku import GomokuCore, BOARD_SIZE
+from games.core.gomoku_lines import WHITE_PIECE
+from games.core.gomoku_ai import GomokuAI
+from games.core.search_worker import SearchWorker
+from games.loop import GameLoop
+from games.render import DirtyRenderer, StaticLayer, overlay_surface, glow_surface
+from games.text import get_font, render_text
 
 # 初始化 Pygame
 pygame.init()
@@ -15,38 +22,63 @@
 # 游戏窗口设置
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
-BOARD_SIZE = 15  # 15x15的棋盘
 GRID_SIZE = 30  # 每个格子的大小
 PIECE_RADIUS = 13  # 棋子半径
 
-class Game:
+# 电脑对手设置
+AI_MOVE_EVENT = pygame.USEREVENT + 1  # 后台搜索完成时投递的事件
+AI_PLAYER = WHITE_PIECE  # 人机模式下电脑执白棋
+AI_TIME_BUDGET = 1.0  # 每步搜索的时间预算（秒）
+
+
+def _paint_board(surface, colors):
+    """画空棋盘：底色和棋盘线，棋盘四周留半个格子的边
+
+    参数:
+        surface: 图层
+        colors: (底色, 线条颜色)
+    """
+    board_color, line_color = colors
+    surface.fill(board_color)
+    margin = GRID_SIZE // 2
+    end = margin + (BOARD_SIZE - 1) * GRID_SIZE
+    for i in range(BOARD_SIZE):
+        offset = margin + i * GRID_SIZE
+        pygame.draw.line(surface, line_color, (margin, offset), (end, offset))
+        pygame.draw.line(surface, line_color, (offset, margin), (offset, end))
+
+
+# 空棋盘的静态图层，所有对局共用
+BOARD_LAYER = StaticLayer(_paint_board)
+
+class Game(GomokuCore):
     """五子棋游戏类
     
-    控制游戏的主要逻辑，包括初始化、更新和渲染
+    在GomokuCore的游戏逻辑之上负责窗口、输入和渲染
     
     属性:
         window: pygame显示窗口
-        board: 棋盘状态数组
-        current_player: 当前玩家（1为黑棋，2为白棋）
-        game_over: 游戏是否结束
-        winner: 获胜者
         paused: 游戏是否暂停
         show_pause_menu: 是否显示暂停菜单
+        vs_ai: 是否为人机对战模式（电脑执白棋）
+        ai_pending: 是否有尚未返回的后台搜索请求
+        loop: 固定步长游戏循环
+        renderer: 脏矩形渲染器
     """
-    def __init__(self):
+    def __init__(self, vs_ai=False):
         """初始化游戏
         
         创建游戏窗口，初始化游戏状态
+        
+        参数:
+            vs_ai: True表示人机对战，False表示双人对战
         """
         self.window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption('五子棋')
-        self.board = [[0] * BOARD_SIZE for _ in range(BOARD_SIZE)]
-        self.current_player = 1  # 1为黑棋，2为白棋
-        self.game_over = False
-        self.winner = None
+        GomokuCore.__init__(self)
         self.paused = False
         self.show_pause_menu = False
-        self.font = pygame.font.SysFont('SimHei', 36)
+        self.font = get_font()
         
         # 初始化音效
         pygame.mixer.init()
@@ -57,7 +89,6 @@ def __init__(self):
         self.win_animation_alpha = 0
         self.win_animation_direction = 1
         self.win_animation_speed = 5
-        self.win_pieces = []
         
         # 计算棋盘的起始位置（居中显示）
         self.board_start_x = (WINDOW_WIDTH - (BOARD_SIZE - 1) * GRID_SIZE) // 2
@@ -74,6 +105,53 @@ def __init__(self):
         self.cursor_pos = [BOARD_SIZE // 2, BOARD_SIZE // 2]  # 光标位置
         self.cursor_visible = False  # 光标是否可见
         self.cursor_blink_timer = 0  # 光标闪烁计时器
+        
+        # 电脑对手在后台线程中搜索，结果以AI_MOVE_EVENT事件返回
+        self.vs_ai = vs_ai
+        self.ai_pending = False
+        self.ai_worker = SearchWorker(GomokuAI(time_budget=AI_TIME_BUDGET), self.post_ai_move)
+        self.loop = GameLoop()
+        self.renderer = DirtyRenderer(self.window, GRAY)
+        self.draw_board()
+    
+    def post_ai_move(self, state, move):
+        """后台搜索完成的回调（在搜索线程中调用），把结果投递到事件队列"""
+        pygame.event.post(pygame.event.Event(AI_MOVE_EVENT, state=state, move=move))
+    
+    def board_state(self):
+        """返回当前局面的不可变快照(棋盘, 当前玩家)，作为搜索请求"""
+        return tuple(tuple(row) for row in self.board), self.current_player
+    
+    def is_ai_turn(self):
+        """是否轮到电脑落子"""
+        return self.vs_ai and not self.game_over and self.current_player == AI_PLAYER
+    
+    def handle_ai_move(self, event):
+        """处理后台搜索返回的落子位置
+        
+        参数:
+            event: AI_MOVE_EVENT事件
+        """
+        self.ai_pending = False
+        if event.state != self.board_state() or self.paused or not self.is_ai_turn() or event.move is None:
+            return  # 局面已经变化，结果作废
+        self.place_piece(*event.move)
+    
+    def request_ai_move(self):
+        """轮到电脑时向后台线程请求搜索当前局面"""
+        if self.ai_pending or self.paused or not self.is_ai_turn():
+            return
+        self.ai_worker.request(self.board_state())
+        self.ai_pending = True
+    
+    def restart(self, vs_ai=None):
+        """重新开始游戏，停止旧的搜索线程
+        
+        参数:
+            vs_ai: 新一局的模式，None表示保持当前模式
+        """
+        self.ai_worker.stop()
+        self.__init__(self.vs_ai if vs_ai is None else vs_ai)
 
     def get_grid_position(self, mouse_pos):
         """获取鼠标点击的棋盘格子位置
@@ -99,114 +177,111 @@ def get_grid_position(self, mouse_pos):
                 return row, col
         return None
     
-    def check_win(self, row, col):
-        """检查是否有玩家获胜
-        
-        检查指定位置的棋子是否形成五子连珠
+    def place_piece(self, row, col):
+        """在指定位置落子并播放音效
         
         参数:
             row: 行坐标
             col: 列坐标
-            
-        返回:
-            bool: True表示有玩家获胜，False表示游戏继续
         """
-        directions = [(1,0), (0,1), (1,1), (1,-1)]  # 四个方向：横、竖、正斜、反斜
-        player = self.board[row][col]
-        
-        for dx, dy in directions:
-            count = 1  # 当前方向的连续棋子数
-            win_pieces = [(row, col)]  # 记录获胜的棋子位置
-            
-            # 正向检查
-            for i in range(1, 5):
-                new_row = row + dx * i
-                new_col = col + dy * i
-                if not (0 <= new_row < BOARD_SIZE and 0 <= new_col < BOARD_SIZE):
-                    break
-                if self.board[new_row][new_col] != player:
-                    break
-                count += 1
-                win_pieces.append((new_row, new_col))
-            
-            # 反向检查
-            for i in range(1, 5):
-                new_row = row - dx * i
-                new_col = col - dy * i
-                if not (0 <= new_row < BOARD_SIZE and 0 <= new_col < BOARD_SIZE):
-                    break
-                if self.board[new_row][new_col] != player:
-                    break
-                count += 1
-                win_pieces.append((new_row, new_col))
-            
-            if count >= 5:
-                self.win_pieces = win_pieces  # 保存获胜棋子的位置
-                return True
-        return False
+        if self.step((row, col)):
+            self.draw_stone(row, col)
+            self.place_sound.play()  # 播放落子音效
+            if self.game_over:
+                self.win_sound.play()  # 播放胜利音效
+
+    def draw_board(self):
+        """把空棋盘和已有的棋子画到背景层上（开局时调用一次）"""
+        margin = GRID_SIZE // 2
+        board_rect = pygame.Rect(self.board_start_x - margin, self.board_start_y - margin,
+                                 (BOARD_SIZE - 1) * GRID_SIZE + margin * 2,
+                                 (BOARD_SIZE - 1) * GRID_SIZE + margin * 2)
+        self.renderer.background.blit(BOARD_LAYER.render(board_rect.size, (BROWN, BLACK)), board_rect)
+        self.renderer.repaint(board_rect)
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                if self.board[row][col]:
+                    self.draw_stone(row, col)
+
+    def draw_stone(self, row, col):
+        """把一颗新落下的棋子画到背景层上
+
+        参数:
+            row: 行坐标
+            col: 列坐标
+        """
+        center = (self.board_start_x + col * GRID_SIZE,
+                  self.board_start_y + row * GRID_SIZE)
+        color = BLACK if self.board[row][col] == 1 else WHITE
+        self.renderer.repaint(pygame.draw.circle(self.renderer.background, color, center, PIECE_RADIUS))
+
+    def draw_cursor(self):
+        """绘制手柄光标"""
+        if self.cursor_visible:
+            center = (self.board_start_x + self.cursor_pos[1] * GRID_SIZE,
+                     self.board_start_y + self.cursor_pos[0] * GRID_SIZE)
+            self.renderer.add(pygame.draw.circle(self.window, RED, center, PIECE_RADIUS, 2))
 
     def draw(self):
         """绘制游戏画面
         
         绘制棋盘、游戏状态信息和暂停菜单
         """
-        self.window.fill(GRAY)
-        self.draw_board()
+        renderer = self.renderer
+        # 没有落子、光标和状态也没有变化时画面不变（胜利动画每个逻辑步长变化一次）
+        if renderer.skip((self.lines.stones, self.current_player, self.vs_ai, self.is_ai_turn(),
+                          self.game_over, self.game_over and self.win_animation_alpha,
+                          tuple(self.cursor_pos), self.cursor_visible, self.show_pause_menu)):
+            return
+        renderer.begin()  # 擦掉上一帧画的内容
+        self.draw_cursor()
         
         # 显示当前玩家
-        player_text = self.font.render(
-            '当前: ' + ('黑棋' if self.current_player == 1 else '白棋'),
-            True, BLACK if self.current_player == 1 else WHITE
+        player_text = render_text(
+            self.font, '当前: ' + ('黑棋' if self.current_player == 1 else '白棋'),
+            BLACK if self.current_player == 1 else WHITE
         )
-        self.window.blit(player_text, (10, 10))
+        renderer.add(self.window.blit(player_text, (10, 10)))
+        
+        # 显示对战模式和电脑思考状态
+        mode_text = render_text(self.font, '人机' if self.vs_ai else '双人', WHITE)
+        renderer.add(self.window.blit(mode_text, (10, 50)))
+        if self.is_ai_turn():
+            thinking_text = render_text(self.font, '电脑思考中...', WHITE)
+            renderer.add(self.window.blit(thinking_text, (10, 90)))
         
         # 显示游戏结束信息和胜利动画
         if self.game_over:
-            # 更新胜利动画
-            self.win_animation_alpha += self.win_animation_direction * self.win_animation_speed
-            if self.win_animation_alpha >= 255:
-                self.win_animation_alpha = 255
-                self.win_animation_direction = -1
-            elif self.win_animation_alpha <= 0:
-                self.win_animation_alpha = 0
-                self.win_animation_direction = 1
-            
             # 绘制获胜棋子的动画效果
             for row, col in self.win_pieces:
                 center = (self.board_start_x + col * GRID_SIZE,
                          self.board_start_y + row * GRID_SIZE)
-                glow_surface = pygame.Surface((PIECE_RADIUS * 3, PIECE_RADIUS * 3), pygame.SRCALPHA)
-                glow_color = (*RED, self.win_animation_alpha)
-                pygame.draw.circle(glow_surface, glow_color,
-                                 (PIECE_RADIUS * 1.5, PIECE_RADIUS * 1.5),
-                                 PIECE_RADIUS * 1.5)
-                glow_rect = glow_surface.get_rect(center=center)
-                self.window.blit(glow_surface, glow_rect)
+                glow = glow_surface(PIECE_RADIUS * 3, RED, self.win_animation_alpha)
+                glow_rect = glow.get_rect(center=center)
+                renderer.add(self.window.blit(glow, glow_rect))
             
-            winner_text = self.font.render(
-                f'游戏结束! {"黑棋" if self.winner == 1 else "白棋"}获胜',
-                True, BLACK if self.winner == 1 else WHITE
+            winner_text = render_text(
+                self.font, f'游戏结束! {"黑棋" if self.winner == 1 else "白棋"}获胜',
+                BLACK if self.winner == 1 else WHITE
             )
             text_rect = winner_text.get_rect(
                 center=(WINDOW_WIDTH // 2, 30)
             )
-            self.window.blit(winner_text, text_rect)
+            renderer.add(self.window.blit(winner_text, text_rect))
         
         # 绘制暂停菜单
         if self.show_pause_menu:
-            # 创建半透明遮罩层
-            overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-            overlay.fill(GRAY)
-            overlay.set_alpha(128)
-            self.window.blit(overlay, (0, 0))
+            # 半透明遮罩层（共用同一张Surface）
+            overlay = overlay_surface((WINDOW_WIDTH, WINDOW_HEIGHT), GRAY, 128)
+            renderer.add(self.window.blit(overlay, (0, 0)))
             
             # 绘制暂停菜单按钮
             pygame.draw.rect(self.window, BLUE, self.continue_button)
             pygame.draw.rect(self.window, BLUE, self.menu_button)
             
             # 绘制按钮文本
-            continue_text = self.font.render('继续游戏', True, WHITE)
-            menu_text = self.font.render('返回主菜单', True, WHITE)
+            continue_text = render_text(self.font, '继续游戏', WHITE)
+            menu_text = render_text(self.font, '返回主菜单', WHITE)
             
             # 居中显示文本
             continue_text_rect = continue_text.get_rect(center=self.continue_button.center)
@@ -215,7 +290,7 @@ def draw(self):
             self.window.blit(continue_text, continue_text_rect)
             self.window.blit(menu_text, menu_text_rect)
         
-        pygame.display.flip()
+        renderer.end()
 
     def handle_input(self):
         """处理用户输入
@@ -238,26 +313,20 @@ def handle_input(self):
                         self.show_pause_menu = True
                         self.paused = True
                 elif event.key == pygame.K_r and self.game_over:
-                    self.__init__()
+                    self.restart()
+                elif event.key == pygame.K_m and not self.paused:
+                    self.restart(not self.vs_ai)  # 切换人机/双人模式并重新开始
             elif event.type == pygame.MOUSEBUTTONDOWN and not self.paused and not self.game_over:
                 pos = self.get_grid_position(event.pos)
-                if pos:
-                    row, col = pos
-                    if self.board[row][col] == 0:  # 如果该位置为空
-                        self.board[row][col] = self.current_player
-                        self.place_sound.play()  # 播放落子音效
-                        if self.check_win(row, col):
-                            self.game_over = True
-                            self.winner = self.current_player
-                            self.win_sound.play()  # 播放胜利音效
-                        else:
-                            self.current_player = 3 - self.current_player  # 切换玩家
+                if pos and not self.is_ai_turn():
+                    self.place_piece(*pos)
             elif event.type == pygame.MOUSEBUTTONDOWN and self.show_pause_menu:
                 mouse_pos = pygame.mouse.get_pos()
                 if self.continue_button.collidepoint(mouse_pos):
                     self.show_pause_menu = False
                     self.paused = False
                 elif self.menu_button.collidepoint(mouse_pos):
+                    self.ai_worker.stop()
                     return True
             # 处理手柄按钮事件
             elif event.type == pygame.JOYBUTTONDOWN:
@@ -266,6 +335,7 @@ def handle_input(self):
                         self.show_pause_menu = False
                         self.paused = False
                     elif event.button == 1:  # B键
+                        self.ai_worker.stop()
                         return True  # 返回主菜单
                 else:
                     if event.button == 7:  # Start键
@@ -273,23 +343,18 @@ def handle_input(self):
                         self.paused = True
                     elif event.button == 0:  # A键
                         if self.game_over:
-                            self.__init__()
-                        elif not self.paused:
+                            self.restart()
+                        elif not self.paused and not self.is_ai_turn():
                             # 在光标位置落子
-                            row, col = self.cursor_pos
-                            if self.board[row][col] == 0:
-                                self.board[row][col] = self.current_player
-                                self.place_sound.play()  # 播放落子音效
-                                if self.check_win(row, col):
-                                    self.game_over = True
-                                    self.winner = self.current_player
-                                    self.win_sound.play()  # 播放胜利音效
-                                else:
-                                    self.current_player = 3 - self.current_player
+                            self.place_piece(*self.cursor_pos)
+                    elif event.button == 3:  # Y键
+                        self.restart(not self.vs_ai)  # 切换人机/双人模式并重新开始
+            elif event.type == AI_MOVE_EVENT:
+                self.handle_ai_move(event)
         
         # 处理手柄摇杆和方向键输入
         if not self.game_over and not self.paused:
-            for joystick in pygame.joystick.get_count() and [pygame.joystick.Joystick(0)]:
+            for joystick in [pygame.joystick.Joystick(0)] if pygame.joystick.get_count() else []:
                 # 处理左摇杆
                 axis_x = joystick.get_axis(0)  # 水平轴
                 axis_y = joystick.get_axis(1)  # 垂直轴
@@ -318,21 +383,28 @@ def handle_input(self):
                         self.cursor_pos[0] -= 1
                     elif hat[1] < 0 and self.cursor_pos[0] < BOARD_SIZE - 1:
                         self.cursor_pos[0] += 1
+        
+        self.request_ai_move()
         return False
     
+    def update(self):
+        """推进一个逻辑步长：更新胜利动画的透明度"""
+        if self.game_over:
+            self.win_animation_alpha += self.win_animation_direction * self.win_animation_speed
+            if self.win_animation_alpha >= 255:
+                self.win_animation_alpha = 255
+                self.win_animation_direction = -1
+            elif self.win_animation_alpha <= 0:
+                self.win_animation_alpha = 0
+                self.win_animation_direction = 1
+
     def run(self):
         """运行游戏主循环
         
-        控制游戏的主要流程，包括处理输入和更新显示
+        控制游戏的主要流程，包括处理输入和更新显示。胜利动画按固定步长更新
+        （见games.loop.GameLoop），速度不受帧率影响
         """
-        clock = pygame.time.Clock()
-        
-        while True:
-            if self.handle_input():  # 如果返回True，表示要返回主菜单
-                break
-            
-            self.draw()
-            clock.tick(60)
+        return self.loop.run(self.handle_input, self.update, lambda alpha: self.draw())
 
 if __name__ == '__main__':
     game = Game()
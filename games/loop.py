@@ -0,0 +1,92 @@
+"""固定步长游戏循环
+
+各游戏的逻辑按固定的频率更新，与渲染帧率无关：
+- 每帧把经过的真实时间累加到累加器中，累加器每满一个逻辑步长就更新一次逻辑
+- 掉帧时一帧内会补做几次逻辑更新，但最多MAX_CATCH_UP次，落后太多时丢弃多余的时间，
+  避免逻辑更新越来越多、越追越慢
+- 渲染时传入插值系数（累加器中剩余的时间占一个步长的比例），
+  连续移动的物体可以在上一步和这一步的位置之间插值，画面比逻辑频率更平滑
+
+输入在每帧处理一次，按显示刷新率响应，不受逻辑频率影响。
+"""
+import pygame
+
+# 默认的逻辑频率和渲染帧率
+TICK_RATE = 60
+FPS = 60
+
+# 每帧最多补做的逻辑更新次数
+MAX_CATCH_UP = 5
+
+
+def lerp(previous, current, alpha):
+    """在上一步和这一步的值之间线性插值
+
+    参数:
+        previous: 上一次逻辑更新后的值
+        current: 这一次逻辑更新后的值
+        alpha: 插值系数，0为previous，1为current
+
+    返回:
+        float: 插值结果
+    """
+    return previous + (current - previous) * alpha
+
+
+class GameLoop:
+    """固定步长游戏循环
+
+    属性:
+        tick_rate: 每秒的逻辑更新次数
+        fps: 渲染帧率上限
+        max_catch_up: 每帧最多补做的逻辑更新次数
+        step_ms: 一个逻辑步长的毫秒数
+        alpha: 最近一次渲染使用的插值系数
+    """
+    def __init__(self, tick_rate=TICK_RATE, fps=FPS, max_catch_up=MAX_CATCH_UP):
+        """初始化游戏循环
+
+        参数:
+            tick_rate: 每秒的逻辑更新次数
+            fps: 渲染帧率上限
+            max_catch_up: 每帧最多补做的逻辑更新次数
+        """
+        self.tick_rate = tick_rate
+        self.fps = fps
+        self.max_catch_up = max_catch_up
+        self.step_ms = 1000.0 / tick_rate
+        self.alpha = 0.0
+
+    def run(self, handle_input, update, render):
+        """运行游戏循环，直到handle_input返回True
+
+        参数:
+            handle_input: 每帧调用一次，处理输入事件；返回True表示退出循环
+            update: 每个逻辑步长调用一次，推进游戏逻辑
+            render: 每帧调用一次，参数为插值系数（0到1）
+
+        返回:
+            bool: handle_input的返回值（True表示返回主菜单）
+        """
+        clock = pygame.time.Clock()
+        accumulator = 0.0
+        elapsed = 0
+        while True:
+            result = handle_input()
+            if result:
+                return result
+
+            accumulator += elapsed
+            steps = 0
+            while accumulator >= self.step_ms:
+                if steps >= self.max_catch_up:
+                    # 落后太多，丢弃整步的时间，只保留不足一步的部分
+                    accumulator %= self.step_ms
+                    break
+                update()
+                accumulator -= self.step_ms
+                steps += 1
+
+            self.alpha = accumulator / self.step_ms
+            render(self.alpha)
+            elapsed = clock.tick(self.fps)
@@ -1,7 +1,11 @@
 import pygame
 import sys
-import random
 import math
+from games.core.pacman import PacmanCore, SWARM_ENEMY_COUNT, SWARM_CANDY_COUNT
+from games.core.pacman_maze import MazePacmanCore, MAZE, SUBSTEPS, DIRECTIONS, load_maze
+from games.loop import GameLoop, lerp
+from games.render import DirtyRenderer, StaticLayer
+from games.text import get_font, render_text
 
 # 初始化 Pygame 游戏引擎
 pygame.init()
@@ -10,9 +14,6 @@
 WHITE = (255, 255, 255)   # 白色，用于糖豆
 BLACK = (0, 0, 0)        # 黑色，用于背景
 YELLOW = (255, 255, 0)   # 黄色，用于玩家
-RED = (255, 0, 0)       # 红色，用于敌人1
-BLUE = (0, 0, 255)      # 蓝色，用于敌人2
-PINK = (255, 192, 203)   # 粉色，用于敌人3
 
 # 游戏窗口和网格设置
 WINDOW_WIDTH = 800      # 游戏窗口宽度
@@ -21,216 +22,410 @@
 GRID_WIDTH = WINDOW_WIDTH // GRID_SIZE    # 网格宽度数量
 GRID_HEIGHT = WINDOW_HEIGHT // GRID_SIZE  # 网格高度数量
 
-class Player:
-    """玩家类
+# 迷宫模式的颜色和尺寸
+WALL_COLOR = (33, 33, 222)
+DOOR_COLOR = (255, 184, 255)
+FRIGHTENED_COLOR = (33, 33, 255)  # 受惊的鬼
+EYE_COLOR = (33, 33, 255)  # 鬼的瞳孔
+PELLET_RADIUS = 2
+POWER_PELLET_RADIUS = 6
+PLAYER_RADIUS = 9
+GHOST_RADIUS = 9
+FLASH_TICKS = 2 * 60  # 受惊模式最后这段时间鬼会闪烁
+
+# handle_input返回这个值时在开阔场地和迷宫两种模式之间切换
+SWITCH_MODE = 'switch'
+
+
+def draw_pacman(window, x, y, radius, angle):
+    """画吃豆人：圆形身体和三角形嘴巴
+
+    参数:
+        window: 目标Surface
+        x, y: 圆心
+        radius: 半径
+        angle: 嘴巴朝向的角度（度，向右为0，逆时针为正）
+
+    返回:
+        pygame.Rect: 画到的区域
+    """
+    rect = pygame.draw.circle(window, YELLOW, (int(x), int(y)), radius)
+    mouth_points = [
+        (x, y),
+        (x + radius * math.cos(math.radians(angle + 20)),
+         y - radius * math.sin(math.radians(angle + 20))),
+        (x + radius * math.cos(math.radians(angle - 20)),
+         y - radius * math.sin(math.radians(angle - 20)))
+    ]
+    pygame.draw.polygon(window, BLACK, mouth_points)
+    return rect
+
+
+def read_direction():
+    """读取方向键和手柄的方向
+
+    返回:
+        tuple: 移动方向(dx, dy)，每个分量取-1、0或1
+    """
+    dx = dy = 0
+    # 处理方向键移动
+    keys = pygame.key.get_pressed()
+    if keys[pygame.K_LEFT]:
+        dx = -1
+    if keys[pygame.K_RIGHT]:
+        dx = 1
+    if keys[pygame.K_UP]:
+        dy = -1
+    if keys[pygame.K_DOWN]:
+        dy = 1
+
+    # 处理手柄输入
+    for joystick in [pygame.joystick.Joystick(0)] if pygame.joystick.get_count() else []:
+        # 处理左摇杆
+        axis_x = joystick.get_axis(0)  # 水平轴
+        axis_y = joystick.get_axis(1)  # 垂直轴
+        if axis_x < -0.5:  # 左
+            dx = -1
+        elif axis_x > 0.5:  # 右
+            dx = 1
+        if axis_y < -0.5:  # 上
+            dy = -1
+        elif axis_y > 0.5:  # 下
+            dy = 1
+
+        # 处理方向键
+        hat = joystick.get_hat(0)
+        if hat[0] < 0:  # 左
+            dx = -1
+        elif hat[0] > 0:  # 右
+            dx = 1
+        if hat[1] > 0:  # 上
+            dy = -1
+        elif hat[1] < 0:  # 下
+            dy = 1
+    return dx, dy
+
+
+def run_pacman(game):
+    """运行游戏主循环，handle_input返回SWITCH_MODE时换成另一种模式的新游戏继续
+
+    参数:
+        game: Game或MazeGame
+
+    返回:
+        handle_input退出循环时的返回值
+    """
+    while True:
+        result = game.loop.run(game.handle_input, game.update, game.draw)
+        if result != SWITCH_MODE:
+            return result
+        game = MazeGame() if isinstance(game, Game) else Game()
+
+
+def _paint_walls(surface, color):
+    """画迷宫的墙：每个墙格子画成一段粗线，与相邻的墙格子连在一起
+
+    参数:
+        surface: 图层（大小与迷宫相同）
+        color: 墙的颜色
+    """
+    def is_wall(col, row):
+        return 0 <= row < len(MAZE) and 0 <= col < len(MAZE[row]) and MAZE[row][col] == '#'
+
+    inset = GRID_SIZE // 4
+    width = GRID_SIZE - inset * 2
+    for row, line in enumerate(MAZE):
+        for col, char in enumerate(line):
+            x, y = col * GRID_SIZE, row * GRID_SIZE
+            if char == '-':  # 鬼屋的门
+                pygame.draw.rect(surface, DOOR_COLOR, (x, y + GRID_SIZE // 2 - 2, GRID_SIZE, 4))
+            if char != '#':
+                continue
+            right, down = is_wall(col + 1, row), is_wall(col, row + 1)
+            pygame.draw.rect(surface, color, (x + inset, y + inset, width, width))
+            if right:
+                pygame.draw.rect(surface, color, (x + inset, y + inset, GRID_SIZE, width))
+            if down:
+                pygame.draw.rect(surface, color, (x + inset, y + inset, width, GRID_SIZE))
+            if right and down and is_wall(col + 1, row + 1):  # 成块的墙填满中间的空隙
+                pygame.draw.rect(surface, color, (x + inset, y + inset, GRID_SIZE, GRID_SIZE))
+
+
+# 迷宫墙壁的静态图层
+WALL_LAYER = StaticLayer(_paint_walls)
+
+class Game(PacmanCore):
+    """游戏主类
     
-    控制玩家角色的移动、动画和状态
+    在PacmanCore的游戏逻辑之上负责窗口、输入和渲染
     
     属性:
-        x, y: 玩家位置坐标
-        radius: 玩家半径
-        speed: 移动速度
-        direction: 朝向角度（用于动画）
-        score: 得分
-        lives: 生命值
+        window: pygame显示窗口
+        font: 字体对象
+        swarm: 是否为虫群关卡（几百个敌人、几千个糖豆）
+        action: 玩家当前的移动方向(dx, dy)
+        previous: 上一次逻辑更新前玩家和敌人的位置，用于渲染插值
+        loop: 固定步长游戏循环
+        renderer: 脏矩形渲染器，糖豆画在背景层上
     """
-    def __init__(self):
-        """初始化玩家
-        
-        设置玩家的初始位置、大小、速度和状态
-        """
-        self.x = WINDOW_WIDTH // 2
-        self.y = WINDOW_HEIGHT // 2
-        self.radius = 15
-        self.speed = 5
-        self.direction = 0  # 角度，用于动画
-        self.score = 0
-        self.lives = 3
-
-    def move(self, dx, dy):
-        """移动玩家
-        
-        根据输入方向移动玩家，并确保不会移出屏幕
+    def __init__(self, swarm=False, seed=None):
+        """初始化游戏
         
+        创建游戏窗口，初始化游戏对象
+
         参数:
-            dx: x方向的移动量（-1左移，1右移，0不动）
-            dy: y方向的移动量（-1上移，1下移，0不动）
+            swarm: True表示虫群关卡
+            seed: 随机种子，None表示新生成一个；同样的种子和输入得到同样的对局
         """
-        new_x = self.x + dx * self.speed
-        new_y = self.y + dy * self.speed
-        
-        # 确保玩家不会移出屏幕
-        if 0 + self.radius <= new_x <= WINDOW_WIDTH - self.radius:
-            self.x = new_x
-        if 0 + self.radius <= new_y <= WINDOW_HEIGHT - self.radius:
-            self.y = new_y
+        self.window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption('吃糖豆')
+        # 糖豆在生成时画到背景层上，所以渲染器要先于游戏状态创建
+        self.renderer = DirtyRenderer(self.window, BLACK)
+        self.swarm = swarm
+        if swarm:
+            PacmanCore.__init__(self, SWARM_ENEMY_COUNT, SWARM_CANDY_COUNT, seed)
+        else:
+            PacmanCore.__init__(self, seed=seed)
+        self.font = get_font()  # 使用系统黑体字体
+        self.action = (0, 0)
+        self.previous = None
+        self.loop = GameLoop()
 
-        # 更新朝向角度（用于动画）
-        if dx != 0 or dy != 0:
-            self.direction = math.degrees(math.atan2(-dy, dx))
+    def spawn_candies(self, count):
+        """随机添加一批糖豆，并画到背景层上
 
-    def draw(self, surface):
-        """绘制玩家
-        
-        在游戏窗口上绘制玩家角色，包括圆形身体和三角形嘴巴
-        
         参数:
-            surface: pygame的显示表面对象
+            count: 添加的数量
         """
-        # 绘制玩家（类似吃豆人的形状）
-        pygame.draw.circle(surface, YELLOW, (int(self.x), int(self.y)), self.radius)
-        # 绘制嘴巴（简单的三角形）
-        mouth_points = [
-            (self.x, self.y),
-            (self.x + self.radius * math.cos(math.radians(self.direction + 20)),
-             self.y - self.radius * math.sin(math.radians(self.direction + 20))),
-            (self.x + self.radius * math.cos(math.radians(self.direction - 20)),
-             self.y - self.radius * math.sin(math.radians(self.direction - 20)))
-        ]
-        pygame.draw.polygon(surface, BLACK, mouth_points)
-
-class Enemy:
-    """敌人类
-    
-    控制敌人的移动和行为，会追踪玩家
-    
-    属性:
-        x, y: 敌人位置坐标
-        radius: 敌人半径
-        color: 敌人颜色
-        speed: 移动速度
-        direction: 移动方向
-    """
-    def __init__(self, x, y, color):
-        """初始化敌人
-        
+        spawned = PacmanCore.spawn_candies(self, count)
+        for candy in spawned:
+            self.draw_candy(candy)
+        self.renderer.invalidate()  # 一批糖豆可能有几千个，整屏刷新一次
+
+    def draw_candy(self, candy, color=None):
+        """把一个糖豆画到背景层上
+
         参数:
-            x, y: 初始位置
-            color: 敌人颜色
+            candy: 糖豆编号
+            color: 颜色，None表示糖豆本身的颜色
+
+        返回:
+            pygame.Rect: 画到的区域
         """
-        self.x = x
-        self.y = y
-        self.radius = 15
-        self.color = color
-        self.speed = 3
-        self.direction = random.randint(0, 360)
-
-    def move(self, player_x, player_y):
-        """移动敌人
-        
-        根据玩家位置计算移动方向，并加入随机性使移动更有趣
-        
+        candies = self.candies
+        center = (int(candies.x[candy]), int(candies.y[candy]))
+        return pygame.draw.circle(self.renderer.background, color or candies.color, center,
+                                  int(candies.radius[candy]))
+
+    def eat_candies(self, eaten):
+        """玩家吃掉糖豆，并从背景层上擦掉
+
         参数:
-            player_x: 玩家x坐标
-            player_y: 玩家y坐标
+            eaten: 被吃掉的糖豆编号列表
         """
-        # 计算到玩家的方向向量
-        dx = player_x - self.x
-        dy = player_y - self.y
-        dist = math.sqrt(dx * dx + dy * dy)
+        PacmanCore.eat_candies(self, eaten)
+        candies = self.candies
+        for candy in eaten:
+            self.renderer.repaint(self.draw_candy(candy, BLACK))
+            # 补画被一起擦掉了一部分的相邻糖豆
+            for neighbor in candies.touching(candies.x[candy], candies.y[candy], candies.radius[candy] + 1):
+                self.draw_candy(neighbor)
+
+    def handle_keys(self):
+        """处理键盘输入
         
-        if dist != 0:
-            # 标准化方向向量并应用速度
-            dx = dx / dist * self.speed
-            dy = dy / dist * self.speed
-            
-            # 加入随机性，使移动更有趣
-            if random.random() < 0.02:  # 2%的概率改变方向
-                dx += random.uniform(-2, 2)
-                dy += random.uniform(-2, 2)
-            
-            new_x = self.x + dx
-            new_y = self.y + dy
-            
-            # 确保敌人不会移出屏幕
-            if 0 + self.radius <= new_x <= WINDOW_WIDTH - self.radius:
-                self.x = new_x
-            if 0 + self.radius <= new_y <= WINDOW_HEIGHT - self.radius:
-                self.y = new_y
-
-    def draw(self, surface):
-        """绘制敌人
+        处理游戏的各种输入事件，包括移动、退出和重启
         
-        参数:
-            surface: pygame的显示表面对象
+        返回:
+            tuple: (是否返回主菜单（SWITCH_MODE表示切换到迷宫模式）, 玩家移动方向(dx, dy))
         """
-        pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), self.radius)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    return True, (0, 0)  # 返回主菜单
+                elif event.key == pygame.K_r and self.game_over:
+                    self.__init__(self.swarm)
+                elif event.key == pygame.K_s:  # S键切换虫群关卡（重新开始）
+                    self.__init__(not self.swarm)
+                elif event.key == pygame.K_m:  # M键切换到迷宫模式
+                    return SWITCH_MODE, (0, 0)
+            # 添加手柄按钮事件处理
+            elif event.type == pygame.JOYBUTTONDOWN:
+                if event.button == 7:  # Start键
+                    return True, (0, 0)  # 返回主菜单
+                elif event.button == 0 and self.game_over:  # A键重新开始
+                    self.__init__(self.swarm)
+                elif event.button == 3:  # Y键切换虫群关卡（重新开始）
+                    self.__init__(not self.swarm)
+                elif event.button == 2:  # X键切换到迷宫模式
+                    return SWITCH_MODE, (0, 0)
 
-class Candy:
-    """糖豆类
-    
-    游戏中的收集物，被玩家吃到后增加分数
-    
-    属性:
-        radius: 糖豆半径
-        color: 糖豆颜色
-        position: 位置坐标
-    """
-    def __init__(self):
-        """初始化糖豆
+        if self.game_over:
+            return False, (0, 0)
+        return False, read_direction()
+
+    def draw_player(self, x, y):
+        """绘制玩家
         
-        设置糖豆的大小、颜色，并随机放置位置
+        在游戏窗口上绘制玩家角色，包括圆形身体和三角形嘴巴；重生后的无敌时间内闪烁
+
+        参数:
+            x, y: 绘制的位置（插值后的玩家位置）
         """
-        self.radius = 5
-        self.color = WHITE
-        self.position = self.get_random_position()
+        if self.player.invulnerable // 8 % 2:
+            return
+        self.renderer.add(draw_pacman(self.window, x, y, self.player.radius, self.player.direction))
+
+    def handle_input(self):
+        """每帧处理一次输入，记录玩家的移动方向
 
-    def get_random_position(self):
-        """获取随机位置
-        
         返回:
-            tuple: 随机生成的(x,y)坐标
+            bool: True表示返回主菜单
         """
-        x = random.randint(self.radius, WINDOW_WIDTH - self.radius)
-        y = random.randint(self.radius, WINDOW_HEIGHT - self.radius)
-        return (x, y)
+        back_to_menu, self.action = self.handle_keys()
+        return back_to_menu
+
+    def update(self):
+        """推进一个逻辑步长：移动玩家和敌人并检查碰撞"""
+        # 记录更新前的位置，渲染时在两次更新之间插值
+        self.previous = ((self.player.x, self.player.y), (self.enemies.x, self.enemies.y))
+        lives = self.player.lives
+        self.step(self.action)
+        if self.player.lives != lives:
+            self.previous = None  # 玩家被抓后回到中间，不插值
+
+    def draw(self, alpha=1.0):
+        """绘制游戏画面
 
-    def draw(self, surface):
-        """绘制糖豆
-        
         参数:
-            surface: pygame的显示表面对象
+            alpha: 插值系数，在上一次和这一次逻辑更新的位置之间插值绘制玩家和敌人
         """
-        pygame.draw.circle(surface, self.color, self.position, self.radius)
+        renderer = self.renderer
+        # 游戏结束后画面不变，只画一次
+        if renderer.skip('game over' if self.game_over else None):
+            return
+        renderer.begin()  # 擦掉上一帧画的内容
 
-class Game:
-    """游戏主类
-    
-    控制游戏的主要逻辑，包括初始化、更新和渲染
-    
-    属性:
-        window: pygame显示窗口
-        player: 玩家对象
-        enemies: 敌人列表
-        candies: 糖豆列表
-        font: 字体对象
-        game_over: 游戏是否结束
-    """
-    def __init__(self):
-        """初始化游戏
+        # 绘制敌人和玩家（糖豆在背景层上）
+        enemies = self.enemies
+        previous_player, previous_enemies = self.previous or (None, None)
+        xs, ys = enemies.x, enemies.y
+        if previous_enemies is not None:
+            xs = lerp(previous_enemies[0], xs, alpha)
+            ys = lerp(previous_enemies[1], ys, alpha)
+        for x, y, color, radius in zip(xs.astype(int).tolist(), ys.astype(int).tolist(),
+                                       enemies.colors, enemies.radius.tolist()):
+            renderer.add(pygame.draw.circle(self.window, color, (x, y), radius))
+        x, y = self.player.x, self.player.y
+        if previous_player is not None:
+            x = lerp(previous_player[0], x, alpha)
+            y = lerp(previous_player[1], y, alpha)
+        self.draw_player(x, y)
+
+        # 显示分数和生命值
+        score_text = render_text(self.font, f'得分: {self.player.score}', WHITE)
+        lives_text = render_text(self.font, f'生命: {self.player.lives}', WHITE)
+        renderer.add(self.window.blit(score_text, (10, 10)))
+        renderer.add(self.window.blit(lives_text, (10, 50)))
+
+        if self.game_over:
+            game_over_text = render_text(self.font, '游戏结束! 按R重新开始', WHITE)
+            text_rect = game_over_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
+            renderer.add(self.window.blit(game_over_text, text_rect))
+
+        renderer.end()
+
+    def run(self):
+        """运行游戏主循环
         
-        创建游戏窗口，初始化游戏对象
+        逻辑按固定步长更新（见games.loop.GameLoop），渲染按显示帧率进行
         """
+        return run_pacman(self)
+
+class MazeGame(MazePacmanCore):
+    """迷宫吃豆游戏（经典模式）
+
+    墙壁和豆子画在背景层上，只有玩家、鬼和文字每帧重画。
+    """
+    def __init__(self, seed=None):
+        """初始化迷宫游戏
+
+        参数:
+            seed: 随机种子，None表示新生成一个；同样的种子和输入得到同样的对局
+        """
+        # 初始化pygame
+        pygame.init()
+        pygame.joystick.init()
         self.window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption('吃糖豆')
-        self.player = Player()
-        # 创建三个不同颜色的敌人，分别在不同位置
-        self.enemies = [
-            Enemy(100, 100, RED),
-            Enemy(WINDOW_WIDTH - 100, 100, PINK),
-            Enemy(100, WINDOW_HEIGHT - 100, BLUE)
-        ]
-        self.candies = [Candy() for _ in range(20)]  # 初始创建20个糖豆
-        self.font = pygame.font.SysFont('SimHei', 36)  # 使用系统黑体字体
-        self.game_over = False
+        pygame.display.set_caption('吃豆人 - 迷宫')
+
+        # 迷宫居中显示
+        graph = load_maze()
+        self.maze_size = (graph.columns * GRID_SIZE, graph.rows * GRID_SIZE)
+        self.origin = ((WINDOW_WIDTH - self.maze_size[0]) // 2, (WINDOW_HEIGHT - self.maze_size[1]) // 2)
+
+        # 渲染器要在逻辑核心之前创建：摆豆子时直接画到背景层上
+        self.renderer = DirtyRenderer(self.window, BLACK)
+        MazePacmanCore.__init__(self, seed=seed)
+
+        # 初始化字体
+        self.font = get_font()
+
+        self.action = (0, 0)
+        self.previous = None
+        self.loop = GameLoop()
+
+    def cell_rect(self, node):
+        """节点所在格子在窗口上的区域"""
+        col, row = self.graph.cells[node]
+        return pygame.Rect(self.origin[0] + col * GRID_SIZE, self.origin[1] + row * GRID_SIZE,
+                           GRID_SIZE, GRID_SIZE)
+
+    def draw_pellet(self, node):
+        """把节点上的豆子或能量豆画到背景层上"""
+        radius = POWER_PELLET_RADIUS if node in self.power_pellets else PELLET_RADIUS
+        pygame.draw.circle(self.renderer.background, WHITE, self.cell_rect(node).center, radius)
+
+    def reset_level(self):
+        """摆满豆子开始新的一关，并重画整个背景层"""
+        MazePacmanCore.reset_level(self)
+        background = self.renderer.background
+        background.fill(BLACK)
+        background.blit(WALL_LAYER.render(self.maze_size, WALL_COLOR), self.origin)
+        for node in self.pellets | self.power_pellets:
+            self.draw_pellet(node)
+        self.renderer.invalidate()
+
+    def eat_pellet(self, node):
+        """玩家吃掉豆子，并从背景层上擦掉
+
+        参数:
+            node: 节点编号
+        """
+        if node not in self.pellets and node not in self.power_pellets:
+            return
+        MazePacmanCore.eat_pellet(self, node)
+        rect = self.cell_rect(node)
+        self.renderer.background.fill(BLACK, rect)
+        self.renderer.repaint(rect)
+
+    def actor_position(self, actor):
+        """角色中心在窗口上的位置"""
+        return (self.origin[0] + actor.x * GRID_SIZE / SUBSTEPS + GRID_SIZE / 2,
+                self.origin[1] + actor.y * GRID_SIZE / SUBSTEPS + GRID_SIZE / 2)
+
+    def positions(self):
+        """玩家和所有鬼在窗口上的位置"""
+        return [self.actor_position(self.player)] + [self.actor_position(ghost) for ghost in self.ghosts]
+
+    def handle_input(self):
+        """每帧处理一次输入，记录玩家想走的方向
 
-    def handle_keys(self):
-        """处理键盘输入
-        
-        处理游戏的各种输入事件，包括移动、退出和重启
-        
         返回:
-            bool: True表示要返回主菜单，False表示继续游戏
+            bool: True表示返回主菜单（SWITCH_MODE表示切换到开阔场地模式）
         """
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -241,127 +436,96 @@ def handle_keys(self):
                     return True  # 返回主菜单
                 elif event.key == pygame.K_r and self.game_over:
                     self.__init__()
-                    self.game_over = False
-            # 添加手柄按钮事件处理
+                elif event.key == pygame.K_m:  # M键切换到开阔场地模式
+                    return SWITCH_MODE
             elif event.type == pygame.JOYBUTTONDOWN:
                 if event.button == 7:  # Start键
                     return True  # 返回主菜单
                 elif event.button == 0 and self.game_over:  # A键重新开始
                     self.__init__()
-                    self.game_over = False
-
-        if not self.game_over:
-            # 处理方向键移动
-            dx = dy = 0
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_LEFT]:
-                dx = -1
-            if keys[pygame.K_RIGHT]:
-                dx = 1
-            if keys[pygame.K_UP]:
-                dy = -1
-            if keys[pygame.K_DOWN]:
-                dy = 1
-
-            # 处理手柄输入
-            for joystick in pygame.joystick.get_count() and [pygame.joystick.Joystick(0)]:
-                # 处理左摇杆
-                axis_x = joystick.get_axis(0)  # 水平轴
-                axis_y = joystick.get_axis(1)  # 垂直轴
-                if axis_x < -0.5:  # 左
-                    dx = -1
-                elif axis_x > 0.5:  # 右
-                    dx = 1
-                if axis_y < -0.5:  # 上
-                    dy = -1
-                elif axis_y > 0.5:  # 下
-                    dy = 1
-
-                # 处理方向键
-                hat = joystick.get_hat(0)
-                if hat[0] < 0:  # 左
-                    dx = -1
-                elif hat[0] > 0:  # 右
-                    dx = 1
-                if hat[1] > 0:  # 上
-                    dy = -1
-                elif hat[1] < 0:  # 下
-                    dy = 1
-
-            self.player.move(dx, dy)
+                elif event.button == 2:  # X键切换到开阔场地模式
+                    return SWITCH_MODE
 
+        self.action = (0, 0) if self.game_over else read_direction()
         return False
 
-    def check_collisions(self):
-        """检查碰撞
-        
-        检查玩家与糖豆和敌人的碰撞，处理得分和生命值
+    def update(self):
+        """推进一个逻辑步长"""
+        # 记录更新前的位置，渲染时在两次更新之间插值
+        self.previous = self.positions()
+        lives, level = self.player.lives, self.level
+        self.step(self.action)
+        if self.player.lives != lives or self.level != level:
+            self.previous = None  # 所有角色回到起点，不插值
+
+    def draw_ghost(self, ghost, x, y):
+        """绘制鬼：身体和看向移动方向的眼睛，被吃掉的鬼只画眼睛
+
+        参数:
+            ghost: 鬼
+            x, y: 绘制的位置（插值后的位置）
         """
-        # 检查与糖豆的碰撞
-        for candy in self.candies[:]:
-            dx = self.player.x - candy.position[0]
-            dy = self.player.y - candy.position[1]
-            if math.sqrt(dx * dx + dy * dy) < self.player.radius + candy.radius:
-                self.candies.remove(candy)
-                self.player.score += 10
-                if not self.candies:  # 如果所有糖豆都被吃完
-                    self.candies.extend([Candy() for _ in range(20)])
-
-        # 检查与敌人的碰撞
-        for enemy in self.enemies:
-            dx = self.player.x - enemy.x
-            dy = self.player.y - enemy.y
-            if math.sqrt(dx * dx + dy * dy) < self.player.radius + enemy.radius:
-                self.player.lives -= 1
-                if self.player.lives <= 0:
-                    self.game_over = True
-                else:
-                    # 重置玩家位置
-                    self.player.x = WINDOW_WIDTH // 2
-                    self.player.y = WINDOW_HEIGHT // 2
+        renderer = self.renderer
+        x, y = int(x), int(y)
+        if not ghost.eaten:
+            color = ghost.color
+            if ghost.frightened:
+                # 受惊模式快结束时蓝白闪烁
+                flash = self.frightened_ticks < FLASH_TICKS and self.frightened_ticks // 15 % 2
+                color = WHITE if flash else FRIGHTENED_COLOR
+            renderer.add(pygame.draw.circle(self.window, color, (x, y), GHOST_RADIUS))
+            if ghost.frightened:
+                return
+        dx, dy = DIRECTIONS[ghost.direction] if ghost.direction is not None else (0, 0)
+        for side in (-1, 1):
+            eye = (x + side * 4, y - 2)
+            renderer.add(pygame.draw.circle(self.window, WHITE, eye, 3))
+            pygame.draw.circle(self.window, EYE_COLOR, (eye[0] + dx, eye[1] + dy), 1)
 
-    def run(self):
-        """运行游戏主循环
-        
-        控制游戏的主要流程，包括更新游戏状态、处理碰撞、渲染画面等
+    def draw(self, alpha=1.0):
+        """绘制游戏画面
+
+        参数:
+            alpha: 插值系数，在上一次和这一次逻辑更新的位置之间插值绘制玩家和鬼
         """
-        clock = pygame.time.Clock()
-
-        while True:
-            if self.handle_keys():  # 如果返回True，表示要返回主菜单
-                break
-
-            if not self.game_over:
-                # 更新敌人位置
-                for enemy in self.enemies:
-                    enemy.move(self.player.x, self.player.y)
-
-                # 检查碰撞
-                self.check_collisions()
-
-            # 绘制游戏画面
-            self.window.fill(BLACK)
-            
-            # 绘制所有对象
-            for candy in self.candies:
-                candy.draw(self.window)
-            for enemy in self.enemies:
-                enemy.draw(self.window)
-            self.player.draw(self.window)
-
-            # 显示分数和生命值
-            score_text = self.font.render(f'得分: {self.player.score}', True, WHITE)
-            lives_text = self.font.render(f'生命: {self.player.lives}', True, WHITE)
-            self.window.blit(score_text, (10, 10))
-            self.window.blit(lives_text, (10, 50))
-
-            if self.game_over:
-                game_over_text = self.font.render('游戏结束! 按R重新开始', True, WHITE)
-                text_rect = game_over_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
-                self.window.blit(game_over_text, text_rect)
-
-            pygame.display.flip()
-            clock.tick(60)  # 控制游戏速度，60帧每秒
+        renderer = self.renderer
+        # 游戏结束后画面不变，只画一次
+        if renderer.skip('game over' if self.game_over else None):
+            return
+        renderer.begin()  # 擦掉上一帧画的内容
+
+        positions = self.positions()
+        if self.previous is not None:
+            for i, ((x0, y0), (x1, y1)) in enumerate(zip(self.previous, positions)):
+                # 穿过隧道时位置从一边跳到另一边，不插值
+                if abs(x1 - x0) <= GRID_SIZE and abs(y1 - y0) <= GRID_SIZE:
+                    positions[i] = (lerp(x0, x1, alpha), lerp(y0, y1, alpha))
+
+        for ghost, (x, y) in zip(self.ghosts, positions[1:]):
+            self.draw_ghost(ghost, x, y)
+        player = self.player
+        # 方向下标转换为嘴巴朝向的角度：上90、左180、下270、右0
+        angle = 90 * (player.direction + 1) % 360 if player.direction is not None else 0
+        renderer.add(draw_pacman(self.window, *positions[0], PLAYER_RADIUS, angle))
+
+        # 显示分数、关卡和生命值
+        score_text = render_text(self.font, f'得分: {player.score}', WHITE)
+        level_text = render_text(self.font, f'关卡: {self.level}', WHITE)
+        lives_text = render_text(self.font, f'生命: {player.lives}', WHITE)
+        renderer.add(self.window.blit(score_text, (10, 10)))
+        renderer.add(self.window.blit(level_text, level_text.get_rect(midtop=(WINDOW_WIDTH // 2, 10))))
+        renderer.add(self.window.blit(lives_text, lives_text.get_rect(topright=(WINDOW_WIDTH - 10, 10))))
+
+        if self.game_over:
+            game_over_text = render_text(self.font, '游戏结束! 按R重新开始', WHITE)
+            text_rect = game_over_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
+            renderer.add(self.window.blit(game_over_text, text_rect))
+
+        renderer.end()
+
+    def run(self):
+        """运行游戏主循环，按M键切换回开阔场地模式"""
+        return run_pacman(self)
 
 if __name__ == '__main__':
     game = Game()
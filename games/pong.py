@@ -1,7 +1,9 @@
 import pygame
 import sys
-import random
-import math
+from games.core.pong import PongCore, PADDLE_WIDTH, PADDLE_HEIGHT
+from games.loop import GameLoop, lerp
+from games.render import DirtyRenderer, StaticLayer
+from games.text import get_font, render_text
 
 # 颜色定义
 BLACK = (0, 0, 0)
@@ -13,119 +15,56 @@
 # 游戏配置
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
-PADDLE_WIDTH = 15
-PADDLE_HEIGHT = 90
-BALL_SIZE = 15
-PADDLE_SPEED = 5
-BALL_SPEED = 7
 
 # 全局变量
 window = None
 
-class Paddle:
-    """挡板类
-    
-    玩家控制的挡板，可以上下移动来击球
-    
-    属性:
-        rect: 挡板的矩形区域
-        speed: 移动速度
-        score: 得分
-    """
-    def __init__(self, x, color):
-        """初始化挡板
-        
-        参数:
-            x: 挡板的水平位置
-            color: 挡板的颜色
-        """
-        self.rect = pygame.Rect(x, WINDOW_HEIGHT//2 - PADDLE_HEIGHT//2,
-                              PADDLE_WIDTH, PADDLE_HEIGHT)
-        self.speed = PADDLE_SPEED
-        self.score = 0
-        self.color = color
-    
-    def move(self, up=True):
-        """移动挡板
-        
-        参数:
-            up: True表示向上移动，False表示向下移动
-        """
-        if up and self.rect.top > 0:
-            self.rect.y -= self.speed
-        if not up and self.rect.bottom < WINDOW_HEIGHT:
-            self.rect.y += self.speed
-    
-    def draw(self):
-        """绘制挡板"""
-        pygame.draw.rect(window, self.color, self.rect)
 
-class Ball:
-    """球类
-    
-    游戏中的球，在场地中移动并与挡板碰撞
-    
-    属性:
-        rect: 球的矩形区域
-        dx: 水平速度
-        dy: 垂直速度
-        speed: 移动速度
+def _paint_net(surface, color):
+    """画中间的虚线分隔线
+
+    参数:
+        surface: 图层（宽度为分隔线宽度，高度为窗口高度）
+        color: 分隔线颜色
     """
-    def __init__(self):
-        """初始化球"""
-        self.rect = pygame.Rect(WINDOW_WIDTH//2 - BALL_SIZE//2,
-                              WINDOW_HEIGHT//2 - BALL_SIZE//2,
-                              BALL_SIZE, BALL_SIZE)
-        self.speed = BALL_SPEED
-        self.reset()
-    
-    def reset(self):
-        """重置球的位置和速度"""
-        self.rect.center = (WINDOW_WIDTH//2, WINDOW_HEIGHT//2)
-        angle = random.uniform(-math.pi/4, math.pi/4)
-        if random.choice([True, False]):
-            angle += math.pi
-        self.dx = self.speed * math.cos(angle)
-        self.dy = self.speed * math.sin(angle)
-    
-    def move(self):
-        """移动球"""
-        self.rect.x += self.dx
-        self.rect.y += self.dy
-        
-        # 检查上下边界碰撞
-        if self.rect.top <= 0 or self.rect.bottom >= WINDOW_HEIGHT:
-            self.dy *= -1
-    
-    def draw(self):
-        """绘制球"""
-        pygame.draw.ellipse(window, WHITE, self.rect)
+    for y in range(0, surface.get_height(), 20):
+        pygame.draw.rect(surface, color, (0, y, surface.get_width(), 10))
+
+
+# 分隔线的静态图层
+NET_LAYER = StaticLayer(_paint_net)
 
-class Game:
+class Game(PongCore):
     """游戏主类
     
-    控制游戏的主要逻辑，包括初始化、更新和渲染
+    在PongCore的游戏逻辑之上负责窗口、输入和渲染
     
     属性:
-        player1: 左侧玩家
-        player2: 右侧玩家
-        ball: 球
-        game_over: 游戏是否结束
         paused: 游戏是否暂停
+        action: 本帧两个挡板的移动方向，-1向上，1向下，0不动
+        previous: 上一次逻辑更新前的(球心x, 球心y, 左挡板y, 右挡板y)，用于渲染插值
+        loop: 固定步长游戏循环
+        renderer: 脏矩形渲染器
     """
-    def __init__(self):
-        """初始化游戏"""
+    def __init__(self, seed=None):
+        """初始化游戏
+
+        参数:
+            seed: 随机种子，None表示新生成一个；同样的种子和输入得到同样的对局
+        """
         global window
         window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption('弹球')
         
-        self.player1 = Paddle(50, BLUE)
-        self.player2 = Paddle(WINDOW_WIDTH - 50 - PADDLE_WIDTH, RED)
-        self.ball = Ball()
-        self.game_over = False
+        PongCore.__init__(self, seed)
         self.paused = False
-        self.font = pygame.font.SysFont('SimHei', 36)
-        self.win_score = 5  # 获胜所需分数
+        self.action = (0, 0)
+        self.previous = None
+        self.loop = GameLoop()
+        self.renderer = DirtyRenderer(window, BLACK)
+        # 中间分隔线不会改变，直接画在背景层上
+        self.renderer.background.blit(NET_LAYER.render((10, WINDOW_HEIGHT), WHITE), (WINDOW_WIDTH//2 - 5, 0))
+        self.font = get_font()
     
     def handle_input(self):
         """处理用户输入"""
@@ -145,18 +84,19 @@ def handle_input(self):
                 elif event.button == 0 and self.game_over:  # A键重新开始
                     self.__init__()
         
+        direction1 = direction2 = 0
         if not self.paused and not self.game_over:
             keys = pygame.key.get_pressed()
             # 玩家1控制（W/S键）
             if keys[pygame.K_w]:
-                self.player1.move(True)
+                direction1 = -1
             if keys[pygame.K_s]:
-                self.player1.move(False)
+                direction1 = 1
             # 玩家2控制（上/下方向键）
             if keys[pygame.K_UP]:
-                self.player2.move(True)
+                direction2 = -1
             if keys[pygame.K_DOWN]:
-                self.player2.move(False)
+                direction2 = 1
             
             # 手柄控制
             if pygame.joystick.get_count() > 0:
@@ -165,96 +105,88 @@ def handle_input(self):
                     joystick1 = pygame.joystick.Joystick(0)
                     axis_y1 = joystick1.get_axis(1)  # 左摇杆垂直轴
                     if axis_y1 < -0.5:
-                        self.player1.move(True)
+                        direction1 = -1
                     elif axis_y1 > 0.5:
-                        self.player1.move(False)
+                        direction1 = 1
                     
                     # 如果有第二个手柄，用于控制玩家2
                     if pygame.joystick.get_count() > 1:
                         joystick2 = pygame.joystick.Joystick(1)
                         axis_y2 = joystick2.get_axis(1)  # 左摇杆垂直轴
                         if axis_y2 < -0.5:
-                            self.player2.move(True)
+                            direction2 = -1
                         elif axis_y2 > 0.5:
-                            self.player2.move(False)
+                            direction2 = 1
                 except pygame.error:
                     pass
+        self.action = (direction1, direction2)
     
     def update(self):
-        """更新游戏状态"""
-        if not self.paused and not self.game_over:
-            self.ball.move()
-            
-            # 检查球与挡板的碰撞
-            if self.ball.rect.colliderect(self.player1.rect):
-                self.ball.dx = abs(self.ball.dx)  # 确保球向右移动
-                # 根据击球位置改变反弹角度
-                relative_intersect_y = (self.player1.rect.centery - self.ball.rect.centery)
-                normalized_intersect = relative_intersect_y / (PADDLE_HEIGHT/2)
-                bounce_angle = normalized_intersect * math.pi/3  # 最大反弹角度为60度
-                self.ball.dy = -self.ball.speed * math.sin(bounce_angle)
-            
-            elif self.ball.rect.colliderect(self.player2.rect):
-                self.ball.dx = -abs(self.ball.dx)  # 确保球向左移动
-                # 根据击球位置改变反弹角度
-                relative_intersect_y = (self.player2.rect.centery - self.ball.rect.centery)
-                normalized_intersect = relative_intersect_y / (PADDLE_HEIGHT/2)
-                bounce_angle = normalized_intersect * math.pi/3  # 最大反弹角度为60度
-                self.ball.dy = -self.ball.speed * math.sin(bounce_angle)
-            
-            # 检查得分
-            if self.ball.rect.left <= 0:
-                self.player2.score += 1
-                self.ball.reset()
-            elif self.ball.rect.right >= WINDOW_WIDTH:
-                self.player1.score += 1
-                self.ball.reset()
-            
-            # 检查游戏是否结束
-            if self.player1.score >= self.win_score or self.player2.score >= self.win_score:
-                self.game_over = True
+        """推进一个逻辑步长"""
+        if not self.paused:
+            # 记录更新前的位置，渲染时在两次更新之间插值
+            self.previous = (self.ball.x, self.ball.y, self.player1.rect.y, self.player2.rect.y)
+            scores = (self.player1.score, self.player2.score)
+            self.step(self.action)
+            if scores != (self.player1.score, self.player2.score):
+                self.previous = None  # 得分后球回到中间重新发球，不插值
+        else:
+            self.previous = None
     
-    def draw(self):
-        """绘制游戏画面"""
-        window.fill(BLACK)
-        
-        # 绘制中间分隔线
-        for y in range(0, WINDOW_HEIGHT, 20):
-            pygame.draw.rect(window, WHITE,
-                           (WINDOW_WIDTH//2 - 5, y, 10, 10))
+    def draw(self, alpha=1.0):
+        """绘制游戏画面
+
+        参数:
+            alpha: 插值系数，在上一次和这一次逻辑更新的位置之间插值绘制球和挡板
+        """
+        renderer = self.renderer
+        # 暂停或游戏结束时画面不变，只画一次
+        if renderer.skip((self.game_over, self.player1.score, self.player2.score)
+                         if self.game_over or self.paused else None):
+            return
+        renderer.begin()  # 擦掉上一帧画的内容
         
         # 绘制玩家和球
-        self.player1.draw()
-        self.player2.draw()
-        self.ball.draw()
+        ball_x, ball_y = self.ball.x, self.ball.y
+        paddle1_y, paddle2_y = self.player1.rect.y, self.player2.rect.y
+        if self.previous is not None:
+            previous_x, previous_y, previous1_y, previous2_y = self.previous
+            ball_x = lerp(previous_x, ball_x, alpha)
+            ball_y = lerp(previous_y, ball_y, alpha)
+            paddle1_y = lerp(previous1_y, paddle1_y, alpha)
+            paddle2_y = lerp(previous2_y, paddle2_y, alpha)
+        renderer.add(pygame.draw.rect(window, self.player1.color,
+                                      (self.player1.rect.x, round(paddle1_y), PADDLE_WIDTH, PADDLE_HEIGHT)))
+        renderer.add(pygame.draw.rect(window, self.player2.color,
+                                      (self.player2.rect.x, round(paddle2_y), PADDLE_WIDTH, PADDLE_HEIGHT)))
+        ball_rect = pygame.Rect(0, 0, self.ball.rect.width, self.ball.rect.height)
+        ball_rect.center = (round(ball_x), round(ball_y))
+        renderer.add(pygame.draw.ellipse(window, WHITE, ball_rect))
         
         # 显示分数
-        score1_text = self.font.render(str(self.player1.score), True, BLUE)
-        score2_text = self.font.render(str(self.player2.score), True, RED)
-        window.blit(score1_text, (WINDOW_WIDTH//4, 20))
-        window.blit(score2_text, (3*WINDOW_WIDTH//4, 20))
+        score1_text = render_text(self.font, str(self.player1.score), BLUE)
+        score2_text = render_text(self.font, str(self.player2.score), RED)
+        renderer.add(window.blit(score1_text, (WINDOW_WIDTH//4, 20)))
+        renderer.add(window.blit(score2_text, (3*WINDOW_WIDTH//4, 20)))
         
         # 显示游戏结束信息
         if self.game_over:
             winner = "蓝方" if self.player1.score > self.player2.score else "红方"
-            game_over_text = self.font.render(f'{winner}获胜! 按R键重新开始', True, WHITE)
+            game_over_text = render_text(self.font, f'{winner}获胜! 按R键重新开始', WHITE)
             text_rect = game_over_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2))
-            window.blit(game_over_text, text_rect)
+            renderer.add(window.blit(game_over_text, text_rect))
         
         # 显示暂停信息
         elif self.paused:
-            pause_text = self.font.render('游戏暂停', True, WHITE)
+            pause_text = render_text(self.font, '游戏暂停', WHITE)
             text_rect = pause_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2))
-            window.blit(pause_text, text_rect)
+            renderer.add(window.blit(pause_text, text_rect))
         
-        pygame.display.flip()
+        renderer.end()
     
     def run(self):
-        """运行游戏主循环"""
-        clock = pygame.time.Clock()
-        
-        while True:
-            self.handle_input()
-            self.update()
-            self.draw()
-            clock.tick(60)
\ No newline at end of file
+        """运行游戏主循环
+
+        逻辑按固定步长更新（见games.loop.GameLoop），渲染按显示帧率进行
+        """
+        return self.loop.run(self.handle_input, self.update, self.draw)
@@ -0,0 +1,207 @@
+"""脏矩形渲染
+
+每帧不再清空整个窗口、重画所有内容再整屏刷新，而是：
+- 背景层（background）只画一次：背景色以及很少改变的内容（例如砖块），
+  内容改变时由游戏重画背景层的对应区域并调用repaint
+- 每帧会变的内容（球、挡板、文字等）直接画到窗口上，并用add登记画到的矩形
+- 下一帧开始时只用背景层盖住上一帧登记过的矩形，最后只把这些区域
+  （上一帧的旧位置、这一帧的新位置和背景层改变的区域）提交给pygame.display.update
+
+画面完全静止时（例如暂停菜单、等待落子），游戏可以用skip传入描述当前画面的键，
+键与上一帧相同时整帧什么都不画、不提交，空闲时几乎不占用CPU。
+
+棋盘线、网格、球网这类完全不变的内容用StaticLayer预先画到一张Surface上，
+只在尺寸或主题改变时重画，画到背景层上只需要一次blit。
+
+暂停菜单的半透明遮罩、胜利棋子的光晕这类每帧都要画的半透明Surface
+用overlay_surface和glow_surface从共享的池中取得，每种只创建一次，之后只改透明度。
+"""
+import pygame
+
+# 为False时退回每帧整屏重画、整屏刷新（调试用）
+DIRTY_RECTS = True
+
+
+class DirtyRenderer:
+    """脏矩形渲染器
+
+    用法：每帧先调用begin，画动态内容时用add登记矩形，最后调用end提交。
+
+    属性:
+        window: pygame显示窗口
+        background: 背景层
+        dirty_rects: 是否只提交改变的区域（False时整屏刷新）
+    """
+    def __init__(self, window, color, dirty_rects=DIRTY_RECTS):
+        """创建渲染器和纯色的背景层
+
+        参数:
+            window: pygame显示窗口
+            color: 背景色
+            dirty_rects: 是否只提交改变的区域
+        """
+        self.window = window
+        self.background = pygame.Surface(window.get_size())
+        self.background.fill(color)
+        self.dirty_rects = dirty_rects
+        self._full = True
+        self._sprites = []
+        self._erased = []
+        self._repainted = []
+        self._key = None
+
+    def invalidate(self):
+        """下一帧整屏重画（背景层整体改变时调用）"""
+        self._full = True
+
+    def repaint(self, rect):
+        """背景层的一块区域已经改变，下一帧提交这块区域
+
+        参数:
+            rect: 改变的区域
+        """
+        self._repainted.append(pygame.Rect(rect))
+
+    def skip(self, key):
+        """判断这一帧是否可以不画
+
+        参数:
+            key: 描述当前画面的可哈希对象；画面在动（每帧都可能不同）时传入None
+
+        返回:
+            bool: True表示画面与上一帧完全相同，这一帧不需要begin/end
+        """
+        if (key is not None and key == self._key and
+                not self._full and not self._repainted):
+            return True
+        self._key = key
+        return False
+
+    def begin(self):
+        """开始一帧：用背景层盖住上一帧画过的动态内容"""
+        window = self.window
+        background = self.background
+        if self._full or not self.dirty_rects:
+            window.blit(background, (0, 0))
+        else:
+            for rect in self._sprites:
+                window.blit(background, rect, rect)
+            for rect in self._repainted:
+                window.blit(background, rect, rect)
+        self._erased = self._sprites
+        self._sprites = []
+
+    def add(self, rect):
+        """登记这一帧画到的矩形
+
+        参数:
+            rect: 画到的区域（pygame.draw和blit的返回值可以直接传入）
+
+        返回:
+            pygame.Rect: 传入的矩形
+        """
+        self._sprites.append(pygame.Rect(rect))
+        return rect
+
+    def end(self):
+        """结束一帧，提交改变的区域"""
+        if self._full or not self.dirty_rects:
+            pygame.display.flip()
+        else:
+            rects = self._erased + self._repainted + self._sprites
+            if rects:
+                pygame.display.update(rects)
+        self._full = False
+        self._erased = []
+        self._repainted = []
+
+
+class StaticLayer:
+    """预先渲染的静态图层
+
+    第一次使用时调用paint把内容画到一张Surface上，之后每次直接返回这张Surface，
+    整个图层只需要一次blit。尺寸或主题（颜色等）改变时自动重画。
+
+    属性:
+        paint: 绘制函数，参数为(surface, theme)
+    """
+    def __init__(self, paint):
+        """创建图层
+
+        参数:
+            paint: 绘制函数，参数为(surface, theme)
+        """
+        self.paint = paint
+        self._surface = None
+        self._key = None
+
+    def invalidate(self):
+        """丢弃缓存的图层，下次使用时重画"""
+        self._surface = None
+
+    def render(self, size, theme=None):
+        """取得图层
+
+        参数:
+            size: 图层尺寸(width, height)
+            theme: 影响绘制结果的可哈希对象（例如颜色），改变时重画
+
+        返回:
+            pygame.Surface: 画好的图层（透明背景）
+        """
+        key = (tuple(size), theme)
+        if self._surface is None or key != self._key:
+            self._surface = pygame.Surface(size, pygame.SRCALPHA)
+            self.paint(self._surface, theme)
+            self._key = key
+        return self._surface
+
+
+# 共享的半透明Surface，键为(种类, 尺寸, 颜色)
+_pool = {}
+
+
+def overlay_surface(size, color, alpha):
+    """取得纯色半透明遮罩（例如暂停菜单下面盖住画面的一层）
+
+    同样尺寸和颜色的遮罩只创建一次，之后只修改透明度。返回的Surface由所有调用者共用，
+    不要在上面作画。
+
+    参数:
+        size: 遮罩尺寸(width, height)
+        color: 遮罩颜色
+        alpha: 透明度（0到255）
+
+    返回:
+        pygame.Surface: 设置好透明度的遮罩
+    """
+    key = ('overlay', tuple(size), tuple(color))
+    surface = _pool.get(key)
+    if surface is None:
+        surface = _pool[key] = pygame.Surface(size)
+        surface.fill(color)
+    surface.set_alpha(alpha)
+    return surface
+
+
+def glow_surface(diameter, color, alpha):
+    """取得圆形光晕（透明背景上的实心圆）
+
+    同样直径和颜色的光晕只画一次，之后只修改整张Surface的透明度。返回的Surface由所有调用者共用，
+    不要在上面作画。
+
+    参数:
+        diameter: 光晕直径，圆心在Surface中央
+        color: 光晕颜色(r, g, b)
+        alpha: 透明度（0到255）
+
+    返回:
+        pygame.Surface: 设置好透明度的光晕
+    """
+    key = ('glow', diameter, tuple(color))
+    surface = _pool.get(key)
+    if surface is None:
+        surface = _pool[key] = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
+        pygame.draw.circle(surface, color, (diameter / 2, diameter / 2), diameter / 2)
+    surface.set_alpha(alpha)
+    return surface
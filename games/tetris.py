@@ -1,145 +1,69 @@
 import pygame
-import random
 import sys
+from games.core.tetris import TetrisCore, GRID_WIDTH
+from games.core.tetris_board import GRID_HEIGHT
+from games.core.tetris_ai import TetrisAI
+from games.loop import GameLoop
+from games.render import DirtyRenderer, StaticLayer
+from games.text import get_font, render_text
 
 # 颜色定义
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
-RED = (255, 0, 0)
-GREEN = (0, 255, 0)
-BLUE = (0, 0, 255)
-CYAN = (0, 255, 255)
-MAGENTA = (255, 0, 255)
-YELLOW = (255, 255, 0)
-ORANGE = (255, 165, 0)
+GRAY = (128, 128, 128)
 
 # 游戏配置
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
 BLOCK_SIZE = 25
-GRID_WIDTH = 10
-GRID_HEIGHT = 20
 GRID_X = (WINDOW_WIDTH - GRID_WIDTH * BLOCK_SIZE) // 2
 GRID_Y = (WINDOW_HEIGHT - GRID_HEIGHT * BLOCK_SIZE) // 2
 
 # 全局变量
 window = None
 
-# 方块形状定义
-TETROMINOS = {
-    'I': [
-        [[0, 0, 0, 0],
-         [1, 1, 1, 1],
-         [0, 0, 0, 0],
-         [0, 0, 0, 0]],
-        CYAN
-    ],
-    'O': [
-        [[1, 1],
-         [1, 1]],
-        YELLOW
-    ],
-    'T': [
-        [[0, 1, 0],
-         [1, 1, 1],
-         [0, 0, 0]],
-        MAGENTA
-    ],
-    'S': [
-        [[0, 1, 1],
-         [1, 1, 0],
-         [0, 0, 0]],
-        GREEN
-    ],
-    'Z': [
-        [[1, 1, 0],
-         [0, 1, 1],
-         [0, 0, 0]],
-        RED
-    ],
-    'J': [
-        [[1, 0, 0],
-         [1, 1, 1],
-         [0, 0, 0]],
-        BLUE
-    ],
-    'L': [
-        [[0, 0, 1],
-         [1, 1, 1],
-         [0, 0, 0]],
-        ORANGE
-    ]
-}
 
-class Tetromino:
-    """俄罗斯方块类
-    
-    表示一个正在下落的方块。包含方块的形状、位置和旋转状态。
-    
-    属性:
-        shape: 方块形状
-        color: 方块颜色
-        x: 方块在网格中的x坐标
-        y: 方块在网格中的y坐标
-        rotation: 当前旋转状态
-    """
-    def __init__(self):
-        """初始化方块
-        
-        随机选择一个方块形状并设置初始位置
-        """
-        self.shape = random.choice(list(TETROMINOS.keys()))
-        self.blocks = TETROMINOS[self.shape][0]
-        self.color = TETROMINOS[self.shape][1]
-        self.x = GRID_WIDTH // 2 - len(self.blocks[0]) // 2
-        self.y = 0
-        self.rotation = 0
-    
-    def rotate(self):
-        """旋转方块
-        
-        将方块顺时针旋转90度
-        """
-        # 创建新的旋转后的方块数组
-        rotated = [[0 for _ in range(len(self.blocks))] for _ in range(len(self.blocks[0]))]
-        for i in range(len(self.blocks)):
-            for j in range(len(self.blocks[0])):
-                rotated[j][len(self.blocks) - 1 - i] = self.blocks[i][j]
-        return rotated
+def _paint_grid(surface, color):
+    """画出空网格的格线"""
+    for y in range(GRID_HEIGHT):
+        for x in range(GRID_WIDTH):
+            pygame.draw.rect(surface, color, (x * BLOCK_SIZE, y * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE), 1)
+
 
-class Game:
+# 空网格只画一次，所有对局共用
+GRID_LAYER = StaticLayer(_paint_grid)
+
+class Game(TetrisCore):
     """游戏主类
     
-    控制游戏的主要逻辑，包括初始化、更新和渲染
+    在TetrisCore的游戏逻辑之上负责窗口、输入和渲染
     
     属性:
-        grid: 游戏网格
-        current_piece: 当前下落的方块
-        next_piece: 下一个方块
-        score: 得分
-        level: 当前等级
-        game_over: 游戏是否结束
         paused: 游戏是否暂停
+        autoplay: 是否由自动玩家操作
+        loop: 固定步长游戏循环
+        renderer: 脏矩形渲染器
     """
-    def __init__(self):
+    def __init__(self, seed=None):
         """初始化游戏
         
         创建游戏窗口，初始化游戏状态
+
+        参数:
+            seed: 随机种子，None表示新生成一个；同样的种子和输入得到同样的对局
         """
         global window
         window = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption('俄罗斯方块')
         
-        self.grid = [[None for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
-        self.current_piece = Tetromino()
-        self.next_piece = Tetromino()
-        self.score = 0
-        self.level = 1
-        self.game_over = False
+        TetrisCore.__init__(self, seed)
         self.paused = False
-        self.fall_time = 0
-        self.fall_speed = 1000  # 初始下落速度（毫秒）
-        self.font = pygame.font.SysFont('SimHei', 36)
+        self.font = get_font()
+        self.autoplay = False
+        self.ai = TetrisAI()
+        self.loop = GameLoop()
+        self.renderer = DirtyRenderer(window, BLACK)
+        self.draw_field()
     
     def handle_input(self):
         """处理用户输入
@@ -165,6 +89,8 @@ def handle_input(self):
                         self.move_piece_down()
                     elif event.key == pygame.K_SPACE:
                         self.drop_piece()
+                    elif event.key == pygame.K_a:
+                        self.autoplay = not self.autoplay
                 elif event.key == pygame.K_r and self.game_over:
                     self.__init__()
             
@@ -177,6 +103,8 @@ def handle_input(self):
                         self.rotate_piece()
                     elif event.button == 1:  # B键
                         self.drop_piece()
+                    elif event.button == 3:  # Y键
+                        self.autoplay = not self.autoplay
                 elif event.button == 0 and self.game_over:  # A键重新开始
                     self.__init__()
         
@@ -203,142 +131,123 @@ def handle_input(self):
             except pygame.error:
                 pass
     
-    def move_piece(self, dx):
-        """移动方块
-        
-        水平移动当前方块
-        
-        参数:
-            dx: 移动的方向（-1为左，1为右）
-        """
-        self.current_piece.x += dx
-        if not self.is_valid_move():
-            self.current_piece.x -= dx
-    
-    def rotate_piece(self):
-        """旋转方块
-        
-        尝试旋转当前方块，如果旋转后位置无效则取消旋转
-        """
-        old_blocks = self.current_piece.blocks
-        self.current_piece.blocks = self.current_piece.rotate()
-        if not self.is_valid_move():
-            self.current_piece.blocks = old_blocks
-    
-    def move_piece_down(self):
-        """向下移动方块
-        
-        将当前方块向下移动一格
-        """
-        self.current_piece.y += 1
-        if not self.is_valid_move():
-            self.current_piece.y -= 1
-            self.place_piece()
-    
-    def drop_piece(self):
-        """快速下落
-        
-        将当前方块直接下落到底部
-        """
-        while self.is_valid_move():
-            self.current_piece.y += 1
-        self.current_piece.y -= 1
-        self.place_piece()
-    
-    def is_valid_move(self):
-        """检查移动是否有效
-        
-        检查当前方块的位置是否合法
-        
-        返回:
-            bool: 如果移动有效返回True，否则返回False
-        """
-        for y, row in enumerate(self.current_piece.blocks):
-            for x, cell in enumerate(row):
-                if cell:
-                    if (self.current_piece.x + x < 0 or
-                        self.current_piece.x + x >= GRID_WIDTH or
-                        self.current_piece.y + y >= GRID_HEIGHT or
-                        (self.current_piece.y + y >= 0 and
-                         self.grid[self.current_piece.y + y][self.current_piece.x + x])):
-                        return False
-        return True
-    
+    def draw_field(self):
+        """把网格和所有已固定的方块重新画到背景层上"""
+        background = self.renderer.background
+        area = pygame.Rect(GRID_X, GRID_Y, GRID_WIDTH * BLOCK_SIZE, GRID_HEIGHT * BLOCK_SIZE)
+        background.fill(BLACK, area)
+        background.blit(GRID_LAYER.render(area.size, WHITE), area)
+        for y in range(GRID_HEIGHT):
+            for x in range(GRID_WIDTH):
+                if self.grid[y][x]:
+                    self.draw_cell(x, y)
+        self.renderer.repaint(area)
+
+    def draw_cell(self, x, y):
+        """把一个已固定的方块画到背景层上"""
+        pygame.draw.rect(self.renderer.background, self.grid[y][x],
+                         (GRID_X + x * BLOCK_SIZE + 1,
+                          GRID_Y + y * BLOCK_SIZE + 1,
+                          BLOCK_SIZE - 2, BLOCK_SIZE - 2))
+
     def place_piece(self):
-        """放置方块
-        
-        将当前方块固定到网格中，检查是否有可以消除的行
+        """放置方块，并把新固定的方块画到背景层上
+
+        没有消行时只画方块的几个格子；消行后所有行都移动了，整个场地重画
         """
-        for y, row in enumerate(self.current_piece.blocks):
-            for x, cell in enumerate(row):
-                if cell:
-                    if self.current_piece.y + y < 0:
-                        self.game_over = True
-                        return
-                    self.grid[self.current_piece.y + y][self.current_piece.x + x] = self.current_piece.color
-        
-        # 检查是否有完整的行
-        lines_cleared = 0
-        y = GRID_HEIGHT - 1
-        while y >= 0:
-            if all(cell is not None for cell in self.grid[y]):
-                lines_cleared += 1
-                for y2 in range(y, 0, -1):
-                    self.grid[y2] = self.grid[y2 - 1][:]
-                self.grid[0] = [None] * GRID_WIDTH
-            else:
-                y -= 1
-        
-        # 更新分数
-        if lines_cleared > 0:
-            self.score += [100, 300, 500, 800][lines_cleared - 1] * self.level
-            self.level = self.score // 5000 + 1
-            self.fall_speed = max(100, 1000 - (self.level - 1) * 100)
-        
-        # 生成新方块
-        self.current_piece = self.next_piece
-        self.next_piece = Tetromino()
-    
+        piece = self.current_piece
+        cells = [(piece.x + x, piece.y + y) for x, y in piece.cells]
+        score = self.score
+        TetrisCore.place_piece(self)
+        if self.score != score or self.game_over:
+            self.draw_field()
+            return
+        for x, y in cells:
+            self.draw_cell(x, y)
+            self.renderer.repaint((GRID_X + x * BLOCK_SIZE, GRID_Y + y * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE))
+
     def draw(self):
         """绘制游戏画面
         
         绘制游戏网格、当前方块、下一个方块和游戏信息
         """
-        window.fill(BLACK)
-        
-        # 绘制网格
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                pygame.draw.rect(window, WHITE,
-                               (GRID_X + x * BLOCK_SIZE,
-                                GRID_Y + y * BLOCK_SIZE,
-                                BLOCK_SIZE, BLOCK_SIZE), 1)
-                if self.grid[y][x]:
-                    pygame.draw.rect(window, self.grid[y][x],
-                                   (GRID_X + x * BLOCK_SIZE + 1,
-                                    GRID_Y + y * BLOCK_SIZE + 1,
-                                    BLOCK_SIZE - 2, BLOCK_SIZE - 2))
+        renderer = self.renderer
+        # 方块没有移动、分数和状态也没有变化时画面不变，不需要重画
+        piece = self.current_piece
+        if renderer.skip((id(piece), piece.rotation, piece.x, piece.y, id(self.next_piece),
+                          self.score, self.level, self.game_over, self.paused, self.autoplay)):
+            return
+        # 网格和已固定的方块在背景层上（见place_piece），这里只画会动的内容
+        renderer.begin()  # 擦掉上一帧画的内容
+        
+        # 绘制落点预览（幽灵方块）
+        if not self.game_over:
+            ghost_y = self.ghost_y()
+            for x, y in self.current_piece.cells:
+                renderer.add(pygame.draw.rect(window, GRAY,
+                               (GRID_X + (self.current_piece.x + x) * BLOCK_SIZE + 1,
+                                GRID_Y + (ghost_y + y) * BLOCK_SIZE + 1,
+                                BLOCK_SIZE - 2, BLOCK_SIZE - 2), 2))
         
         # 绘制当前方块
         if not self.game_over:
             for y, row in enumerate(self.current_piece.blocks):
                 for x, cell in enumerate(row):
                     if cell:
-                        pygame.draw.rect(window, self.current_piece.color,
+                        renderer.add(pygame.draw.rect(window, self.current_piece.color,
                                        (GRID_X + (self.current_piece.x + x) * BLOCK_SIZE + 1,
                                         GRID_Y + (self.current_piece.y + y) * BLOCK_SIZE + 1,
-                                        BLOCK_SIZE - 2, BLOCK_SIZE - 2))
+                                        BLOCK_SIZE - 2, BLOCK_SIZE - 2)))
         
         # 绘制下一个方块预览
         preview_x = GRID_X + GRID_WIDTH * BLOCK_SIZE + 50
         preview_y = GRID_Y
-        pygame.draw.rect(window, WHITE, (preview_x, preview_y, 100, 100), 1)
+        renderer.add(pygame.draw.rect(window, WHITE, (preview_x, preview_y, 100, 100), 1))
         for y, row in enumerate(self.next_piece.blocks):
             for x, cell in enumerate(row):
                 if cell:
-                    pygame.draw.rect(window, self.next_piece.color,
+                    renderer.add(pygame.draw.rect(window, self.next_piece.color,
                                    (preview_x + x * BLOCK_SIZE + 10,
                                     preview_y + y * BLOCK_SIZE + 10,
-                                    BLOCK_SIZE - 2, BLOCK_SIZE - 2))
-        
-        # 显示分数
\ No newline at end of file
+                                    BLOCK_SIZE - 2, BLOCK_SIZE - 2)))
+        
+        # 显示分数
+        score_text = render_text(self.font, f'得分: {self.score}', WHITE)
+        level_text = render_text(self.font, f'等级: {self.level}', WHITE)
+        renderer.add(window.blit(score_text, (preview_x, preview_y + 120)))
+        renderer.add(window.blit(level_text, (preview_x, preview_y + 160)))
+        if self.autoplay:
+            auto_text = render_text(self.font, '自动', WHITE)
+            renderer.add(window.blit(auto_text, (preview_x, preview_y + 200)))
+        
+        # 显示游戏结束或暂停信息
+        if self.game_over:
+            game_over_text = render_text(self.font, '游戏结束! 按R重新开始', WHITE)
+            text_rect = game_over_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
+            renderer.add(window.blit(game_over_text, text_rect))
+        elif self.paused:
+            pause_text = render_text(self.font, '游戏暂停', WHITE)
+            text_rect = pause_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
+            renderer.add(window.blit(pause_text, text_rect))
+        
+        renderer.end()
+    
+    def update(self):
+        """推进一个逻辑步长
+
+        自动玩家每步执行一个动作，并按步长处理自动下落
+        """
+        if not self.paused:
+            action = self.ai.next_action(self) if self.autoplay and not self.game_over else None
+            self.step(action, self.loop.step_ms)
+
+    def run(self):
+        """运行游戏主循环
+
+        逻辑按固定步长更新（见games.loop.GameLoop），渲染按显示帧率进行
+        """
+        self.loop.run(self.handle_input, self.update, lambda alpha: self.draw())
+
+if __name__ == '__main__':
+    game = Game()
+    game.run()
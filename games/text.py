@@ -0,0 +1,87 @@
+"""字体和文字缓存
+
+pygame.font.SysFont每次调用都要通过fontconfig查找字体文件（Linux上很慢），
+Font.render和smoothscale也要逐像素生成新的Surface。菜单和各游戏每帧都在画同样的几段文字，
+所以这里把两者都缓存起来：
+- get_font：按(字体名, 字号, 粗体)登记字体，整个进程中同一种字体只创建一次
+- render_text：按(字体, 文字, 颜色, 缩放档位)缓存渲染好的文字，最近最少使用的先淘汰
+
+缩放比例按SCALE_STEP取整到档位，菜单滚动时连续变化的缩放比例只会产生有限几种Surface。
+"""
+from collections import OrderedDict
+
+import pygame
+
+# 默认字体（系统黑体）和字号
+DEFAULT_FONT = 'SimHei'
+DEFAULT_SIZE = 36
+
+# 最多缓存的文字Surface数量
+TEXT_CACHE_SIZE = 256
+
+# 缩放比例的档位间隔
+SCALE_STEP = 1 / 64
+
+_fonts = {}
+_texts = OrderedDict()
+
+
+def get_font(name=DEFAULT_FONT, size=DEFAULT_SIZE, bold=False):
+    """取得字体，同一种字体只创建一次
+
+    参数:
+        name: 系统字体名
+        size: 字号
+        bold: 是否粗体
+
+    返回:
+        pygame.font.Font: 字体对象（所有调用者共用）
+    """
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.SysFont(name, size, bold=bold)
+    return font
+
+
+def render_text(font, text, color, scale=1.0):
+    """渲染一段抗锯齿文字，结果会被缓存
+
+    返回的Surface由所有调用者共用，不要在上面作画；
+    需要透明度时每次blit前都调用set_alpha。
+
+    参数:
+        font: get_font返回的字体
+        text: 文字
+        color: 文字颜色
+        scale: 缩放比例，按SCALE_STEP取整
+
+    返回:
+        pygame.Surface: 渲染好的文字；缩放后尺寸为0时返回None
+    """
+    bucket = round(scale / SCALE_STEP)
+    key = (font, text, tuple(color), bucket)
+    surface = _texts.get(key)
+    if surface is not None:
+        _texts.move_to_end(key)
+        return surface
+
+    if bucket * SCALE_STEP == 1:
+        surface = font.render(text, True, color)
+    else:
+        base = render_text(font, text, color)
+        size = (int(base.get_width() * bucket * SCALE_STEP),
+                int(base.get_height() * bucket * SCALE_STEP))
+        if size[0] <= 0 or size[1] <= 0:
+            return None
+        surface = pygame.transform.smoothscale(base, size)
+
+    _texts[key] = surface
+    if len(_texts) > TEXT_CACHE_SIZE:
+        _texts.popitem(last=False)
+    return surface
+
+
+def clear_cache():
+    """清空文字缓存（字体保留）"""
+    _texts.clear()
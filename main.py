@@ -2,6 +2,8 @@
 import sys
 import math  # 添加math模块导入
 import importlib
+from games.render import overlay_surface
+from games.text import get_font, render_text
 
 
 # 初始化 Pygame
@@ -80,7 +82,7 @@ def __init__(self):
         
         创建字体对象，设置游戏列表和初始状态
         """
-        self.font = pygame.font.SysFont('SimHei', 48)  # 使用系统黑体字体
+        self.font = get_font(size=48)  # 使用系统黑体字体
         # 初始化手柄
         self.joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
         for joystick in self.joysticks:
@@ -134,7 +136,8 @@ def init_games(self):
                     '欢迎来到贪吃蛇游戏！',
                     '使用↑↓←→方向键或手柄左摇杆/方向键控制蛇的移动',
                     '吃到红色食物可以让蛇变长',
-                    '注意不要撞到自己的身体',
+                    '注意不要撞到自己的身体，蛇占满整个场地即获胜',
+                    '按A键/手柄Y键开关自动驾驶',
                     '按ESC/手柄Start键暂停游戏，按R键/手柄A键重新开始'
                 ]
             },
@@ -142,12 +145,14 @@ def init_games(self):
                 'name': '吃糖豆',
                 'module': 'pacman',
                 'class': None,  # 延迟加载
-                'instructions': '使用方向键或手柄控制角色移动，吃掉糖豆，躲避敌人。按ESC/手柄Start键暂停，R键/手柄A键重新开始。',
+                'instructions': '使用方向键或手柄控制角色移动，吃掉糖豆，躲避敌人。按S键/手柄Y键切换虫群关卡，M键/手柄X键切换迷宫模式，按ESC/手柄Start键暂停，R键/手柄A键重新开始。',
                 'tutorial': [
                     '欢迎来到吃糖豆游戏！',
                     '使用↑↓←→方向键或手柄左摇杆/方向键控制角色移动',
                     '收集白色糖豆来得分',
                     '躲避彩色的敌人',
+                    '按S键/手柄Y键切换虫群关卡（几百个敌人、几千个糖豆）',
+                    '按M键/手柄X键切换经典迷宫模式：吃掉能量豆后可以反吃鬼',
                     '按ESC/手柄Start键暂停游戏，按R键/手柄A键重新开始'
                 ]
             },
@@ -162,6 +167,7 @@ def init_games(self):
                     '使用↑键或手柄A键旋转方块',
                     '使用↓键加速下落，空格键或手柄B键直接到底',
                     '消除完整的行来得分',
+                    '灰色方框显示方块的落点，按A键/手柄Y键开关自动游戏',
                     '按ESC/手柄Start键暂停游戏，按R键/手柄A键重新开始'
                 ]
             },
@@ -183,12 +189,13 @@ def init_games(self):
                 'name': '五子棋',
                 'module': 'gomoku',
                 'class': None,  # 延迟加载
-                'instructions': '双人对战，使用鼠标点击落子，黑白双方轮流下棋。按ESC/手柄Start键暂停，R键/手柄A键重新开始。',
+                'instructions': '双人或人机对战，使用鼠标点击落子，黑白双方轮流下棋。按M键/手柄Y键切换模式，按ESC/手柄Start键暂停，R键/手柄A键重新开始。',
                 'tutorial': [
                     '欢迎来到五子棋游戏！',
                     '黑白双方轮流下棋',
                     '使用鼠标点击棋盘落子',
                     '先连成五子的一方获胜',
+                    '按M键/手柄Y键切换双人对战和人机对战（电脑执白棋）',
                     '按ESC/手柄Start键暂停游戏，按R键/手柄A键重新开始'
                 ]
             },
@@ -203,6 +210,7 @@ def init_games(self):
                     '相同数字的方块相撞会合并并翻倍',
                     '尽可能获得更高的分数',
                     '当无法移动时游戏结束',
+                    '按H键/手柄X键获得提示，按A键/手柄Y键开关自动游戏',
                     '按ESC/手柄Start键暂停游戏，按R键/手柄A键重新开始'
                 ]
             },
@@ -235,7 +243,7 @@ def draw(self):
         window.fill(BLACK)
         
         # 绘制标题
-        title = self.font.render('小游戏集合', True, WHITE)
+        title = render_text(self.font, '小游戏集合', WHITE)
         title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 100))
         window.blit(title, title_rect)
         
@@ -267,22 +275,19 @@ def draw(self):
             
             # 绘制游戏选项
             color = RED if i == self.selected else WHITE
-            text = self.font.render(self.games[i]['name'], True, color)
-            # 缩放文本
-            scaled_size = (int(text.get_width() * scale), int(text.get_height() * scale))
-            if scaled_size[0] > 0 and scaled_size[1] > 0:  # 确保尺寸大于0
-                scaled_text = pygame.transform.smoothscale(text, scaled_size)
-                # 设置透明度
+            # 缩放后的文本按缩放档位缓存，不再每帧smoothscale
+            scaled_text = render_text(self.font, self.games[i]['name'], color, scale)
+            if scaled_text is not None:  # 确保尺寸大于0
+                # 设置透明度（缓存的Surface是共用的，每次blit前都要设置）
                 scaled_text.set_alpha(alpha)
                 text_rect = scaled_text.get_rect(center=(WINDOW_WIDTH // 2, y_pos))
                 window.blit(scaled_text, text_rect)
         
         # 显示游戏说明
         if self.show_instructions and self.games[self.selected]['instructions']:
-            instructions_font = pygame.font.SysFont('SimHei', 24)
-            instructions = instructions_font.render(
-                self.games[self.selected]['instructions'],
-                True, WHITE
+            instructions_font = get_font(size=24)
+            instructions = render_text(
+                instructions_font, self.games[self.selected]['instructions'], WHITE
             )
             instructions_rect = instructions.get_rect(
                 center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 50)
@@ -292,7 +297,7 @@ def draw(self):
         # 绘制新手引导按钮和界面（保持不变）
         if not self.show_tutorial:
             pygame.draw.rect(window, BLUE, self.tutorial_button)
-            tutorial_text = self.font.render('新手引导', True, WHITE)
+            tutorial_text = render_text(self.font, '新手引导', WHITE)
             tutorial_text_rect = tutorial_text.get_rect(center=self.tutorial_button.center)
             window.blit(tutorial_text, tutorial_text_rect)
         
@@ -303,24 +308,22 @@ def draw(self):
     
     def draw_tutorial(self):
         """绘制新手引导界面"""
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(200)
+        overlay = overlay_surface((WINDOW_WIDTH, WINDOW_HEIGHT), BLACK, 200)
         window.blit(overlay, (0, 0))
 
-        tutorial_font = pygame.font.SysFont('SimHei', 36)
+        tutorial_font = get_font()
         current_tutorial = self.games[self.selected]['tutorial'][self.tutorial_page]
-        tutorial_text = tutorial_font.render(current_tutorial, True, WHITE)
+        tutorial_text = render_text(tutorial_font, current_tutorial, WHITE)
         tutorial_rect = tutorial_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
         window.blit(tutorial_text, tutorial_rect)
 
         total_pages = len(self.games[self.selected]['tutorial'])
-        page_text = tutorial_font.render(f'{self.tutorial_page + 1}/{total_pages}', True, WHITE)
+        page_text = render_text(tutorial_font, f'{self.tutorial_page + 1}/{total_pages}', WHITE)
         page_rect = page_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 50))
         window.blit(page_text, page_rect)
 
-        nav_font = pygame.font.SysFont('SimHei', 24)
-        nav_text = nav_font.render('使用←→切换页面，按ESC关闭引导', True, WHITE)
+        nav_font = get_font(size=24)
+        nav_text = render_text(nav_font, '使用←→切换页面，按ESC关闭引导', WHITE)
         nav_rect = nav_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 50))
         window.blit(nav_text, nav_rect)
 
@@ -429,8 +432,8 @@ def handle_game_selection(self):
             sys.exit()
         else:
             # 显示简单的加载提示
-            loading_font = pygame.font.SysFont('SimHei', 36)
-            loading_text = loading_font.render('正在加载游戏...', True, WHITE)
+            loading_font = get_font()
+            loading_text = render_text(loading_font, '正在加载游戏...', WHITE)
             loading_rect = loading_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
             
             # 显示加载界面
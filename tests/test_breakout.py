@@ -0,0 +1,50 @@
+import pytest
+
+from games.core.breakout import BreakoutCore, Paddle
+
+
+@pytest.mark.parametrize('direction', ['left', 'right'])
+@pytest.mark.parametrize('substeps', [2, 4, 20])
+def test_paddle_substeps_match_one_full_step(direction, substeps):
+    full = Paddle()
+    split = Paddle()
+    for _ in range(4):
+        full.move(direction)
+        for _ in range(substeps):
+            split.move(direction, 1 / substeps)
+    assert split.x == pytest.approx(full.x)
+    assert split.rect.x == full.rect.x
+
+
+def test_released_bricks_are_not_reused_by_another_core():
+    first = BreakoutCore(seed=1)
+    brick = next(iter(first.bricks))
+    before = (tuple(brick.rect), brick.color, brick.points)
+    brick.hits_required = 1
+    first.hit_brick(brick)
+    second = BreakoutCore(seed=2)
+    second.setup_level(3)
+    assert all(other is not brick for other in second.bricks)
+    assert (tuple(brick.rect), brick.color, brick.points) == before
+
+
+@pytest.mark.parametrize('speed', [20, 60, 200])
+@pytest.mark.parametrize('dx', [-0.3, 0.0, 0.4])
+def test_fast_ball_does_not_tunnel_through_a_brick(speed, dx):
+    core = BreakoutCore(seed=0)
+    core.brick_pool.release_all(core.bricks)
+    core.bricks.clear()
+    brick = core.brick_pool.acquire(350, 200, 100, 15)
+    core.bricks.add(brick, brick.rect)
+    spare = core.brick_pool.acquire(0, 0, 40, 15)  # 留一块砖，击碎目标后不会换关
+    core.bricks.add(spare, spare.rect)
+    core.ball.move_to(400, 260)  # 球离砖块只有几十像素，快球一步就能越过砖块
+    core.ball.dx = dx * speed
+    core.ball.dy = -speed
+    for _ in range(5):
+        core.step()
+        if brick not in core.bricks:
+            break
+    assert brick not in core.bricks
+    assert core.ball.dy > 0
+    assert core.ball.y > brick.rect.bottom
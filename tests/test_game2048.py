@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from games.core.game2048 import Game2048Core, ACTIONS, GRID_SIZE
+from games.core.game2048_batch import BatchGame2048
+from games.core.game2048_tables import encode_board, decode_board, move_board
+
+
+def random_grids(count, seed=0):
+    rng = random.Random(seed)
+    grids = []
+    for _ in range(count):
+        grids.append([[rng.choice((0, 0, 0, 2, 2, 4, 8, 16, 32, 1024)) for _ in range(GRID_SIZE)]
+                      for _ in range(GRID_SIZE)])
+    return grids
+
+
+def list_move(grid, direction, use_tables):
+    core = Game2048Core(use_tables=use_tables, seed=0)
+    core.grid = [row[:] for row in grid]
+    core.score = 0
+    moved = core.move(direction)
+    return core.grid, core.score, moved
+
+
+@pytest.mark.parametrize('direction', ACTIONS)
+def test_table_list_and_batch_moves_match(direction):
+    grids = random_grids(300)
+    batch = BatchGame2048.from_grids(grids, seed=0)
+    batch_moved = batch.move(direction)
+    batch_grids = batch.to_grids()
+    for k, grid in enumerate(grids):
+        expected_grid, expected_score, expected_moved = list_move(grid, direction, use_tables=False)
+        assert list_move(grid, direction, use_tables=True) == (expected_grid, expected_score, expected_moved)
+
+        board, score = move_board(encode_board(grid), direction)
+        assert decode_board(board) == expected_grid
+        assert score == expected_score
+
+        assert batch_grids[k] == expected_grid
+        assert batch.scores[k] == expected_score
+        assert batch_moved[k] == expected_moved
@@ -0,0 +1,19 @@
+import time
+
+from games.core.game2048 import Game2048Core
+from games.core.game2048_ai import ExpectimaxPlayer
+
+
+def test_search_stays_within_the_time_budget():
+    budget = 0.05
+    player = ExpectimaxPlayer(time_budget=budget, max_depth=10)
+    game = Game2048Core(seed=3)
+    worst = 0.0
+    for _ in range(60):
+        start = time.perf_counter()
+        move = player.best_move(game.grid)
+        worst = max(worst, time.perf_counter() - start)
+        if move is None:
+            break
+        game.step(move)
+    assert worst < budget * 1.5
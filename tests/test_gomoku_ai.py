@@ -0,0 +1,29 @@
+from games.core.gomoku_ai import GomokuAI
+from games.core.gomoku_lines import BOARD_SIZE, EMPTY, BLACK_PIECE, WHITE_PIECE
+
+
+def make_board(black, white):
+    board = [[EMPTY] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+    for row, col in black:
+        board[row][col] = BLACK_PIECE
+    for row, col in white:
+        board[row][col] = WHITE_PIECE
+    return board
+
+
+def test_win_in_one_is_the_only_candidate():
+    # 白棋已有四子，一端被黑棋挡住，只能在(7, 8)成五
+    board = make_board(black=[(7, 3), (0, 0), (0, 2), (14, 14)], white=[(7, 4), (7, 5), (7, 6), (7, 7)])
+    ai = GomokuAI(time_budget=5.0)
+    assert ai.best_move((board, WHITE_PIECE)) == (7, 8)
+    assert ai._ordered_moves(WHITE_PIECE, 0, None) == [(7, 8)]
+    assert ai.last_depth == 0  # 没有进入搜索
+
+
+def test_forced_block_is_the_only_candidate():
+    # 黑棋冲四，白棋自己没有四，只能挡在(7, 8)
+    board = make_board(black=[(7, 4), (7, 5), (7, 6), (7, 7)], white=[(7, 3), (3, 3), (11, 11)])
+    ai = GomokuAI(time_budget=5.0)
+    assert ai.best_move((board, WHITE_PIECE)) == (7, 8)
+    assert ai._ordered_moves(WHITE_PIECE, 0, None) == [(7, 8)]
+    assert ai.last_depth == 0
@@ -0,0 +1,47 @@
+import random
+
+from games.core.gomoku_lines import (BOARD_SIZE, EMPTY, BLACK_PIECE, WHITE_PIECE, LINES, PATTERNS,
+                                     LineIndex, line_patterns)
+
+
+def counts_from_scratch(board, player):
+    totals = [0] * len(PATTERNS)
+    for cells in LINES:
+        own = opponent = 0
+        for k, (row, col) in enumerate(cells):
+            if board[row][col] == player:
+                own |= 1 << k
+            elif board[row][col] != EMPTY:
+                opponent |= 1 << k
+        for kind, count in enumerate(line_patterns(own, opponent, len(cells))):
+            totals[kind] += count
+    return totals
+
+
+def test_incremental_index_matches_a_rebuilt_one():
+    rng = random.Random(7)
+    board = [[EMPTY] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+    index = LineIndex()
+    stones = []
+    for turn in range(300):
+        # 大约四分之一的操作是提子，模拟AI搜索时的落子和回退
+        if stones and rng.random() < 0.25:
+            row, col, player = stones.pop(rng.randrange(len(stones)))
+            board[row][col] = EMPTY
+            index.remove(row, col, player)
+        else:
+            row, col = rng.randrange(BOARD_SIZE), rng.randrange(BOARD_SIZE)
+            if board[row][col] != EMPTY:
+                continue
+            player = BLACK_PIECE if turn % 2 else WHITE_PIECE
+            board[row][col] = player
+            index.place(row, col, player)
+            stones.append((row, col, player))
+
+        rebuilt = LineIndex.from_board(board)
+        assert index.masks == rebuilt.masks
+        assert index.counts == rebuilt.counts
+        assert index.stones == rebuilt.stones == len(stones)
+        if turn % 25 == 0:
+            for player in (BLACK_PIECE, WHITE_PIECE):
+                assert list(index.pattern_counts(player)) == counts_from_scratch(board, player)
@@ -0,0 +1,49 @@
+import numpy as np
+
+from games.core.pacman import (PacmanCore, Candies, SWARM_ENEMY_COUNT, SWARM_CANDY_COUNT, SPAWN_SAFE_RADIUS,
+                               RESPAWN_GRACE, WINDOW_WIDTH, WINDOW_HEIGHT)
+
+
+def catch_player(core):
+    core.enemies.x[0] = core.player.x
+    core.enemies.y[0] = core.player.y
+    core.check_collisions()
+
+
+def test_swarm_enemies_start_outside_the_safe_radius():
+    core = PacmanCore(SWARM_ENEMY_COUNT, SWARM_CANDY_COUNT, seed=0)
+    dx = core.enemies.x - WINDOW_WIDTH // 2
+    dy = core.enemies.y - WINDOW_HEIGHT // 2
+    assert len(core.enemies) == SWARM_ENEMY_COUNT
+    assert (dx * dx + dy * dy >= SPAWN_SAFE_RADIUS ** 2).all()
+
+
+def test_only_the_swarm_level_has_respawn_grace():
+    swarm = PacmanCore(SWARM_ENEMY_COUNT, SWARM_CANDY_COUNT, seed=0)
+    catch_player(swarm)
+    assert swarm.player.lives == 2 and swarm.player.invulnerable == RESPAWN_GRACE
+    catch_player(swarm)
+    assert swarm.player.lives == 2
+
+    normal = PacmanCore(seed=0)
+    catch_player(normal)
+    assert normal.player.lives == 2 and normal.player.invulnerable == 0
+    catch_player(normal)
+    assert normal.player.lives == 1
+
+
+def test_candy_broadphase_matches_brute_force():
+    rng = np.random.default_rng(3)
+    candies = Candies()
+    candies.spawn(SWARM_CANDY_COUNT, rng)
+    candies.remove(list(range(0, SWARM_CANDY_COUNT, 7)))
+    for _ in range(500):
+        x = rng.uniform(0, WINDOW_WIDTH)
+        y = rng.uniform(0, WINDOW_HEIGHT)
+        radius = rng.uniform(5, 40)
+        used = slice(0, candies.count)
+        dx = candies.x[used] - x
+        dy = candies.y[used] - y
+        reach = candies.radius[used] + radius
+        expected = np.flatnonzero(candies.alive[used] & (dx * dx + dy * dy < reach * reach)).tolist()
+        assert candies.touching(x, y, radius) == expected
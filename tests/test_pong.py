@@ -0,0 +1,16 @@
+import pytest
+
+from games.core.pong import Paddle, BLUE
+
+
+@pytest.mark.parametrize('up', [True, False])
+@pytest.mark.parametrize('substeps', [2, 4, 10])
+def test_paddle_substeps_match_one_full_step(up, substeps):
+    full = Paddle(50, BLUE)
+    split = Paddle(50, BLUE)
+    for _ in range(4):
+        full.move(up)
+        for _ in range(substeps):
+            split.move(up, 1 / substeps)
+    assert split.y == pytest.approx(full.y)
+    assert split.rect.y == full.rect.y
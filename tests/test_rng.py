@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from games.core import (BreakoutCore, SnakeCore, PacmanCore, MazePacmanCore, TetrisCore, PongCore,
+                        Game2048Core)
+from games.core.game2048_batch import BatchGame2048
+from games.core.snake import UP, DOWN, LEFT, RIGHT
+
+STEPS = 200
+
+
+def breakout_trace(seed):
+    core = BreakoutCore(seed=seed)
+    core.setup_level(3)  # 第3关开始才随机生成特殊砖块
+    trace = [[(tuple(brick.rect), brick.hits_required) for brick in core.bricks]]
+    for i in range(STEPS):
+        core.step((None, 'left', 'right')[i // 20 % 3])
+        trace.append((core.ball.x, core.ball.y, core.paddle.x, core.score, core.lives))
+    return trace
+
+
+def snake_trace(seed):
+    core = SnakeCore(seed=seed)
+    trace = []
+    for i in range(STEPS):
+        core.step((UP, RIGHT, DOWN, LEFT)[i // 5 % 4])
+        trace.append((tuple(core.snake.positions), core.food.position, core.game_over))
+        if core.game_over:
+            core.reset()
+    return trace
+
+
+def pacman_trace(seed):
+    core = PacmanCore(seed=seed)
+    trace = [(core.candies.x.tolist(), core.candies.y.tolist())]
+    for i in range(STEPS):
+        core.step(((1, 0), (0, 1), (-1, 0), (0, -1))[i // 30 % 4])
+        trace.append((core.enemies.x.tolist(), core.enemies.y.tolist(), core.player.score))
+    return trace
+
+
+def maze_trace(seed):
+    core = MazePacmanCore(seed=seed)
+    core.frighten()  # 受惊的鬼才用随机数选择方向
+    trace = []
+    for i in range(STEPS):
+        core.step(((1, 0), (0, 1), (-1, 0), (0, -1))[i // 15 % 4])
+        trace.append([(ghost.x, ghost.y) for ghost in core.ghosts] + [core.player.score])
+    return trace
+
+
+def tetris_trace(seed):
+    core = TetrisCore(seed=seed)
+    trace = []
+    for i in range(STEPS):
+        core.step(('left', 'rotate', 'right', 'drop')[i % 4], 50)
+        trace.append((core.current_piece.shape, core.score, [row[:] for row in core.grid]))
+    return trace
+
+
+def pong_trace(seed):
+    core = PongCore(seed=seed)
+    trace = []
+    for i in range(STEPS * 3):
+        core.step((0, 0))
+        trace.append((core.ball.x, core.ball.y, core.player1.score, core.player2.score))
+    return trace
+
+
+def game2048_trace(seed):
+    core = Game2048Core(seed=seed)
+    trace = []
+    for i in range(STEPS):
+        core.step(('up', 'left', 'down', 'right')[i % 4])
+        trace.append([row[:] for row in core.grid])
+    return trace
+
+
+def batch2048_trace(seed):
+    batch = BatchGame2048(16, seed=seed)
+    trace = []
+    for i in range(STEPS):
+        batch.step(np.full(len(batch), i % 4))
+        trace.append(batch.boards.tolist())
+    return trace
+
+
+TRACES = [breakout_trace, snake_trace, pacman_trace, maze_trace, tetris_trace, pong_trace,
+          game2048_trace, batch2048_trace]
+
+
+@pytest.mark.parametrize('trace', TRACES, ids=lambda trace: trace.__name__)
+def test_same_seed_gives_the_same_trace(trace):
+    assert trace(1234) == trace(1234)
+    assert trace(1234) != trace(4321)
@@ -0,0 +1,35 @@
+import random
+
+from games.core.tetris import TetrisCore, ACTIONS
+from games.core.tetris_board import GRID_WIDTH, GRID_HEIGHT
+
+
+def naive_drop(core):
+    piece = core.current_piece
+    grid = core.grid
+
+    def blocked(y):
+        for cx, cy in piece.cells:
+            x, row = piece.x + cx, y + cy
+            if not 0 <= x < GRID_WIDTH or row >= GRID_HEIGHT:
+                return True
+            if row >= 0 and grid[row][x] is not None:
+                return True
+        return False
+
+    y = piece.y
+    while not blocked(y + 1):
+        y += 1
+    return y
+
+
+def test_ghost_y_matches_a_naive_drop():
+    rng = random.Random(5)
+    checked = 0
+    for seed in range(30):
+        core = TetrisCore(seed=seed)
+        while not core.game_over and checked < 2000:
+            assert core.ghost_y() == naive_drop(core)
+            checked += 1
+            core.step(rng.choice(ACTIONS), 100)
+    assert checked > 500